@@ -4,9 +4,15 @@ import os
 import re
 import sys
 
+from userdata import startupprofile
+
+if "--profile-startup" in sys.argv:
+    startupprofile.install()
+
 import dcs
 
 import ui.corruptedsavemenu
+import ui.loadingmenu
 import ui.mainmenu
 import ui.newgamemenu
 import ui.window
@@ -47,18 +53,43 @@ def is_version_compatible(save_version):
     return False
 
 
+def restored(future):
+    try:
+        game = future.result()
+        game.settings.version = VERSION_STRING
+        proceed_to_main_menu(game)
+    except Exception as e:
+        logging.exception(e)
+        ui.corruptedsavemenu.CorruptedSaveMenu(w).display()
+
+
 w = ui.window.Window()
 
 try:
-    game = persistency.restore_game()
-    if not game or not is_version_compatible(game.settings.version):
-        ui.newgamemenu.NewGameMenu(w, w.start_new_game).display()
+    header = persistency.restore_header()
+    if header:
+        logging.info("Save header: {}".format(header))
+        if header.is_supported and is_version_compatible(header.version):
+            # game itself is restored in the background only once the header checks out
+            ui.loadingmenu.LoadingMenu(w, header, persistency.restore_game_async(), restored).display()
+        else:
+            ui.newgamemenu.NewGameMenu(w, w.start_new_game).display()
     else:
-        game.settings.version = VERSION_STRING
-        proceed_to_main_menu(game)
+        # saves made before the header have to be restored to find out the version
+        game = persistency.restore_game()
+        if not game or not is_version_compatible(game.settings.version):
+            ui.newgamemenu.NewGameMenu(w, w.start_new_game).display()
+        else:
+            game.settings.version = VERSION_STRING
+            proceed_to_main_menu(game)
 except Exception as e:
     logging.exception(e)
     ui.corruptedsavemenu.CorruptedSaveMenu(w).display()
 
+if startupprofile.is_installed():
+    profile_path = os.path.join(persistency.base_path(), "liberation_startup_profile.json")
+    startupprofile.dump(profile_path)
+    logging.info("Startup import profile saved to {}".format(profile_path))
+
 w.run()
 
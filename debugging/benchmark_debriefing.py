@@ -0,0 +1,130 @@
+import argparse
+import os
+import re
+import tempfile
+import time
+import tracemalloc
+import typing
+
+from dcs.lua import parse
+
+from userdata.debriefinglog import DebriefingLog
+
+"""
+Benchmarks parsing of the synthetic multiplayer debriefing logs (same format as debugging/generate_mission_outcome.py
+writes, with shots and hits in between the kills): whole log parsed into the table (as Debriefing.parse used to do,
+falling back to the line parser for the multiplayer logs) and the streaming DebriefingLog, reporting time and peak
+memory of each.
+
+Should be started from the repository root: python -m debugging.benchmark_debriefing
+"""
+
+EVENTS_COUNTS = [10000, 50000, 100000]
+# every n-th event is the kill, the rest is the noise the parser has to skip
+DEAD_EVERY = 4
+
+
+def write_log(f: typing.TextIO, events_count: int):
+    f.write("events =\n{\n")
+    for event_id in range(1, events_count + 1):
+        f.write("\t[{}] =\n\t{{\n\t\tt\t=\t{},\n".format(event_id, 57600 + event_id))
+        if event_id % DEAD_EVERY == 0:
+            f.write("\t\ttype\t=\t\"dead\",\n")
+        else:
+            f.write("\t\ttype\t=\t\"{}\",\n".format("hit" if event_id % 2 else "shot"))
+            f.write("\t\tweapon\t=\t\"GAU-8\",\n")
+            f.write("\t\ttargetMissionID\t=\t\"{}\",\n".format(event_id + 1))
+        f.write("\t\tinitiatorMissionID\t=\t\"{}\",\n".format(event_id))
+        f.write("\t}}, -- end of [{}]\n".format(event_id))
+    f.write("} -- end of events\ncallsign\t=\t\"PyDCS\"\nresult\t=\t0\n")
+
+
+def parse_whole(path: str) -> typing.List[int]:
+    def parse_multiplayer(contents: str):
+        result = {}
+        element = None
+        in_events = False
+        for line in [x.strip() for x in contents.splitlines()]:
+            if line.startswith("events ="):
+                in_events = True
+            elif line.startswith("} -- end of events"):
+                in_events = False
+
+            if not in_events:
+                continue
+
+            key = None
+            if line.startswith("initiator\t"):
+                key = "initiator"
+            elif line.startswith("initiatorMissionID\t"):
+                key = "initiatorMissionID"
+            elif line.startswith("type\t"):
+                key = "type"
+            elif line.startswith("}, -- end of ["):
+                result[len(result)] = element
+                element = None
+                continue
+            else:
+                continue
+
+            if element is None:
+                element = {}
+            element[key] = re.findall(r"=\s*\"(.*?)\",", line)[0]
+
+        return {"debriefing": {"events": result}}
+
+    dead_units = []
+    with open(path, "r") as f:
+        table_string = f.read()
+        try:
+            table = parse.loads(table_string)
+        except Exception:
+            table = parse_multiplayer(table_string)
+
+        for event in table["debriefing"].get("events", {}).values():
+            if event["type"] in ["crash", "dead"] and int(event["initiatorMissionID"]) not in dead_units:
+                dead_units.append(int(event["initiatorMissionID"]))
+    return dead_units
+
+
+def parse_streaming(path: str) -> typing.List[int]:
+    dead_units = []
+    seen = set()
+    with open(path, "r") as f:
+        for _, mission_id in DebriefingLog(f).dead_events():
+            if int(mission_id) not in seen:
+                seen.add(int(mission_id))
+                dead_units.append(int(mission_id))
+    return dead_units
+
+
+def measure(fn: typing.Callable, path: str) -> typing.Tuple[float, int, int]:
+    started = time.perf_counter()
+    dead_units = fn(path)
+    duration = time.perf_counter() - started
+
+    # separate run, tracemalloc slows down the allocations a lot
+    tracemalloc.start()
+    fn(path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return duration, peak, len(dead_units)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Debriefing log benchmark")
+    parser.add_argument("--events", type=int, nargs="*", default=EVENTS_COUNTS)
+    args = parser.parse_args()
+
+    for events_count in args.events:
+        fd, path = tempfile.mkstemp(suffix=".log")
+        try:
+            with os.fdopen(fd, "w") as f:
+                write_log(f, events_count)
+
+            print("{} events, {:.1f} MB".format(events_count, os.path.getsize(path) / (1024 * 1024)))
+            for name, fn in [("whole log", parse_whole), ("streaming", parse_streaming)]:
+                duration, peak, dead_count = measure(fn, path)
+                print("{:>10}: {:.0f}ms, peak {:.1f} MB, {} dead".format(name, duration * 1000, peak / (1024 * 1024), dead_count))
+        finally:
+            os.remove(path)
@@ -0,0 +1,131 @@
+import argparse
+import random
+import time
+import tracemalloc
+import typing
+
+from theater import registry, start_generator
+from theater.theatergroundobject import TheaterGroundObject, GroundObjectStore, CATEGORY_MAP, ABBREV_NAME
+
+"""
+Benchmarks ground objects of the fully populated theater: memory taken by the objects created on their own (as they're
+generated or unpickled) and once they're views of the theater store, and time of the accessors used for each
+of the objects by the overview canvas, strike operation and ground objects generator. Query of the store for the alive
+AA sites around each of the CPs is timed against the scan of the objects one by one.
+TheaterGroundObject views of the GroundObjectStore are compared against DictGroundObject, which mirrors the class
+as it used to be (instance dict, category looked up and identifiers formatted on every access).
+
+Should be started from the repository root: python -m debugging.benchmark_groundobjects --theater caucasus
+"""
+
+PASSES = 100
+QUERY_RADIUS = 60000
+
+
+class DictGroundObject:
+    cp_id = 0
+    group_id = 0
+    object_id = 0
+
+    dcs_identifier = None  # type: str
+    is_dead = False
+
+    heading = 0
+    position = None
+
+    @property
+    def category(self) -> str:
+        for k, v in CATEGORY_MAP.items():
+            if self.dcs_identifier in v:
+                return k
+        assert False, "Identifier not found in mapping: {}".format(self.dcs_identifier)
+
+    @property
+    def string_identifier(self):
+        return "{}|{}|{}|{}".format(self.category, self.cp_id, self.group_id, self.object_id)
+
+    @property
+    def group_identifier(self) -> str:
+        return "{}|{}".format(self.category, self.group_id)
+
+    @property
+    def name_abbrev(self) -> str:
+        return ABBREV_NAME[self.category]
+
+
+def copy_objects(objects: typing.List[TheaterGroundObject], klass: typing.Type) -> typing.List:
+    result = []
+    for x in objects:
+        copy = klass()
+        copy.cp_id = x.cp_id
+        copy.group_id = x.group_id
+        copy.object_id = x.object_id
+        copy.dcs_identifier = x.dcs_identifier
+        copy.heading = x.heading
+        # positions are shared, only the objects themselves are measured
+        copy.position = x.position
+        result.append(copy)
+    return result
+
+
+def query_scan(objects: typing.List, position) -> typing.List:
+    return [x for x in objects if x.category == "aa" and not x.is_dead and x.position.distance_to_point(position) <= QUERY_RADIUS]
+
+
+def measure_query(theater) -> typing.Tuple[float, float]:
+    objects = [x for cp in theater.controlpoints for x in cp.ground_objects]
+    store = theater.ground_object_store
+
+    started = time.perf_counter()
+    for _ in range(PASSES):
+        for cp in theater.controlpoints:
+            scanned = query_scan(objects, cp.position)
+    scan = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(PASSES):
+        for cp in theater.controlpoints:
+            queried = store.query(category="aa", position=cp.position, radius=QUERY_RADIUS, alive=True)
+    query = time.perf_counter() - started
+
+    assert queried == scanned, "query differs from the scan"
+    return scan, query
+
+
+def measure(objects: typing.List[TheaterGroundObject], klass: typing.Type) -> typing.Tuple[int, int, float]:
+    tracemalloc.start()
+    copies = copy_objects(objects, klass)
+    standalone_size = tracemalloc.get_traced_memory()[0]
+    if klass is TheaterGroundObject:
+        # views of the single store, as the theater has them
+        store = GroundObjectStore()
+        for x in copies:
+            store.add(x)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    for _ in range(PASSES):
+        for x in copies:
+            x.category, x.string_identifier, x.group_identifier, x.name_abbrev
+    return standalone_size, size, time.perf_counter() - started
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ground objects benchmark")
+    parser.add_argument("--theater", choices=list(registry.THEATERS), default=registry.DEFAULT_THEATER)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    theater = registry.create_theater(args.theater)
+    start_generator.generate_groundobjects(theater, random.Random(args.seed))
+    objects = [x for cp in theater.controlpoints for x in cp.ground_objects]
+
+    print("{} ground objects, {} accessor passes".format(len(objects), PASSES))
+    for name, klass in [("instance dict", DictGroundObject), ("store views", TheaterGroundObject)]:
+        standalone_size, size, accessors = measure(objects, klass)
+        print("{:>14}: {:.1f} KB standalone, {:.1f} KB in the store, accessors {:.1f}ms".format(name, standalone_size / 1024, size / 1024, accessors * 1000))
+
+    scan, query = measure_query(theater)
+    print("AA within {}m of each of the {} CPs: scan {:.1f}ms, store query {:.1f}ms".format(
+        QUERY_RADIUS, len(theater.controlpoints), scan * 1000, query * 1000))
@@ -0,0 +1,80 @@
+import os
+import random
+import time
+import typing
+
+from theater.landmap import *
+from theater.landmapgrid import *
+
+"""
+Benchmarks land checks for each of the theater landmaps: plain poly_contains over every zone (as ConflictTheater used to do),
+indexed poly_contains_many and grid lookup with exact fallback on the coastline cells.
+Also compares loading of the legacy pickled landmap with the memory-mapped one.
+
+Should be started from the repository root: python -m debugging.benchmark_landmap
+"""
+
+LANDMAP_FILES = {
+    "caucasus": "resources/caulandmap.lmap",
+    "persiangulf": "resources/gulflandmap.lmap",
+    "nevada": "resources/nevlandmap.lmap",
+}
+
+POINTS_COUNT = 20000
+
+
+def is_on_land_plain(landmap: Landmap, x: float, y: float) -> bool:
+    if not any(poly_contains(x, y, zone) for zone in landmap[0]):
+        return False
+
+    return not any(poly_contains(x, y, zone) for zone in landmap[1])
+
+
+def is_on_land_indexed(packed: PackedLandmap, xs: typing.List[float], ys: typing.List[float]) -> typing.List[bool]:
+    included = landmap_contains_many(xs, ys, packed[0])
+    excluded = landmap_contains_many(xs, ys, packed[1], mask=included)
+    return [a and not b for a, b in zip(included, excluded)]
+
+
+def is_on_land_grid(grid: LandmapGrid, packed: PackedLandmap, xs: typing.List[float], ys: typing.List[float]) -> typing.List[bool]:
+    cells = grid.cells_at(xs, ys)
+    result = [cell == CELL_LAND for cell in cells]
+    mixed = [i for i, cell in enumerate(cells) if cell == CELL_MIXED]
+    for i, value in zip(mixed, is_on_land_indexed(packed, [xs[i] for i in mixed], [ys[i] for i in mixed])):
+        result[i] = value
+    return result
+
+
+def timed(fn: typing.Callable) -> typing.Tuple[float, typing.Any]:
+    started = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - started, result
+
+
+def benchmark(name: str, filename: str):
+    pickle_load_time, _ = timed(lambda: load_landmap(os.path.splitext(filename)[0] + ".p"))
+    load_time, landmap = timed(lambda: load_landmap(filename))
+    vertices = [vertex for zone in landmap[0] for vertex in zone]
+    xs = [random.uniform(min(x for x, _ in vertices), max(x for x, _ in vertices)) for _ in range(POINTS_COUNT)]
+    ys = [random.uniform(min(y for _, y in vertices), max(y for _, y in vertices)) for _ in range(POINTS_COUNT)]
+
+    pack_time, packed = timed(lambda: pack_landmap(landmap))
+    grid_build_time, grid = timed(lambda: LandmapGrid.build(landmap))
+
+    plain_time, plain = timed(lambda: [is_on_land_plain(landmap, x, y) for x, y in zip(xs, ys)])
+    indexed_time, indexed = timed(lambda: is_on_land_indexed(packed, xs, ys))
+    grid_time, gridded = timed(lambda: is_on_land_grid(grid, packed, xs, ys))
+    assert plain == indexed == gridded, "results mismatch for {}".format(name)
+
+    print("{}: {} zones, {} vertices, {} points".format(name, len(landmap[0]) + len(landmap[1]), sum(len(x) for x in landmap[0]) + sum(len(x) for x in landmap[1]), POINTS_COUNT))
+    print("  load pickle {:.4f}s, mapped {:.4f}s".format(pickle_load_time, load_time))
+    print("  index build {:.3f}s, grid build {:.3f}s ({:.2%} mixed cells)".format(pack_time, grid_build_time, grid.mixed_ratio))
+    print("  plain   {:.3f}s".format(plain_time))
+    print("  indexed {:.3f}s (x{:.1f})".format(indexed_time, plain_time / indexed_time))
+    print("  grid    {:.3f}s (x{:.1f})".format(grid_time, plain_time / grid_time))
+
+
+if __name__ == "__main__":
+    random.seed(0)
+    for name, filename in LANDMAP_FILES.items():
+        benchmark(name, filename)
@@ -0,0 +1,44 @@
+import argparse
+import pickle
+import time
+import typing
+
+from userdata import savestate
+
+"""
+Compares the save formats on an existing save: pickle of the whole Game (as the saves used to be written) and
+the compact save state, reporting file size and best of the runs for the save and the restore.
+
+Should be started from the repository root: python -m debugging.benchmark_save --save path/to/liberation_save
+"""
+
+RUNS = 5
+
+
+def best_of(fn: typing.Callable) -> float:
+    durations = []
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - started)
+    return min(durations)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Save format benchmark")
+    parser.add_argument("--save", required=True, help="save file in any of the formats")
+    args = parser.parse_args()
+
+    with open(args.save, "rb") as f:
+        data = f.read()
+    game = savestate.loads(data) if savestate.is_state(data) else pickle.loads(data)
+
+    pickled = pickle.dumps(game)
+    state = savestate.dumps(game)
+
+    print("best of {} runs".format(RUNS))
+    for name, contents, dump, load in [
+        ("pickled game", pickled, lambda: pickle.dumps(game), lambda: pickle.loads(pickled)),
+        ("save state", state, lambda: savestate.dumps(game), lambda: savestate.loads(state)),
+    ]:
+        print("{:>12}: {:.1f} KB, save {:.1f}ms, restore {:.1f}ms".format(name, len(contents) / 1024, best_of(dump) * 1000, best_of(load) * 1000))
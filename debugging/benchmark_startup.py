@@ -0,0 +1,93 @@
+import argparse
+import importlib
+import pickle
+import statistics
+import subprocess
+import sys
+import time
+import typing
+
+"""
+Benchmarks application startup up to the main menu: imports done by __init__.py and the save restore,
+with theaters imported on demand (as the application does now) and all of them imported upfront (as it used to).
+Each of the runs is made in the fresh interpreter, medians of the time and peak RSS over the runs are reported,
+since the differences are within the noise of a single run. Tk window itself is not created.
+pydcs imports all of its terrains along with the dcs package either way, so only the landmaps and control points
+of the theaters are deferred.
+
+Should be started from the repository root: python -m debugging.benchmark_startup [--save path/to/liberation_save]
+"""
+
+STARTUP_MODULES = [
+    "dcs",
+    "ui.corruptedsavemenu",
+    "ui.mainmenu",
+    "ui.newgamemenu",
+    "ui.window",
+    "game.game",
+    "userdata.persistency",
+]
+
+EAGER_THEATER_MODULES = [
+    "theater.caucasus",
+    "theater.persiangulf",
+    "theater.nevada",
+]
+
+RUNS = 15
+
+
+def peak_rss_mb() -> float:
+    try:
+        import resource
+    except ImportError:
+        # not available on windows
+        return float("nan")
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on linux, bytes on macos
+    return rss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def startup(eager: bool, save: str):
+    started = time.perf_counter()
+    for module in STARTUP_MODULES:
+        importlib.import_module(module)
+
+    if eager:
+        for module in EAGER_THEATER_MODULES:
+            importlib.import_module(module)
+
+    if save:
+        with open(save, "rb") as f:
+            pickle.load(f)
+
+    print("{} {}".format(time.perf_counter() - started, peak_rss_mb()))
+
+
+def measure(eager: bool, save: str) -> typing.Tuple[float, float]:
+    command = [sys.executable, "-m", "debugging.benchmark_startup", "--child", "eager" if eager else "lazy"]
+    if save:
+        command += ["--save", save]
+
+    durations, peaks = [], []
+    for _ in range(RUNS):
+        output = subprocess.check_output(command).decode().split()
+        durations.append(float(output[-2]))
+        peaks.append(float(output[-1]))
+    return statistics.median(durations), statistics.median(peaks)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Startup benchmark")
+    parser.add_argument("--save", default=None, help="save file to restore, new game menu is benchmarked otherwise")
+    parser.add_argument("--child", choices=["eager", "lazy"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        startup(args.child == "eager", args.save)
+    else:
+        print("median of {} runs{}".format(RUNS, args.save and ", restoring {}".format(args.save) or ""))
+        for name, eager in [("all theaters upfront", True), ("theaters on demand", False)]:
+            duration, peak = measure(eager, args.save)
+            print("{:>22}: {:.2f}s, peak RSS {:.1f} MB".format(name, duration, peak))
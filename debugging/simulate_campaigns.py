@@ -0,0 +1,206 @@
+import argparse
+import itertools
+import logging
+import multiprocessing
+import os
+import statistics
+import time
+import typing
+
+import dcs
+
+from game import db
+from game.game import *
+from game.randomcontext import RandomContext
+from theater import registry, start_generator
+from userdata.debriefing import Debriefing
+
+"""
+Plays campaigns headless: each turn one of the generated events is picked, quick mission is generated for it
+and the result is auto-resolved with the same math as EventResultsMenu.simulate_result. Player doesn't buy any units.
+Campaigns are played in the separate processes, reporting turns/sec, CP ownership, budget and losses.
+
+Should be started from the repository root: python -m debugging.simulate_campaigns --theater caucasus --campaigns 8
+"""
+
+# fractions of the mission units destroyed, rolled for each of the events
+SIMULATED_PLAYER_LOSSES = 0.0, 0.8
+SIMULATED_ENEMY_LOSSES = 0.0, 1.0
+
+SIMULATED_FLIGHT_SIZE = 2
+
+
+class CampaignResult:
+    def __init__(self, seed: int):
+        self.seed = seed
+        self.turns = 0
+        self.duration = 0.0
+        self.outcome = "turn limit"
+        self.player_cps = []  # type: typing.List[int]
+        self.budget = []  # type: typing.List[int]
+        self.player_losses = []  # type: typing.List[int]
+        self.enemy_losses = []  # type: typing.List[int]
+
+
+def new_game(theater_name: str, player_name: str, enemy_name: str, sams: bool, multiplier: float, seed: int) -> Game:
+    # mirrors Window.start_new_game
+    random_context = RandomContext(seed)
+    theater = registry.create_theater(theater_name)
+    start_generator.generate_inital_units(theater, enemy_name, sams, multiplier)
+    start_generator.generate_groundobjects(theater, random_context.stream("groundobjects"))
+
+    game = Game(player_name=player_name, enemy_name=enemy_name, theater=theater, random_context=random_context)
+    game.budget = int(game.budget * multiplier)
+    game.settings.multiplier = multiplier
+    game.settings.sams = sams
+    game.settings.version = "simulation"
+    return game
+
+
+def autoflights(event: Event, base: Base) -> db.TaskForceDict:
+    flights = {}
+    for task in event.tasks:
+        available = [(k, v) for k, v in itertools.chain(base.aircraft.items(), base.armor.items()) if db.unit_task(k) == task and v > 0]
+        if available:
+            unit_type, count = max(available, key=lambda x: x[1])
+            flights[task] = {unit_type: (min(count, SIMULATED_FLIGHT_SIZE), 0)}
+        else:
+            flights[task] = {}
+    return flights
+
+
+def departure_for(game: Game, event: Event) -> typing.Optional[ControlPoint]:
+    available = [cp for cp in game.theater.player_points() if event.is_departure_available_from(cp)]
+    if not available:
+        return None
+
+    return min(available, key=lambda cp: cp.position.distance_to_point(event.location))
+
+
+def prepare_event(game: Game, event: Event) -> bool:
+    """
+    Sets up the event the way EventMenu.start does, returns False in case it couldn't be played.
+    """
+    event.departure_cp = departure_for(game, event)
+    if not event.departure_cp:
+        return False
+
+    is_player_attack = game.is_player_attack(event)
+    if isinstance(event, FrontlineAttackEvent) or isinstance(event, FrontlinePatrolEvent):
+        if (event.from_cp if is_player_attack else event.to_cp).base.total_armor == 0:
+            return False
+
+    if is_player_attack:
+        event.player_attacking(autoflights(event, event.departure_cp.base))
+    else:
+        event.player_defending(autoflights(event, event.to_cp.base))
+
+    event.operation.prepare(game.theater.terrain, is_quick=True)
+    event.operation.generate()
+    return True
+
+
+def play_turn(game: Game, result: CampaignResult):
+    rng = game.random_stream("simulation")
+    events = [x for x in game.events if not x.informational]
+    rng.shuffle(events)
+
+    for event in events:
+        if not prepare_event(game, event):
+            continue
+
+        debriefing = Debriefing.simulated(mission=event.operation.current_mission,
+                                          player_name=game.player,
+                                          enemy_name=game.enemy,
+                                          player_factor=rng.uniform(*SIMULATED_PLAYER_LOSSES),
+                                          enemy_factor=rng.uniform(*SIMULATED_ENEMY_LOSSES))
+        result.player_losses.append(sum(debriefing.destroyed_units.get(game.player, {}).values()))
+        result.enemy_losses.append(sum(debriefing.destroyed_units.get(game.enemy, {}).values()))
+
+        game.finish_event(event, debriefing)
+        game.pass_turn(ignored_cps=[event.to_cp, ])
+        return
+
+    game.pass_turn()
+
+
+def simulate_campaign(parameters: typing.Tuple) -> CampaignResult:
+    theater_name, player_name, enemy_name, sams, multiplier, max_turns, seed = parameters
+
+    dcs.planes.FlyingType.payload_dirs = [os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), "resources", "payloads")]
+
+    result = CampaignResult(seed)
+    started = time.perf_counter()
+    game = new_game(theater_name, player_name, enemy_name, sams, multiplier, seed)
+    game.pass_turn(no_action=True)
+
+    for _ in range(max_turns):
+        player_cps = [x for x in game.theater.player_points() if not x.is_global]
+        result.player_cps.append(len(player_cps))
+        result.budget.append(game.budget)
+
+        if not game.theater.enemy_points():
+            result.outcome = "player won"
+            break
+
+        if not player_cps:
+            result.outcome = "enemy won"
+            break
+
+        play_turn(game, result)
+        result.turns += 1
+
+    result.duration = time.perf_counter() - started
+    return result
+
+
+def _percentile(values: typing.List[float], fraction: float) -> float:
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+def _curve(results: typing.List[CampaignResult], attribute: str) -> typing.List[float]:
+    curves = [getattr(x, attribute) for x in results]
+    return [statistics.mean(x[turn] for x in curves if len(x) > turn) for turn in range(max(len(x) for x in curves))]
+
+
+def report(results: typing.List[CampaignResult], duration: float):
+    total_turns = sum(x.turns for x in results)
+    print("{} campaigns, {} turns in {:.1f}s ({:.2f} turns/sec, {:.2f} turns/sec per process)".format(
+        len(results), total_turns, duration, total_turns / duration, total_turns / max(sum(x.duration for x in results), 0.001)))
+
+    for outcome in sorted(set(x.outcome for x in results)):
+        print("  {}: {}".format(outcome, len([x for x in results if x.outcome == outcome])))
+
+    print("turn  player CPs  budget")
+    for turn, (cps, budget) in enumerate(zip(_curve(results, "player_cps"), _curve(results, "budget"))):
+        print("{:4}  {:10.2f}  {:6.0f}".format(turn, cps, budget))
+
+    for name in ["player_losses", "enemy_losses"]:
+        losses = list(itertools.chain(*[getattr(x, name) for x in results]))
+        if losses:
+            print("{}: mean {:.1f}, median {}, p90 {}, max {}".format(name, statistics.mean(losses), statistics.median(losses), _percentile(losses, 0.9), max(losses)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless campaign simulator")
+    parser.add_argument("--theater", choices=list(registry.THEATERS), default=registry.DEFAULT_THEATER)
+    parser.add_argument("--player", default="USA")
+    parser.add_argument("--enemy", default="Russia")
+    parser.add_argument("--no-sams", action="store_true")
+    parser.add_argument("--multiplier", type=float, default=1)
+    parser.add_argument("--campaigns", type=int, default=4)
+    parser.add_argument("--turns", type=int, default=100)
+    parser.add_argument("--processes", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    parameters = [(args.theater, args.player, args.enemy, not args.no_sams, args.multiplier, args.turns, args.seed + i) for i in range(args.campaigns)]
+    started = time.perf_counter()
+    # each campaign gets its own copy of the theater, the worker builds the prototype only once for all of its campaigns
+    with multiprocessing.Pool(processes=args.processes) as pool:
+        results = pool.map(simulate_campaign, parameters, chunksize=1)
+
+    report(results, time.perf_counter() - started)
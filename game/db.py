@@ -242,7 +242,7 @@ UNIT_BY_TASK = {
 """
 Units from AirDefense category of UNIT_BY_TASK that will be removed from use if "No SAM" option is checked at the start of the game
 """
-SAM_BAN = [
+SAM_BAN = {
     AirDefence.SAM_Linebacker_M6,
 
     AirDefence.SAM_SA_9_Strela_1_9P31,
@@ -252,7 +252,7 @@ SAM_BAN = [
     AirDefence.SAM_SA_8_Osa_9A33,
     AirDefence.SAM_SA_3_S_125_LN_5P73,
     AirDefence.SAM_SA_11_Buk_LN_9A310M1,
-]
+}
 
 """
 Used to convert SAM site parts to the corresponding site
@@ -279,15 +279,15 @@ SAM_CONVERT = {
 """
 Units that will always be spawned in the air
 """
-TAKEOFF_BAN = [
-]
+TAKEOFF_BAN = set([
+])
 
 """
 Units that will be always spawned in the air if launched from the carrier
 """
-CARRIER_TAKEOFF_BAN = [
+CARRIER_TAKEOFF_BAN = {
    Su_33,  # Kuznecow is bugged in a way that only 2 aircraft could be spawned
-]
+}
 
 """
 AirDefense units that will be spawned at control points not related to the current operation
@@ -501,18 +501,52 @@ TaskForceDict = typing.Dict[typing.Type[Task], AssignedUnitsDict]
 
 StartingPosition = typing.Optional[typing.Union[ShipGroup, StaticGroup, Airport, Point]]
 
+"""
+Lookup tables built from the configuration above
+"""
+
+
+def _build_unit_task() -> typing.Dict[UnitType, Task]:
+    # same as the former unit_task scan: first task listing the unit, SAM site parts are AirDefence unless they're
+    # listed for the very first task
+    result = {}
+    first_task_units = next(iter(UNIT_BY_TASK.values()))
+    for task, units in reversed(list(UNIT_BY_TASK.items())):
+        for unit_type in units:
+            result[unit_type] = task
+
+    for unit_type in SAM_CONVERT:
+        if unit_type not in first_task_units:
+            result[unit_type] = AirDefence
+    return result
+
+
+UNIT_TASK = _build_unit_task()
+
+_UNITS_OF_COUNTRY = {country: frozenset(units) for country, units in UNIT_BY_COUNTRY.items()}
+_HELICOPTERS = frozenset(helicopter_map.values())
+
+# units of the task available to the country, in the UNIT_BY_TASK order
+UNITS_BY_TASK_AND_COUNTRY = {
+    (task, country): tuple(x for x in units if x in _UNITS_OF_COUNTRY[country])
+    for task, units in UNIT_BY_TASK.items()
+    for country in UNIT_BY_COUNTRY
+}  # type: typing.Dict[typing.Tuple[Task, str], typing.Tuple[UnitType, ...]]
+
+# same, without the helicopters and sorted by price
+UNITS_BY_PRICE = {
+    key: tuple(sorted((x for x in units if x not in _HELICOPTERS), key=lambda x: PRICES[x]))
+    for key, units in UNITS_BY_TASK_AND_COUNTRY.items()
+}  # type: typing.Dict[typing.Tuple[Task, str], typing.Tuple[UnitType, ...]]
+
 
 def unit_task(unit: UnitType) -> Task:
-    for task, units in UNIT_BY_TASK.items():
-        if unit in units:
-            return task
-        elif unit in SAM_CONVERT:
-            return AirDefence
-    assert False
+    assert unit in UNIT_TASK
+    return UNIT_TASK[unit]
 
 
 def find_unittype(for_task: Task, country_name: str) -> typing.List[UnitType]:
-    return [x for x in UNIT_BY_TASK[for_task] if x in UNIT_BY_COUNTRY[country_name]]
+    return list(UNITS_BY_TASK_AND_COUNTRY[(for_task, country_name)])
 
 
 def unit_type_name(unit_type) -> str:
@@ -526,6 +560,8 @@ def unit_type_from_name(name: str) -> UnitType:
         return plane_map[name]
     elif name in ship_map:
         return ship_map[name]
+    elif name in helicopter_map:
+        return helicopter_map[name]
     else:
         return None
 
@@ -549,16 +585,15 @@ def task_name(task) -> str:
 
 
 def choose_units(for_task: Task, factor: float, count: int, country: str) -> typing.Collection[UnitType]:
-    suitable_unittypes = find_unittype(for_task, country)
-    suitable_unittypes = [x for x in suitable_unittypes if x not in helicopter_map.values()]
-    suitable_unittypes.sort(key=lambda x: PRICES[x])
+    suitable_unittypes = UNITS_BY_PRICE[(for_task, country)]
 
     idx = int(len(suitable_unittypes) * factor)
     variety = int(count + count * factor / 2)
 
     index_start = min(idx, len(suitable_unittypes) - variety)
     index_end = min(idx + variety, len(suitable_unittypes))
-    return list(set(suitable_unittypes[index_start:index_end]))
+    # units are unique within the task, slice is kept in the price order so the choice is the same on every run
+    return list(suitable_unittypes[index_start:index_end])
 
 
 def unitdict_append(unit_dict: UnitsDict, unit_type: UnitType, count: int):
@@ -630,7 +665,8 @@ def unitdict_from(fd: AssignedUnitsDict) -> Dict:
     return {k: v1 for k, (v1, v2) in fd.items()}
 
 
-def _validate_db():
+def validate_db():
+    # not run on import, tests/db.py runs it on the unit tables
     # check unit by task uniquity
     total_set = set()
     for t, unit_collection in UNIT_BY_TASK.items():
@@ -650,5 +686,3 @@ def _validate_db():
     for unit_type in total_set:
         assert unit_type in PRICES, "{} not in prices".format(unit_type)
 
-
-_validate_db()
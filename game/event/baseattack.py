@@ -1,5 +1,3 @@
-from game.operation.baseattack import BaseAttackOperation
-
 from .event import *
 from game.db import assigned_units_from
 
@@ -52,6 +50,8 @@ class BaseAttackEvent(Event):
             self.to_cp.captured = False
 
     def player_defending(self, flights: db.TaskForceDict):
+        from game.operation.baseattack import BaseAttackOperation
+
         assert CAP in flights and len(flights) == 1,  "Invalid scrambled flights"
 
         cas = self.departure_cp.base.scramble_cas(self.game.settings.multiplier)
@@ -75,6 +75,8 @@ class BaseAttackEvent(Event):
         self.operation = op
 
     def player_attacking(self, flights: db.TaskForceDict):
+        from game.operation.baseattack import BaseAttackOperation
+
         assert CAP in flights and CAS in flights and PinpointStrike in flights and len(flights) == 3, "Invalid flights"
 
         op = BaseAttackOperation(game=self.game,
@@ -1,5 +1,4 @@
 import math
-import random
 
 from dcs.task import *
 
@@ -8,7 +7,6 @@ from game.event import *
 from game.event.frontlineattack import FrontlineAttackEvent
 
 from .event import *
-from game.operation.convoystrike import ConvoyStrikeOperation
 
 TRANSPORT_COUNT = 4, 6
 DEFENDERS_AMOUNT_FACTOR = 4
@@ -62,13 +60,15 @@ class ConvoyStrikeEvent(Event):
             return not attackers_success
 
     def player_attacking(self, flights: db.TaskForceDict):
+        from game.operation.convoystrike import ConvoyStrikeOperation
+
         assert CAS in flights and len(flights) == 1, "Invalid flights"
 
         convoy_unittype = db.find_unittype(Reconnaissance, self.defender_name)[0]
         defense_unittype = db.find_unittype(PinpointStrike, self.defender_name)[0]
 
         defenders_count = int(math.ceil(self.from_cp.base.strength * self.from_cp.importance * DEFENDERS_AMOUNT_FACTOR))
-        self.targets = {convoy_unittype: random.randrange(*TRANSPORT_COUNT),
+        self.targets = {convoy_unittype: self.random_stream("targets").randrange(*TRANSPORT_COUNT),
                         defense_unittype: defenders_count, }
 
         op = ConvoyStrikeOperation(game=self.game,
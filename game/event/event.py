@@ -1,10 +1,11 @@
 import typing
 import logging
+import os
+import random
 
 from dcs.unittype import UnitType
 from dcs.task import *
 from dcs.vehicles import AirDefence
-from dcs.unittype import UnitType
 
 from game import *
 from theater import *
@@ -13,11 +14,15 @@ from gen.conflictgen import Conflict
 from game.db import assigned_units_from, unitdict_from
 
 from userdata.debriefing import Debriefing
+from userdata.missionindex import MissionIndex, mission_index_path
 from userdata import persistency
 
 DIFFICULTY_LOG_BASE = 1.1
 EVENT_DEPARTURE_MAX_DISTANCE = 340000
 
+REGULAR_MISSION_FILENAME = "liberation_nextturn.miz"
+QUICK_MISSION_FILENAME = "liberation_nextturn_quick.miz"
+
 
 class Event:
     silent = False
@@ -45,6 +50,9 @@ class Event:
         self.attacker_name = attacker_name
         self.defender_name = defender_name
 
+    def random_stream(self, name: str) -> random.Random:
+        return self.game.random_stream(name, type(self).__name__, self.from_cp.id, self.to_cp.id)
+
     @property
     def is_player_attacking(self) -> bool:
         return self.attacker_name == self.game.player
@@ -97,6 +105,21 @@ class Event:
     def is_successfull(self, debriefing: Debriefing) -> bool:
         return self.operation.is_successfull(debriefing)
 
+    @property
+    def is_quick_generated(self) -> bool:
+        # stale quick mission is removed once the regular one is generated
+        return os.path.exists(persistency.mission_path_for(QUICK_MISSION_FILENAME))
+
+    def load_mission_indexes(self) -> typing.Tuple[MissionIndex, typing.Optional[MissionIndex]]:
+        """
+        Loads indexes of the regular and the quick mission saved next to them, the quick one is None unless it's generated.
+        """
+        regular_index = MissionIndex.load(mission_index_path(persistency.mission_path_for(REGULAR_MISSION_FILENAME)))
+        quick_index = None
+        if self.is_quick_generated:
+            quick_index = MissionIndex.load(mission_index_path(persistency.mission_path_for(QUICK_MISSION_FILENAME)))
+        return regular_index, quick_index
+
     def player_attacking(self, cp: ControlPoint, flights: db.TaskForceDict):
         if self.is_player_attacking:
             self.departure_cp = cp
@@ -115,16 +138,22 @@ class Event:
 
         self.operation.prepare(self.game.theater.terrain, is_quick=False)
         self.operation.generate()
-        self.operation.current_mission.save(persistency.mission_path_for("liberation_nextturn.miz"))
+        self.operation.save(persistency.mission_path_for(REGULAR_MISSION_FILENAME))
         self.environment_settings = self.operation.environment_settings
 
+        # quick mission is generated on demand, the one left from the previous event shouldn't be flown
+        quick_mission_path = persistency.mission_path_for(QUICK_MISSION_FILENAME)
+        for path in [quick_mission_path, mission_index_path(quick_mission_path)]:
+            if os.path.exists(path):
+                os.remove(path)
+
     def generate_quick(self):
         self.operation.is_awacs_enabled = self.is_awacs_enabled
         self.operation.environment_settings = self.environment_settings
 
         self.operation.prepare(self.game.theater.terrain, is_quick=True)
         self.operation.generate()
-        self.operation.current_mission.save(persistency.mission_path_for("liberation_nextturn_quick.miz"))
+        self.operation.save(persistency.mission_path_for(QUICK_MISSION_FILENAME))
 
     def commit(self, debriefing: Debriefing):
         for country, losses in debriefing.destroyed_units.items():
@@ -137,17 +166,10 @@ class Event:
             cp.base.commit_losses(losses)
 
         for object_identifier in debriefing.destroyed_objects:
-            for cp in self.game.theater.controlpoints:
-                if not cp.ground_objects:
-                    continue
-
-                for i, ground_object in enumerate(cp.ground_objects):
-                    if ground_object.is_dead:
-                        continue
-
-                    if ground_object.matches_string_identifier(object_identifier):
-                        logging.info("cp {} killing ground object {}".format(cp, ground_object.string_identifier))
-                        cp.ground_objects[i].is_dead = True
+            ground_object = self.game.theater.find_ground_object(object_identifier)
+            if ground_object and not ground_object.is_dead:
+                logging.info("cp {} killing ground object {}".format(ground_object.cp_id, object_identifier))
+                ground_object.is_dead = True
 
     def skip(self):
         pass
@@ -1,5 +1,4 @@
 from game.event import *
-from game.operation.frontlineattack import FrontlineAttackOperation
 from userdata.debriefing import Debriefing
 
 
@@ -65,6 +64,8 @@ class FrontlineAttackEvent(Event):
             self.to_cp.base.affect_strength(-0.1)
 
     def player_attacking(self, flights: db.TaskForceDict):
+        from game.operation.frontlineattack import FrontlineAttackOperation
+
         assert CAS in flights and CAP in flights and len(flights) == 2, "Invalid flights"
 
         op = FrontlineAttackOperation(game=self.game,
@@ -86,6 +87,8 @@ class FrontlineAttackEvent(Event):
         self.operation = op
 
     def player_defending(self, flights: db.TaskForceDict):
+        from game.operation.frontlineattack import FrontlineAttackOperation
+
         assert CAP in flights and len(flights) == 1, "Invalid flights"
 
         op = FrontlineAttackOperation(game=self.game,
@@ -1,5 +1,4 @@
 from game.event import *
-from game.operation.frontlinepatrol import FrontlinePatrolOperation
 from userdata.debriefing import Debriefing
 
 
@@ -55,6 +54,8 @@ class FrontlinePatrolEvent(Event):
         pass
 
     def player_attacking(self, flights: db.TaskForceDict):
+        from game.operation.frontlinepatrol import FrontlinePatrolOperation
+
         assert CAP in flights and len(flights) == 1, "Invalid flights"
 
         self.cas = self.to_cp.base.scramble_cas(self.game.settings.multiplier)
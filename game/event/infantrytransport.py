@@ -5,7 +5,6 @@ from dcs.task import *
 from dcs.vehicles import *
 
 from game import db
-from game.operation.infantrytransport import InfantryTransportOperation
 from theater.conflicttheater import *
 from userdata.debriefing import Debriefing
 
@@ -38,6 +37,8 @@ class InfantryTransportEvent(Event):
             self.departure_cp.base.affect_strength(-self.STRENGTH_INFLUENCE)
 
     def player_attacking(self, flights: db.TaskForceDict):
+        from game.operation.infantrytransport import InfantryTransportOperation
+
         assert Embarking in flights and len(flights) == 1, "Invalid flights"
 
         op = InfantryTransportOperation(
@@ -1,12 +1,10 @@
 import math
-import random
 
 from dcs.task import *
 
 from game import *
 from game.event import *
 from game.event.frontlineattack import FrontlineAttackEvent
-from game.operation.insurgentattack import InsurgentAttackOperation
 
 from .event import *
 
@@ -45,10 +43,12 @@ class InsurgentAttackEvent(Event):
             return not attackers_success
 
     def player_defending(self, flights: db.TaskForceDict):
+        from game.operation.insurgentattack import InsurgentAttackOperation
+
         assert CAS in flights and len(flights) == 1, "Invalid flights"
 
         suitable_unittypes = db.find_unittype(Reconnaissance, self.attacker_name)
-        random.shuffle(suitable_unittypes)
+        self.random_stream("targets").shuffle(suitable_unittypes)
         unittypes = suitable_unittypes[:self.TARGET_VARIETY]
         typecount = max(math.floor(self.difficulty * self.TARGET_AMOUNT_FACTOR), 1)
         self.targets = {unittype: typecount for unittype in unittypes}
@@ -1,5 +1,3 @@
-from game.operation.intercept import InterceptOperation
-
 from .event import *
 
 
@@ -13,7 +11,7 @@ class InterceptEvent(Event):
     def __init__(self, game, from_cp: ControlPoint, target_cp: ControlPoint, location: Point, attacker_name: str,
                  defender_name: str):
         super().__init__(game, from_cp, target_cp, location, attacker_name, defender_name)
-        self.location = Conflict.intercept_position(self.from_cp, self.to_cp)
+        self.location = Conflict.intercept_position(self.from_cp, self.to_cp, self.random_stream("location"))
 
     def __str__(self):
         return "Air Intercept"
@@ -69,11 +67,13 @@ class InterceptEvent(Event):
             self.to_cp.base.affect_strength(-self.STRENGTH_INFLUENCE)
 
     def player_attacking(self, flights: db.TaskForceDict):
+        from game.operation.intercept import InterceptOperation
+
         assert CAP in flights and len(flights) == 1, "Invalid flights"
 
         escort = self.to_cp.base.scramble_sweep(self._enemy_scramble_multiplier())
 
-        self.transport_unit = random.choice(db.find_unittype(Transport, self.defender_name))
+        self.transport_unit = self.random_stream("transport").choice(db.find_unittype(Transport, self.defender_name))
         assert self.transport_unit is not None
 
         airdefense_unit = db.find_unittype(AirDefence, self.defender_name)[-1]
@@ -93,11 +93,13 @@ class InterceptEvent(Event):
         self.operation = op
 
     def player_defending(self, flights: db.TaskForceDict):
+        from game.operation.intercept import InterceptOperation
+
         assert CAP in flights and len(flights) == 1, "Invalid flights"
 
         interceptors = self.from_cp.base.scramble_interceptors(self.game.settings.multiplier)
 
-        self.transport_unit = random.choice(db.find_unittype(Transport, self.defender_name))
+        self.transport_unit = self.random_stream("transport").choice(db.find_unittype(Transport, self.defender_name))
         assert self.transport_unit is not None
 
         op = InterceptOperation(game=self.game,
@@ -1,5 +1,3 @@
-from game.operation.navalintercept import NavalInterceptionOperation
-
 from .event import *
 
 
@@ -12,7 +10,7 @@ class NavalInterceptEvent(Event):
     def __init__(self, game, from_cp: ControlPoint, target_cp: ControlPoint, location: Point, attacker_name: str,
                  defender_name: str):
         super().__init__(game, from_cp, target_cp, location, attacker_name, defender_name)
-        self.location = Conflict.naval_intercept_position(from_cp, target_cp, game.theater)
+        self.location = Conflict.naval_intercept_position(from_cp, target_cp, game.theater, self.random_stream("location"))
 
     def _targets_count(self) -> int:
         from gen.conflictgen import IMPORTANCE_LOW
@@ -78,10 +76,12 @@ class NavalInterceptEvent(Event):
             self.to_cp.base.affect_strength(-self.STRENGTH_INFLUENCE)
 
     def player_attacking(self, flights: db.TaskForceDict):
+        from game.operation.navalintercept import NavalInterceptionOperation
+
         assert CAS in flights and len(flights) == 1, "Invalid flights"
 
         self.targets = {
-            random.choice(db.find_unittype(CargoTransportation, self.defender_name)): self._targets_count(),
+            self.random_stream("targets").choice(db.find_unittype(CargoTransportation, self.defender_name)): self._targets_count(),
         }
 
         op = NavalInterceptionOperation(
@@ -101,10 +101,12 @@ class NavalInterceptEvent(Event):
         self.operation = op
 
     def player_defending(self, flights: db.TaskForceDict):
+        from game.operation.navalintercept import NavalInterceptionOperation
+
         assert CAP in flights and len(flights) == 1, "Invalid flights"
 
         self.targets = {
-            random.choice(db.find_unittype(CargoTransportation, self.defender_name)): self._targets_count(),
+            self.random_stream("targets").choice(db.find_unittype(CargoTransportation, self.defender_name)): self._targets_count(),
         }
 
         op = NavalInterceptionOperation(
@@ -1,5 +1,3 @@
-from game.operation.strike import StrikeOperation
-
 from .event import *
 
 
@@ -53,6 +51,8 @@ class StrikeEvent(Event):
         self.to_cp.base.affect_strength(-self.SINGLE_OBJECT_STRENGTH_INFLUENCE * len(debriefing.destroyed_objects))
 
     def player_attacking(self, flights: db.TaskForceDict):
+        from game.operation.strike import StrikeOperation
+
         assert CAP in flights and CAS in flights and SEAD in flights and len(flights) == 3, "Invalid flights"
 
         op = StrikeOperation(
@@ -2,6 +2,7 @@ import logging
 import typing
 import random
 import math
+import uuid
 
 from dcs.task import *
 from dcs.vehicles import *
@@ -12,8 +13,10 @@ from theater import *
 
 from . import db
 from .settings import Settings
+from .randomcontext import RandomContext
 from .event import *
 
+COMMISION_TASKS = [PinpointStrike, CAS, CAP, AirDefence]
 COMMISION_UNIT_VARIETY = 4
 COMMISION_LIMITS_SCALE = 1.5
 COMMISION_LIMITS_FACTORS = {
@@ -91,20 +94,48 @@ class Game:
     events = None  # type: typing.List[Event]
     pending_transfers = None  # type: typing.Dict[]
     ignored_cps = None  # type: typing.Collection[ControlPoint]
+    turn = 0
+    _random_context = None  # type: RandomContext
+    _campaign_id = None  # type: str
 
-    def __init__(self, player_name: str, enemy_name: str, theater: ConflictTheater):
+    def __init__(self, player_name: str, enemy_name: str, theater: ConflictTheater, random_context: RandomContext = None,
+                 campaign_id: str = None):
         self.settings = Settings()
         self.events = []
         self.theater = theater
         self.player = player_name
         self.enemy = enemy_name
+        self._random_context = random_context or RandomContext()
+        self._campaign_id = campaign_id
 
-    def _roll(self, prob, mult):
+    @property
+    def random_context(self) -> RandomContext:
+        if self._random_context is None:
+            # saves made before the seed was introduced
+            self._random_context = RandomContext()
+        return self._random_context
+
+    @property
+    def campaign_id(self) -> str:
+        """
+        Tells the campaign apart from the others, even if started with the same seed. Made up on the first save.
+        """
+        if self._campaign_id is None:
+            self._campaign_id = uuid.uuid4().hex[:8]
+        return self._campaign_id
+
+    def random_stream(self, name: str, *scope: typing.Any) -> random.Random:
+        """
+        Returns random stream for the current turn, same name and scope always produce the same stream for the turn.
+        """
+        return self.random_context.stream(name, self.turn, *scope)
+
+    def _roll(self, prob, mult, rng: random.Random):
         if self.settings.version == "dev":
             # always generate all events for dev
             return 100
         else:
-            return random.randint(1, 100) <= prob * mult
+            return rng.randint(1, 100) <= prob * mult
 
     def _generate_player_event(self, event_class, player_cp, enemy_cp):
         if event_class == NavalInterceptEvent and enemy_cp.radials == LAND:
@@ -162,6 +193,7 @@ class Game:
         self.events.append(event_class(self, enemy_cp, player_cp, player_cp.position, self.enemy, self.player))
 
     def _generate_events(self):
+        rng = self.random_stream("events")
         strikes_generated_for = set()
         base_attack_generated_for = set()
 
@@ -180,14 +212,14 @@ class Game:
                     if enemy_cp in base_attack_generated_for:
                         continue
 
-                if player_probability == 100 or player_probability > 0 and self._roll(player_probability, player_cp.base.strength):
+                if player_probability == 100 or player_probability > 0 and self._roll(player_probability, player_cp.base.strength, rng):
                     self._generate_player_event(event_class, player_cp, enemy_cp)
                     if event_class is StrikeEvent:
                         strikes_generated_for.add(enemy_cp)
                     if event_class is BaseAttackEvent:
                         base_attack_generated_for.add(enemy_cp)
 
-                if enemy_probability == 100 or enemy_probability > 0 and self._roll(enemy_probability, enemy_cp.base.strength):
+                if enemy_probability == 100 or enemy_probability > 0 and self._roll(enemy_probability, enemy_cp.base.strength, rng):
                     self._generate_enemy_event(event_class, player_cp, enemy_cp)
 
     def commision_unit_types(self, cp: ControlPoint, for_task: Task) -> typing.Collection[UnitType]:
@@ -198,8 +230,8 @@ class Game:
         else:
             return db.choose_units(for_task, importance_factor, COMMISION_UNIT_VARIETY, self.enemy)
 
-    def _commision_units(self, cp: ControlPoint):
-        for for_task in [PinpointStrike, CAS, CAP, AirDefence]:
+    def _commision_units(self, cp: ControlPoint, rng: random.Random):
+        for for_task in COMMISION_TASKS:
             limit = COMMISION_LIMITS_FACTORS[for_task] * math.pow(cp.importance, COMMISION_LIMITS_SCALE) * self.settings.multiplier
             missing_units = limit - cp.base.total_units(for_task)
             if missing_units > 0:
@@ -207,7 +239,7 @@ class Game:
                 points_to_spend = cp.base.append_commision_points(for_task, awarded_points)
                 if points_to_spend > 0:
                     unittypes = self.commision_unit_types(cp, for_task)
-                    d = {random.choice(unittypes): points_to_spend}
+                    d = {rng.choice(unittypes): points_to_spend}
                     logging.info("Commision {}: {}".format(cp, d))
                     cp.base.commision_units(d)
 
@@ -243,6 +275,13 @@ class Game:
 
         logging.info("Generating {} (regular)".format(event))
         event.generate()
+
+    def initiate_quick_event(self, event: Event):
+        """
+        Quick mission is generated on demand after the regular one, since most of the players fly only one of those.
+        """
+        assert event in self.events
+
         logging.info("Generating {} (quick)".format(event))
         event.generate_quick()
 
@@ -264,7 +303,9 @@ class Game:
             return event.name == self.player
 
     def pass_turn(self, no_action=False, ignored_cps: typing.Collection[ControlPoint]=None):
-        logging.info("Pass turn")
+        self.turn += 1
+        logging.info("Pass turn {} ({})".format(self.turn, self.random_context))
+        logging.info("Frontline cache: {} hits, {} misses".format(self.theater.frontline_cache.hits, self.theater.frontline_cache.misses))
         for event in self.events:
             if self.settings.version == "dev":
                 # don't damage player CPs in by skipping in dev mode
@@ -273,8 +314,9 @@ class Game:
             else:
                 event.skip()
 
+        rng = self.random_stream("commision")
         for cp in self.theater.enemy_points():
-            self._commision_units(cp)
+            self._commision_units(cp, rng)
         self._budget_player()
 
         if not no_action:
@@ -38,7 +38,8 @@ class FrontlineAttackOperation(Operation):
             defender=self.current_mission.country(self.defender_name),
             from_cp=self.from_cp,
             to_cp=self.to_cp,
-            theater=self.game.theater
+            theater=self.game.theater,
+            rng=self.random_stream("conflict")
         )
 
         self.initialize(mission=self.current_mission,
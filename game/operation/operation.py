@@ -1,12 +1,31 @@
+import random
+import zipfile
+
 from dcs.lua.parse import loads
 from dcs.terrain import Terrain
 
 from userdata.debriefing import *
-
-from gen import *
+from userdata.missionindex import MissionIndex, mission_index_path
+
+from gen.aaa import *
+from gen.aircraft import *
+from gen.armor import *
+from gen.airsupportgen import *
+from gen.conflictgen import *
+from gen.shipgen import *
+from gen.visualgen import *
+from gen.triggergen import *
+from gen.environmentgen import *
+from gen.groundobjectsgen import *
+from gen.briefinggen import *
+from gen.forcedoptionsgen import *
+from gen import aaa, naming
 
 TANKER_CALLSIGNS = ["Texaco", "Arco", "Shell"]
 
+# timestamp of the saved mission archive entries, fixed so the same mission always produces the same file
+MISSION_ARCHIVE_DATE_TIME = 2018, 1, 1, 0, 0, 0
+
 
 class Operation:
     attackers_starting_position = None  # type: db.StartingPosition
@@ -56,6 +75,10 @@ class Operation:
     def is_successfull(self, debriefing: Debriefing) -> bool:
         return True
 
+    def random_stream(self, name: str) -> random.Random:
+        # departure CP is chosen by the player, so it's not part of the scope
+        return self.game.random_stream(name, type(self).__name__, self.from_cp.id, self.to_cp and self.to_cp.id)
+
     @property
     def is_player_attack(self) -> bool:
         return self.from_cp.captured
@@ -63,16 +86,17 @@ class Operation:
     def initialize(self, mission: Mission, conflict: Conflict):
         self.current_mission = mission
         self.conflict = conflict
-        self.armorgen = ArmorConflictGenerator(mission, conflict)
-        self.airgen = AircraftConflictGenerator(mission, conflict, self.game.settings)
-        self.aagen = AAConflictGenerator(mission, conflict)
-        self.shipgen = ShipGenerator(mission, conflict)
-        self.airsupportgen = AirSupportConflictGenerator(mission, conflict, self.game)
+        # each of the generators gets its own stream, so changes to one of them don't shift the others
+        self.armorgen = ArmorConflictGenerator(mission, conflict, self.random_stream("armor"))
+        self.airgen = AircraftConflictGenerator(mission, conflict, self.game.settings, self.random_stream("aircraft"))
+        self.aagen = AAConflictGenerator(mission, conflict, self.random_stream("aa"))
+        self.shipgen = ShipGenerator(mission, conflict, self.random_stream("ship"))
+        self.airsupportgen = AirSupportConflictGenerator(mission, conflict, self.game, self.random_stream("airsupport"))
         self.triggersgen = TriggersGenerator(mission, conflict, self.game)
-        self.visualgen = VisualGenerator(mission, conflict, self.game)
-        self.envgen = EnviromentGenerator(mission, conflict, self.game)
+        self.visualgen = VisualGenerator(mission, conflict, self.game, self.random_stream("visual"))
+        self.envgen = EnviromentGenerator(mission, conflict, self.game, self.random_stream("environment"))
         self.forcedoptionsgen = ForcedOptionsGenerator(mission, conflict, self.game)
-        self.groundobjectgen = GroundObjectsGenerator(mission, conflict, self.game)
+        self.groundobjectgen = GroundObjectsGenerator(mission, conflict, self.game, self.random_stream("groundobjects"))
         self.briefinggen = BriefingGenerator(mission, conflict, self.game)
 
         player_name = self.from_cp.captured and self.attacker_name or self.defender_name
@@ -85,6 +109,7 @@ class Operation:
 
         dcs.Mission.aaa_vehicle_group = aaa.aaa_vehicle_group
         self.current_mission = dcs.Mission(terrain)
+        naming.namegen.reset()
         if is_quick:
             self.quick_mission = self.current_mission
         else:
@@ -100,6 +125,21 @@ class Operation:
             self.attackers_starting_position = self.departure_cp.at
             self.defenders_starting_position = self.to_cp.at
 
+    def save(self, filename: str):
+        self.current_mission.save(filename)
+
+        # pydcs stamps archive entries with the current time
+        with zipfile.ZipFile(filename, "r") as f:
+            entries = [(info, f.read(info)) for info in f.infolist()]
+
+        with zipfile.ZipFile(filename, "w") as f:
+            for info, data in entries:
+                info.date_time = MISSION_ARCHIVE_DATE_TIME
+                f.writestr(info, data)
+
+        # units of the mission are indexed once it's complete, debriefing is resolved through the index
+        MissionIndex.build(self.current_mission, self.game.player, self.game.enemy).save(mission_index_path(filename))
+
     def prepare_carriers(self, for_units: db.UnitsDict):
         if not self.departure_cp.is_global:
             return
@@ -144,6 +184,8 @@ class Operation:
                                   is_quick=self.is_quick,
                                   activation_trigger_radius=self.trigger_radius,
                                   awacs_enabled=self.is_awacs_enabled)
+        if self.game.settings.live_telemetry:
+            self.triggersgen.generate_telemetry(is_quick=self.is_quick)
 
         # env settings
         if self.environment_settings is None:
@@ -45,20 +45,20 @@ class StrikeOperation(Operation):
         targets = []  # type: typing.List[typing.Tuple[str, str, Point]]
         sead_targets = []  # type: typing.List[typing.Tuple[str, str, Point]]
         category_counters = {}  # type: typing.Dict[str, int]
-        processed_groups = []
+        markpoint_names = {}  # type: typing.Dict[int, str]
 
-        for object in self.to_cp.ground_objects:
-            if object.group_identifier in processed_groups:
-                continue
-
-            processed_groups.append(object.group_identifier)
+        # first object of each of the groups stands for it
+        store = self.game.theater.ground_object_store
+        for start, _ in store.group_ranges(cp_id=self.to_cp.id):
+            object = store.objects[start]
             category_counters[object.category] = category_counters.get(object.category, 0) + 1
-            markpoint_name = "{}{}".format(object.name_abbrev, category_counters[object.category])
-
-            if object.category == "aa":
-                sead_targets.append((str(object), markpoint_name, object.position))
+            markpoint_names[object.group_id] = "{}{}".format(object.name_abbrev, category_counters[object.category])
+            targets.append((str(object), markpoint_names[object.group_id], object.position))
 
-            targets.append((str(object), markpoint_name, object.position))
+        # sites with any of the objects alive are still to be suppressed
+        for object in store.query(category="aa", cp_id=self.to_cp.id, alive=True):
+            if object.group_id in markpoint_names:
+                sead_targets.append((str(object), markpoint_names.pop(object.group_id), object.position))
 
         targets.sort(key=lambda x: self.from_cp.position.distance_to_point(x[2]))
 
@@ -0,0 +1,22 @@
+import random
+import typing
+
+RANDOM_SEED_MAX = 2 ** 32
+
+
+class RandomContext:
+    """
+    Seeded source of the random streams of the game. Each stream is derived from the seed and its name and scope only
+    (not from the order streams are requested in or how much of the other streams was consumed), so generators
+    using separate streams produce the same results no matter in which order (or in which process) they're run.
+    """
+
+    def __init__(self, seed: int = None):
+        self.seed = seed if seed is not None else random.randrange(RANDOM_SEED_MAX)
+
+    def stream(self, name: str, *scope: typing.Any) -> random.Random:
+        # string seeds are hashed with sha512, so streams are stable across processes and python runs
+        return random.Random(":".join(str(x) for x in (self.seed, name) + scope))
+
+    def __str__(self):
+        return "RandomContext({})".format(self.seed)
@@ -11,4 +11,5 @@ class Settings:
     multiplier = 1
     sams = True
     cold_start = False
+    live_telemetry = False
     version = None
@@ -1,15 +1,4 @@
-from .aaa import *
-from .aircraft import *
-from .armor import *
-from .airsupportgen import *
-from .conflictgen import *
-from .shipgen import *
-from .visualgen import *
-from .triggergen import *
-from .environmentgen import *
-from .groundobjectsgen import *
-from .briefinggen import *
-from .forcedoptionsgen import *
-
-from . import naming
-
+"""
+Mission generators. Submodules are imported directly where they're used (game.operation imports all of them),
+so that modules needing only the conflict geometry don't import every generator on startup.
+"""
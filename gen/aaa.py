@@ -88,9 +88,11 @@ def aaa_vehicle_group(self, country, name, _type: unittype.VehicleType, position
     For further docstrings, see the built-in function
     """
     vg = unitgroup.VehicleGroup(self.next_group_id(), self.string(name))
+    # signature is fixed by the Mission.vehicle_group, so the layout is seeded by the (unique in the mission) group name
+    rng = random.Random(name)
 
     for i in range(1, group_size + 1):
-        heading = randint(0, 359)
+        heading = rng.randint(0, 359)
         if _type == AirDefence.SAM_SA_3_S_125_LN_5P73:
             # 4 launchers (180 degrees all facing the same direction), 1 SR, 1 TR
             num_launchers = 4
@@ -109,7 +111,7 @@ def aaa_vehicle_group(self, country, name, _type: unittype.VehicleType, position
                 AirDefence.SAM_SA_3_S_125_TR_SNR,
             )
 
-            center_x = position.x + randint(20, 40)
+            center_x = position.x + rng.randint(20, 40)
             center_y = position.y + (i - 1) * 20
 
             v.position.x = center_x
@@ -185,7 +187,7 @@ def aaa_vehicle_group(self, country, name, _type: unittype.VehicleType, position
                 AirDefence.SAM_SA_10_S_300PS_TR_30N6,
             )
 
-            center_x = position.x + randint(20, 40)
+            center_x = position.x + rng.randint(20, 40)
             center_y = position.y + (i - 1) * 20
 
             v.position.x = center_x
@@ -198,7 +200,7 @@ def aaa_vehicle_group(self, country, name, _type: unittype.VehicleType, position
                 AirDefence.SAM_SA_10_S_300PS_CP_54K6,
             )
 
-            center_x = position.x + randint(40, 60)
+            center_x = position.x + rng.randint(40, 60)
             center_y = position.y + (i - 1) * 20
 
             v.position.x = center_x
@@ -244,7 +246,7 @@ def aaa_vehicle_group(self, country, name, _type: unittype.VehicleType, position
                 AirDefence.SAM_SA_10_S_300PS_TR_30N6,
             )
 
-            center_x = position.x + randint(20, 40)
+            center_x = position.x + rng.randint(20, 40)
             center_y = position.y + (i - 1) * 20
 
             v.position.x = center_x
@@ -257,7 +259,7 @@ def aaa_vehicle_group(self, country, name, _type: unittype.VehicleType, position
                 AirDefence.SAM_SA_10_S_300PS_CP_54K6,
             )
 
-            center_x = position.x + randint(40, 60)
+            center_x = position.x + rng.randint(40, 60)
             center_y = position.y + (i - 1) * 20
 
             v.position.x = center_x
@@ -299,9 +301,10 @@ def aaa_vehicle_group(self, country, name, _type: unittype.VehicleType, position
 
 
 class AAConflictGenerator:
-    def __init__(self, mission: Mission, conflict: Conflict):
+    def __init__(self, mission: Mission, conflict: Conflict, rng: random.Random = random):
         self.m = mission
         self.conflict = conflict
+        self.rng = rng
 
     def generate_at_defenders_location(self, units: db.AirDefenseDict):
         for unit_type, count in units.items():
@@ -310,17 +313,17 @@ class AAConflictGenerator:
                     country=self.conflict.defenders_side,
                     name=namegen.next_unit_name(self.conflict.defenders_side, unit_type),
                     _type=unit_type,
-                    position=self.conflict.ground_defenders_location.random_point_within(100, 100),
+                    position=random_point_within(self.rng, self.conflict.ground_defenders_location, 100, 100),
                     group_size=1)
 
     def generate(self, units: db.AirDefenseDict):
         for type, count in units.items():
             for _, radial in zip(range(count), self.conflict.radials):
-                distance = randint(
+                distance = self.rng.randint(
                     self.conflict.size * DISTANCE_FACTOR[0] + 9000,
                     self.conflict.size * DISTANCE_FACTOR[1] + 14000
                 )
-                p = self.conflict.position.point_from_heading(random.choice(self.conflict.radials), distance)
+                p = self.conflict.position.point_from_heading(self.rng.choice(self.conflict.radials), distance)
 
                 self.m.aaa_vehicle_group(
                         country=self.conflict.defenders_side,
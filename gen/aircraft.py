@@ -46,10 +46,11 @@ class AircraftConflictGenerator:
     escort_targets = [] # type: typing.List[typing.Tuple[FlyingGroup, int]]
     vertical_offset = None  # type: int
 
-    def __init__(self, mission: Mission, conflict: Conflict, settings: Settings):
+    def __init__(self, mission: Mission, conflict: Conflict, settings: Settings, rng: random.Random = random):
         self.m = mission
         self.settings = settings
         self.conflict = conflict
+        self.rng = rng
         self.vertical_offset = 0
         self.escort_targets = []
 
@@ -57,11 +58,11 @@ class AircraftConflictGenerator:
         return self.settings.cold_start and StartType.Cold or StartType.Warm
 
     def _group_point(self, point) -> Point:
-        distance = randint(
+        distance = self.rng.randint(
                 int(self.conflict.size * SPREAD_DISTANCE_FACTOR[0]),
                 int(self.conflict.size * SPREAD_DISTANCE_FACTOR[1]),
                 )
-        return point.random_point_within(distance, self.conflict.size * SPREAD_DISTANCE_FACTOR[0])
+        return random_point_within(self.rng, point, distance, self.conflict.size * SPREAD_DISTANCE_FACTOR[0])
 
     def _split_to_groups(self, dict: db.PlaneDict, clients: db.PlaneDict = None) -> typing.Collection[typing.Tuple[FlyingType, int, int]]:
         for flying_type, count in dict.items():
@@ -157,7 +158,7 @@ class AircraftConflictGenerator:
             alt = WARM_START_ALTITUDE + self.vertical_offset
             speed = WARM_START_AIRSPEED
 
-        pos = Point(at.x + random.randint(100, 1000), at.y + random.randint(100, 1000))
+        pos = Point(at.x + self.rng.randint(100, 1000), at.y + self.rng.randint(100, 1000))
 
         logging.info("airgen: {} for {} at {} at {}".format(unit_type, side.id, alt, speed))
         group = self.m.flight_group(
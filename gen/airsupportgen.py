@@ -19,10 +19,11 @@ AWACS_ALT = 13000
 class AirSupportConflictGenerator:
     generated_tankers = None  # type: typing.List[str]
 
-    def __init__(self, mission: Mission, conflict: Conflict, game):
+    def __init__(self, mission: Mission, conflict: Conflict, game, rng: random.Random = random):
         self.mission = mission
         self.conflict = conflict
         self.game = game
+        self.rng = rng
         self.generated_tankers = []
 
     @classmethod
@@ -60,7 +61,7 @@ class AirSupportConflictGenerator:
                 plane_type=awacs_unit,
                 altitude=AWACS_ALT,
                 airport=None,
-                position=self.conflict.position.random_point_within(AWACS_DISTANCE, AWACS_DISTANCE),
+                position=random_point_within(self.rng, self.conflict.position, AWACS_DISTANCE, AWACS_DISTANCE),
                 frequency=133,
                 start_type=StartType.Warm,
             )
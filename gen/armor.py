@@ -1,6 +1,5 @@
 import logging
 
-from random import randint
 from itertools import zip_longest
 
 from game import db
@@ -24,17 +23,18 @@ FIGHT_DISTANCE = 3500
 
 
 class ArmorConflictGenerator:
-    def __init__(self, mission: Mission, conflict: Conflict):
+    def __init__(self, mission: Mission, conflict: Conflict, rng: random.Random = random):
         self.m = mission
         self.conflict = conflict
+        self.rng = rng
 
     def _group_point(self, point) -> Point:
-        distance = randint(
+        distance = self.rng.randint(
                 int(self.conflict.size * SPREAD_DISTANCE_FACTOR[0]),
                 int(self.conflict.size * SPREAD_DISTANCE_FACTOR[1]),
                 )
 
-        return point.random_point_within(distance, self.conflict.size * SPREAD_DISTANCE_SIZE_FACTOR)
+        return random_point_within(self.rng, point, distance, self.conflict.size * SPREAD_DISTANCE_SIZE_FACTOR)
 
     def _generate_group(self, side: Country, unit: VehicleType, count: int, at: Point, to: Point = None, move_formation: PointAction = PointAction.OffRoad):
         for c in range(count):
@@ -97,16 +97,16 @@ class ArmorConflictGenerator:
                 at=self.conflict.ground_defenders_location)
 
     def generate_vec(self, attackers: db.ArmorDict, defenders: db.ArmorDict):
-        fights_count = randint(*FRONTLINE_CAS_FIGHTS_COUNT)
-        single_fight_defenders_count = min(int(sum(defenders.values()) / fights_count), randint(*FRONTLINE_CAS_GROUP_MIN))
+        fights_count = self.rng.randint(*FRONTLINE_CAS_FIGHTS_COUNT)
+        single_fight_defenders_count = min(int(sum(defenders.values()) / fights_count), self.rng.randint(*FRONTLINE_CAS_GROUP_MIN))
         defender_groups = list(db.unitdict_split(defenders, single_fight_defenders_count))
 
-        single_fight_attackers_count = min(int(sum(attackers.values()) / len(defender_groups)), randint(*FRONTLINE_CAS_GROUP_MIN))
+        single_fight_attackers_count = min(int(sum(attackers.values()) / len(defender_groups)), self.rng.randint(*FRONTLINE_CAS_GROUP_MIN))
         attacker_groups = list(db.unitdict_split(attackers, single_fight_attackers_count))
 
         for attacker_group_dict, target_group_dict in zip_longest(attacker_groups, defender_groups):
             position = self.conflict.position.point_from_heading(self.conflict.heading,
-                                                                 random.randint(0, self.conflict.distance))
+                                                                 self.rng.randint(0, self.conflict.distance))
             self._generate_fight_at(attacker_group_dict, target_group_dict, position)
 
     def generate_convoy(self, units: db.ArmorDict):
@@ -120,7 +120,7 @@ class ArmorConflictGenerator:
                 move_formation=PointAction.OnRoad)
 
     def generate_passengers(self, count: int):
-        unit_type = random.choice(db.find_unittype(Nothing, self.conflict.attackers_side.name))
+        unit_type = self.rng.choice(db.find_unittype(Nothing, self.conflict.attackers_side.name))
 
         self.m.vehicle_group(
             country=self.conflict.attackers_side,
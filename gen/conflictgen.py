@@ -1,9 +1,9 @@
 import logging
+import random
 import typing
 import pdb
 import dcs
 
-from random import randint
 from dcs import Mission
 
 from dcs.mission import *
@@ -49,11 +49,20 @@ FRONTLINE_LENGTH = 80000
 FRONTLINE_MIN_CP_DISTANCE = 5000
 FRONTLINE_DISTANCE_STRENGTH_FACTOR = 0.7
 
+GROUND_POSITION_COASTLINE_MARGIN = 100
+
 
 def _opposite_heading(h):
     return h+180
 
 
+def random_point_within(rng: random.Random, point: Point, outer_radius: float, inner_radius: float = 0) -> Point:
+    """
+    Same as Point.random_point_within, but drawing from the provided random stream instead of the global one.
+    """
+    return point.point_from_heading(rng.uniform(0, 360), rng.uniform(inner_radius, outer_radius))
+
+
 def _heading_sum(h, a) -> int:
     h += a
     if h > 360:
@@ -174,6 +183,10 @@ class Conflict:
 
     @classmethod
     def frontline_vector(cls, from_cp: ControlPoint, to_cp: ControlPoint, theater: ConflictTheater) -> typing.Optional[typing.Tuple[Point, int, int]]:
+        return theater.frontline_cache.get(from_cp, to_cp, lambda: cls._frontline_vector(from_cp, to_cp, theater))
+
+    @classmethod
+    def _frontline_vector(cls, from_cp: ControlPoint, to_cp: ControlPoint, theater: ConflictTheater) -> typing.Optional[typing.Tuple[Point, int, int]]:
         initial, heading = cls.frontline_position(theater, from_cp, to_cp)
 
         """
@@ -219,14 +232,15 @@ class Conflict:
 
     @classmethod
     def _extend_ground_position(cls, initial: Point, max_distance: int, heading: int, theater: ConflictTheater) -> Point:
-        pos = initial
-        for offset in range(0, int(max_distance), 500):
-            new_pos = initial.point_from_heading(heading, offset)
-            if theater.is_on_land(new_pos):
-                pos = new_pos
-            else:
-                return pos
-        return pos
+        land_intervals = theater.land_intervals(initial, heading, max_distance)
+        if not land_intervals or land_intervals[0][0] > 0:
+            return initial
+
+        exit_distance = land_intervals[0][1]
+        if exit_distance < max_distance:
+            # stay a bit off the coastline
+            exit_distance = max(exit_distance - GROUND_POSITION_COASTLINE_MARGIN, exit_distance / 2)
+        return initial.point_from_heading(heading, exit_distance)
 
         """
         probe_end_point = initial.point_from_heading(heading, max_distance)
@@ -242,13 +256,15 @@ class Conflict:
         """
 
     @classmethod
-    def _find_ground_position(cls, initial: Point, max_distance: int, heading: int, theater: ConflictTheater) -> typing.Optional[Point]:
-        pos = initial
-        for _ in range(0, int(max_distance), 500):
-            if theater.is_on_land(pos):
-                return pos
-
-            pos = pos.point_from_heading(heading, 500)
+    def _find_ground_position(cls, initial: Point, max_distance: int, heading: int, theater: ConflictTheater) -> Point:
+        land_intervals = theater.land_intervals(initial, heading, max_distance)
+        if land_intervals:
+            enter_distance, exit_distance = land_intervals[0]
+            if enter_distance == 0:
+                return initial
+
+            # step a bit inland from the coastline
+            return initial.point_from_heading(heading, min(enter_distance + GROUND_POSITION_COASTLINE_MARGIN, (enter_distance + exit_distance) / 2))
         """
         probe_end_point = initial.point_from_heading(heading, max_distance)
         probe = geometry.LineString([(initial.x, initial.y), (probe_end_point.x, probe_end_point.y) ])
@@ -318,14 +334,14 @@ class Conflict:
         )
 
     @classmethod
-    def intercept_position(cls, from_cp: ControlPoint, to_cp: ControlPoint) -> Point:
+    def intercept_position(cls, from_cp: ControlPoint, to_cp: ControlPoint, rng: random.Random = random) -> Point:
         raw_distance = from_cp.position.distance_to_point(to_cp.position) * 1.5
         distance = max(min(raw_distance, INTERCEPT_MAX_DISTANCE), INTERCEPT_MIN_DISTANCE)
-        heading = _heading_sum(from_cp.position.heading_between_point(to_cp.position), random.choice([-1, 1]) * random.randint(60, 100))
+        heading = _heading_sum(from_cp.position.heading_between_point(to_cp.position), rng.choice([-1, 1]) * rng.randint(60, 100))
         return from_cp.position.point_from_heading(heading, distance)
 
     @classmethod
-    def intercept_conflict(cls, attacker: Country, defender: Country, position: Point, from_cp: ControlPoint, to_cp: ControlPoint, theater: ConflictTheater):
+    def intercept_conflict(cls, attacker: Country, defender: Country, position: Point, from_cp: ControlPoint, to_cp: ControlPoint, theater: ConflictTheater, rng: random.Random = random):
         heading = from_cp.position.heading_between_point(position)
         return cls(
             position=position.point_from_heading(position.heading_between_point(to_cp.position), INTERCEPT_CONFLICT_DISTANCE),
@@ -336,14 +352,14 @@ class Conflict:
             defenders_side=defender,
             ground_attackers_location=None,
             ground_defenders_location=None,
-            air_attackers_location=position.point_from_heading(random.randint(*INTERCEPT_ATTACKERS_HEADING) + heading, INTERCEPT_ATTACKERS_DISTANCE),
+            air_attackers_location=position.point_from_heading(rng.randint(*INTERCEPT_ATTACKERS_HEADING) + heading, INTERCEPT_ATTACKERS_DISTANCE),
             air_defenders_location=position
         )
 
     @classmethod
-    def ground_attack_conflict(cls, attacker: Country, defender: Country, from_cp: ControlPoint, to_cp: ControlPoint, theater: ConflictTheater):
-        heading = random.choice(to_cp.radials)
-        initial_location = to_cp.position.random_point_within(*GROUND_ATTACK_DISTANCE)
+    def ground_attack_conflict(cls, attacker: Country, defender: Country, from_cp: ControlPoint, to_cp: ControlPoint, theater: ConflictTheater, rng: random.Random = random):
+        heading = rng.choice(to_cp.radials)
+        initial_location = random_point_within(rng, to_cp.position, *GROUND_ATTACK_DISTANCE)
         position = Conflict._find_ground_position(initial_location, GROUND_INTERCEPT_SPREAD, _heading_sum(heading, 180), theater)
         if not position:
             heading = to_cp.find_radial(to_cp.position.heading_between_point(from_cp.position))
@@ -392,7 +408,7 @@ class Conflict:
         )
 
     @classmethod
-    def frontline_cas_conflict(cls, attacker: Country, defender: Country, from_cp: ControlPoint, to_cp: ControlPoint, theater: ConflictTheater):
+    def frontline_cas_conflict(cls, attacker: Country, defender: Country, from_cp: ControlPoint, to_cp: ControlPoint, theater: ConflictTheater, rng: random.Random = random):
         assert cls.has_frontline_between(from_cp, to_cp)
         position, heading, distance = cls.frontline_vector(from_cp, to_cp, theater)
 
@@ -407,18 +423,18 @@ class Conflict:
             defenders_side=defender,
             ground_attackers_location=None,
             ground_defenders_location=None,
-            air_attackers_location=position.point_from_heading(random.randint(*INTERCEPT_ATTACKERS_HEADING) + heading, AIR_DISTANCE),
-            air_defenders_location=position.point_from_heading(random.randint(*INTERCEPT_ATTACKERS_HEADING) + _opposite_heading(heading), AIR_DISTANCE),
+            air_attackers_location=position.point_from_heading(rng.randint(*INTERCEPT_ATTACKERS_HEADING) + heading, AIR_DISTANCE),
+            air_defenders_location=position.point_from_heading(rng.randint(*INTERCEPT_ATTACKERS_HEADING) + _opposite_heading(heading), AIR_DISTANCE),
         )
 
     @classmethod
-    def frontline_cap_conflict(cls, attacker: Country, defender: Country, from_cp: ControlPoint, to_cp: ControlPoint, theater: ConflictTheater):
+    def frontline_cap_conflict(cls, attacker: Country, defender: Country, from_cp: ControlPoint, to_cp: ControlPoint, theater: ConflictTheater, rng: random.Random = random):
         assert cls.has_frontline_between(from_cp, to_cp)
 
         position, heading, distance = cls.frontline_vector(from_cp, to_cp, theater)
-        attack_position = position.point_from_heading(heading, randint(0, int(distance)))
+        attack_position = position.point_from_heading(heading, rng.randint(0, int(distance)))
         attackers_position = attack_position.point_from_heading(heading - 90, AIR_DISTANCE)
-        defenders_position = attack_position.point_from_heading(heading + 90, random.randint(*CAP_CAS_DISTANCE))
+        defenders_position = attack_position.point_from_heading(heading + 90, rng.randint(*CAP_CAS_DISTANCE))
 
         return cls(
             position=position,
@@ -457,8 +473,8 @@ class Conflict:
         )
 
     @classmethod
-    def naval_intercept_position(cls, from_cp: ControlPoint, to_cp: ControlPoint, theater: ConflictTheater):
-        radial = random.choice(to_cp.sea_radials)
+    def naval_intercept_position(cls, from_cp: ControlPoint, to_cp: ControlPoint, theater: ConflictTheater, rng: random.Random = random):
+        radial = rng.choice(to_cp.sea_radials)
 
         initial_distance = min(int(from_cp.position.distance_to_point(to_cp.position) * NAVAL_INTERCEPT_DISTANCE_FACTOR), NAVAL_INTERCEPT_DISTANCE_MAX)
         initial_position = to_cp.position.point_from_heading(radial, initial_distance)
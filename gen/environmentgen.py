@@ -14,7 +14,7 @@ from dcs.weather import *
 
 from game import db
 from theater import *
-from gen import *
+from .conflictgen import *
 
 WEATHER_CLOUD_BASE = 2000, 3000
 WEATHER_CLOUD_DENSITY = 1, 8
@@ -53,19 +53,20 @@ class EnvironmentSettings:
 
 
 class EnviromentGenerator:
-    def __init__(self, mission: Mission, conflict: Conflict, game):
+    def __init__(self, mission: Mission, conflict: Conflict, game, rng: random.Random = random):
         self.mission = mission
         self.conflict = conflict
         self.game = game
+        self.rng = rng
 
     def _gen_random_time(self):
-        self._set_time(_gen_random_time(self.game.settings.night_disabled)['start_time'])
+        self._set_time(_gen_random_time(self.game.settings.night_disabled, self.rng)['start_time'])
 
     def _set_time(self, the_time):
         self.mission.start_time = the_time
 
     def _generate_wind(self, wind_speed, wind_direction=None):
-        self._set_wind(_generate_wind(wind_speed, wind_direction))
+        self._set_wind(_generate_wind(wind_speed, wind_direction, self.rng))
 
     def _set_wind(self, wind):
         self.mission.weather.wind_at_ground = Wind(wind['atGround']['dir'], wind['atGround']['speed'])
@@ -73,7 +74,7 @@ class EnviromentGenerator:
         self.mission.weather.wind_at_8000 = Wind(wind['at8000']['dir'], wind['at8000']['speed'])
 
     def _generate_base_weather(self):
-        self._set_base_weather(_generate_base_weather())
+        self._set_base_weather(_generate_base_weather(self.rng))
 
     def _set_base_weather(self, weather):
         # clouds
@@ -92,11 +93,11 @@ class EnviromentGenerator:
 
     def _gen_random_weather(self):
         for k, v in RANDOM_WEATHER.items():
-            if random.randint(0, 100) <= v:
+            if self.rng.randint(0, 100) <= v:
                 weather_type = k
                 break
 
-        weather = _gen_random_weather(weather_type)
+        weather = _gen_random_weather(weather_type, self.rng)
         self._set_base_weather(weather)
 
         logging.info("generated weather {}".format(weather_type))
@@ -121,7 +122,7 @@ class EnviromentGenerator:
         self.mission.weather.load_from_dict(settings.weather_dict)
 
 
-def _gen_random_time(night_disabled=False):
+def _gen_random_time(night_disabled=False, rng: random.Random = random):
     start_time = datetime.strptime('May 25 2018 12:00AM', '%b %d %Y %I:%M%p')
 
     time_range = None
@@ -129,11 +130,11 @@ def _gen_random_time(night_disabled=False):
         if night_disabled and k == "night":
             continue
 
-        if random.randint(0, 100) <= v:
+        if rng.randint(0, 100) <= v:
             time_range = DAY_TIME_MAP[k]
             break
 
-    start_time += timedelta(hours=random.randint(*time_range))
+    start_time += timedelta(hours=rng.randint(*time_range))
     logging.info("time - {}, slot - {}, night skipped - {}".format(
         str(start_time),
         str(time_range),
@@ -141,10 +142,10 @@ def _gen_random_time(night_disabled=False):
     return {'start_time': start_time}
 
 
-def _generate_wind(wind_speed, wind_direction=None):
+def _generate_wind(wind_speed, wind_direction=None, rng: random.Random = random):
     # wind
     if not wind_direction:
-        wind_direction = random.randint(0, 360)
+        wind_direction = rng.randint(0, 360)
 
     return {
         'atGround': Wind(wind_direction, wind_speed).dict(),
@@ -153,54 +154,54 @@ def _generate_wind(wind_speed, wind_direction=None):
     }
 
 
-def _generate_base_weather():
+def _generate_base_weather(rng: random.Random = random):
     data = {
         'clouds': {
-            'base': random.randint(*WEATHER_CLOUD_BASE),
-            'density': random.randint(*WEATHER_CLOUD_DENSITY),
-            'thickness': random.randint(*WEATHER_CLOUD_THICKNESS),
+            'base': rng.randint(*WEATHER_CLOUD_BASE),
+            'density': rng.randint(*WEATHER_CLOUD_DENSITY),
+            'thickness': rng.randint(*WEATHER_CLOUD_THICKNESS),
         },
-        'wind': _generate_wind(random.randint(0, 4)),
+        'wind': _generate_wind(rng.randint(0, 4), rng=rng),
         'fog': {}
     }
 
     # fog
-    if random.randint(0, 100) < WEATHER_FOG_CHANCE:
-        data['fog']['visibility'] = random.randint(*WEATHER_FOG_VISIBILITY)
-        data['fog']['thickness'] = random.randint(*WEATHER_FOG_THICKNESS)
+    if rng.randint(0, 100) < WEATHER_FOG_CHANCE:
+        data['fog']['visibility'] = rng.randint(*WEATHER_FOG_VISIBILITY)
+        data['fog']['thickness'] = rng.randint(*WEATHER_FOG_THICKNESS)
     return data
 
 
-def _gen_random_weather(weather_type=None):
+def _gen_random_weather(weather_type=None, rng: random.Random = random):
     data = {
         'clouds': {},
     }
     if not weather_type:
         for k, v in RANDOM_WEATHER.items():
-            if random.randint(0, 100) <= v:
+            if rng.randint(0, 100) <= v:
                 weather_type = k
                 break
 
     logging.info("generated weather {}".format(weather_type))
     if weather_type == 1:
         # thunderstorm
-        data = _generate_base_weather()
-        data['wind'] = _generate_wind(random.randint(8, 12))
-        data['clouds']['density'] = random.randint(9, 10)
+        data = _generate_base_weather(rng)
+        data['wind'] = _generate_wind(rng.randint(8, 12), rng=rng)
+        data['clouds']['density'] = rng.randint(9, 10)
         data['clouds']['iprecptns'] = Weather.Preceptions.Thunderstorm
     elif weather_type == 2:
         # rain
-        data = _generate_base_weather()
-        data['wind'] = _generate_wind(random.randint(4, 8))
-        data['clouds']['density'] = random.randint(5, 8)
+        data = _generate_base_weather(rng)
+        data['wind'] = _generate_wind(rng.randint(4, 8), rng=rng)
+        data['clouds']['density'] = rng.randint(5, 8)
         data['clouds']['iprecptns'] = Weather.Preceptions.Rain
     elif weather_type == 3:
         # clouds
-        data = _generate_base_weather()
+        data = _generate_base_weather(rng)
     elif weather_type == 4:
         # clear
         # front line smokes look silly w/o any wind
-        data['wind'] = _generate_wind(1)
+        data['wind'] = _generate_wind(1, rng=rng)
 
     if 'density' in data['clouds']:
         # sometimes clouds are randomized way too low and need to be fixed
@@ -208,8 +209,8 @@ def _gen_random_weather(weather_type=None):
     return data
 
 
-def generate():
+def generate(rng: random.Random = random):
     settings = EnvironmentSettings()
-    settings.start_time = _gen_random_time()['start_time']
-    settings.weather_dict = _gen_random_weather()
+    settings.start_time = _gen_random_time(rng=rng)['start_time']
+    settings.weather_dict = _gen_random_weather(rng=rng)
     return settings
@@ -14,10 +14,11 @@ AA_CP_MIN_DISTANCE = 40000
 class GroundObjectsGenerator:
     FARP_CAPACITY = 4
 
-    def __init__(self, mission: Mission, conflict: Conflict, game):
+    def __init__(self, mission: Mission, conflict: Conflict, game, rng: random.Random = random):
         self.m = mission
         self.conflict = conflict
         self.game = game
+        self.rng = rng
 
     def generate_farps(self, number_of_units=1) -> typing.Collection[StaticGroup]:
         if self.conflict.is_vector:
@@ -58,7 +59,7 @@ class GroundObjectsGenerator:
                 if ground_object.is_dead:
                     continue
 
-                unit_type = random.choice(self.game.commision_unit_types(cp, AirDefence))
+                unit_type = self.rng.choice(self.game.commision_unit_types(cp, AirDefence))
                 assert unit_type is not None, "Cannot find unit type for GroundObject defense ({})!".format(cp)
 
                 group = self.m.aaa_vehicle_group(
@@ -82,12 +83,13 @@ class GroundObjectsGenerator:
 
                 if ground_object.group_id not in consumed_farps:
                     consumed_farps.add(ground_object.group_id)
-                    if random.randint(0, 100) > 50:
+                    if self.rng.randint(0, 100) > 50:
                         farp_aa(
                             self.m,
                             side,
                             ground_object.string_identifier,
                             ground_object.position,
+                            self.rng,
                         )
 
                 group = self.m.static_group(
@@ -102,13 +104,14 @@ class GroundObjectsGenerator:
                 logging.info("generated {}object identifier {} with mission id {}".format("dead " if ground_object.is_dead else "", group.name, group.id))
 
 
-def farp_aa(mission_obj, country, name, position: mapping.Point):
+def farp_aa(mission_obj, country, name, position: mapping.Point, rng: random.Random = random):
     """
     Add AAA to a FARP :)
     :param mission_obj:
     :param country:
     :param name:
     :param position:
+    :param rng:
     :return:
     """
     vg = unitgroup.VehicleGroup(mission_obj.next_group_id(), mission_obj.string(name))
@@ -119,10 +122,10 @@ def farp_aa(mission_obj, country, name, position: mapping.Point):
         Armor.MBT_T_55,
     ]
 
-    v = mission_obj.vehicle(name + "_AAA", random.choice(units))
-    v.position.x = position.x - random.randint(5, 30)
-    v.position.y = position.y - random.randint(5, 30)
-    v.heading = random.randint(0, 359)
+    v = mission_obj.vehicle(name + "_AAA", rng.choice(units))
+    v.position.x = position.x - rng.randint(5, 30)
+    v.position.y = position.y - rng.randint(5, 30)
+    v.heading = rng.randint(0, 359)
     vg.add_unit(v)
 
     wp = vg.add_waypoint(vg.units[0].position, PointAction.OffRoad, 0)
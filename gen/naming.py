@@ -4,6 +4,9 @@ from game import db
 class NameGenerator:
     number = 0
 
+    def reset(self):
+        self.number = 0
+
     def next_unit_name(self, country, unit_type):
         self.number += 1
         return "unit|{}|{}|{}|".format(country.id, self.number, db.unit_type_name(unit_type))
@@ -12,9 +12,10 @@ SHIP_RANDOM_SPREAD = 300
 
 
 class ShipGenerator:
-    def __init__(self, mission: Mission, conflict: Conflict):
+    def __init__(self, mission: Mission, conflict: Conflict, rng: random.Random = random):
         self.m = mission
         self.conflict = conflict
+        self.rng = rng
 
     def generate_carrier(self, for_units: typing.Collection[UnitType], country: str, at: Point) -> ShipGroup:
         type = db.find_unittype(Carriage, country)[0]
@@ -44,7 +45,7 @@ class ShipGenerator:
                     country=self.conflict.defenders_side,
                     name=namegen.next_unit_name(self.conflict.defenders_side, unit_type),
                     _type=unit_type,
-                    position=self.conflict.ground_defenders_location.random_point_within(SHIP_RANDOM_SPREAD, SHIP_RANDOM_SPREAD).point_from_heading(0, offset * SHIP_RANDOM_SPREAD)
+                    position=random_point_within(self.rng, self.conflict.ground_defenders_location, SHIP_RANDOM_SPREAD, SHIP_RANDOM_SPREAD).point_from_heading(0, offset * SHIP_RANDOM_SPREAD)
                 )
 
                 group.add_waypoint(self.conflict.to_cp.position)
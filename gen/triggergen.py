@@ -13,7 +13,7 @@ from dcs.action import *
 from game import db
 from theater import *
 from gen.airsupportgen import AirSupportConflictGenerator
-from gen import *
+from .conflictgen import *
 
 PUSH_TRIGGER_SIZE = 3000
 PUSH_TRIGGER_ACTIVATION_AGL = 25
@@ -30,6 +30,8 @@ TRIGGER_RADIUS_MEDIUM = 100000
 TRIGGER_RADIUS_LARGE = 150000
 TRIGGER_RADIUS_ALL_MAP = 3000000
 
+TELEMETRY_SCRIPT = "resources/scripts/liberation_telemetry.lua"
+
 
 class Silence(Option):
     Key = 7
@@ -143,6 +145,13 @@ class TriggersGenerator:
                 for vehicle_group in country.vehicle_group:
                     vehicle_group.set_skill(Skill(skill_level[1]))
 
+    def generate_telemetry(self, is_quick: bool):
+        # script reports which of the missions is played, so the results are resolved against it
+        telemetry_trigger = TriggerStart(Event.NoEvent, "Live telemetry")
+        telemetry_trigger.add_action(DoScript(self.mission.string("liberation_telemetry_is_quick = {}".format(is_quick and "true" or "false"))))
+        telemetry_trigger.add_action(DoScriptFile(self.mission.map_resource.add_resource_file(TELEMETRY_SCRIPT)))
+        self.mission.triggerrules.triggers.append(telemetry_trigger)
+
     def generate(self, player_cp: ControlPoint, is_quick: bool, activation_trigger_radius: int, awacs_enabled: bool):
         player_coalition = self.game.player == "USA" and "blue" or "red"
         enemy_coalition = player_coalition == "blue" and "red" or "blue"
@@ -92,10 +92,11 @@ def turn_heading(heading, fac):
 class VisualGenerator:
     game = None  # type: Game
 
-    def __init__(self, mission: Mission, conflict: Conflict, game):
+    def __init__(self, mission: Mission, conflict: Conflict, game, rng: random.Random = random):
         self.mission = mission
         self.conflict = conflict
         self.game = game
+        self.rng = rng
 
     def _generate_frontline_smokes(self):
         for from_cp, to_cp in self.game.theater.conflicts():
@@ -109,22 +110,27 @@ class VisualGenerator:
             point, heading = frontline
             plane_start = point.point_from_heading(turn_heading(heading, 90), FRONTLINE_LENGTH / 2)
 
+            smokes = []
             for offset in range(0, FRONTLINE_LENGTH, FRONT_SMOKE_SPACING):
                 position = plane_start.point_from_heading(turn_heading(heading, - 90), offset)
 
                 for k, v in FRONT_SMOKE_TYPE_CHANCES.items():
-                    if random.randint(0, 100) <= k:
-                        pos = position.random_point_within(FRONT_SMOKE_RANDOM_SPREAD, FRONT_SMOKE_RANDOM_SPREAD)
-                        if not self.game.theater.is_on_land(pos):
-                            break
-
-                        self.mission.static_group(
-                            self.mission.country(self.game.enemy),
-                            "",
-                            _type=v,
-                            position=pos)
+                    if self.rng.randint(0, 100) <= k:
+                        pos = random_point_within(self.rng, position, FRONT_SMOKE_RANDOM_SPREAD, FRONT_SMOKE_RANDOM_SPREAD)
+                        smokes.append((v, pos))
                         break
 
+            on_land = self.game.theater.is_on_land_many([pos for _, pos in smokes])
+            for (v, pos), is_on_land in zip(smokes, on_land):
+                if not is_on_land:
+                    continue
+
+                self.mission.static_group(
+                    self.mission.country(self.game.enemy),
+                    "",
+                    _type=v,
+                    position=pos)
+
     def _generate_stub_planes(self):
         mission_units = set()
         for coalition_name, coalition in self.mission.coalition.items():
@@ -140,8 +146,8 @@ class VisualGenerator:
         spread = target.size * DESTINATION_SMOKE_DISTANCE_FACTOR
         for _ in range(0, int(target.size * DESTINATION_SMOKE_AMOUNT_FACTOR * (1.1 - target.base.strength))):
             for k, v in DESTINATION_SMOKE_TYPE_CHANCES.items():
-                if random.randint(0, 100) <= k:
-                    position = target.position.random_point_within(0, spread)
+                if self.rng.randint(0, 100) <= k:
+                    position = random_point_within(self.rng, target.position, 0, spread)
                     if not self.game.theater.is_on_land(position):
                         break
 
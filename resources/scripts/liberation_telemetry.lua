@@ -0,0 +1,65 @@
+-- Live kill telemetry for DCS Liberation (optional).
+--
+-- Streams the dead and crash events of the mission to Liberation running on the same machine, as newline delimited
+-- JSON over UDP, so the results are committed as soon as the mission ends instead of waiting for the debriefing log.
+--
+-- Setup:
+-- 1. LuaSocket is sanitized out of the mission scripting environment by default, comment out the
+--    sanitizeModule('package') and sanitizeModule('require') lines (or _G['require'] = nil and _G['package'] = nil)
+--    in "DCS World/Scripts/MissionScripting.lua".
+-- 2. Enable "Live kill telemetry" in the Liberation configuration.
+--
+-- Liberation then loads this file into each of the generated missions with the mission start trigger, which sets
+-- liberation_telemetry_is_quick beforehand, so the results are resolved against the mission that was played.
+
+package.path = package.path .. ";.\\LuaSocket\\?.lua"
+package.cpath = package.cpath .. ";.\\LuaSocket\\?.dll"
+
+local socket = require("socket")
+
+local TELEMETRY_HOST = "127.0.0.1"
+local TELEMETRY_PORT = 16420
+
+local udp = socket.udp()
+udp:settimeout(0)
+udp:setpeername(TELEMETRY_HOST, TELEMETRY_PORT)
+
+local function send(message)
+    udp:send(message .. "\n")
+end
+
+local function mission_id(object)
+    if object == nil then
+        return nil
+    end
+
+    local ok, id = pcall(function() return object:getID() end)
+    if ok then
+        return id
+    end
+    return nil
+end
+
+local handler = {}
+
+function handler:onEvent(event)
+    if event.id == world.event.S_EVENT_DEAD or event.id == world.event.S_EVENT_CRASH then
+        local id = mission_id(event.initiator)
+        if id ~= nil then
+            local event_type = "crash"
+            if event.id == world.event.S_EVENT_DEAD then
+                event_type = "dead"
+            end
+            send(string.format('{"type":"%s","initiatorMissionID":"%d","t":%.3f}', event_type, id, event.time))
+        end
+    elseif event.id == world.event.S_EVENT_MISSION_END then
+        send(string.format('{"type":"mission end","t":%.3f}', event.time))
+    end
+end
+
+if liberation_telemetry_is_quick == nil then
+    send('{"type":"mission start"}')
+else
+    send(string.format('{"type":"mission start","is_quick":%s}', tostring(liberation_telemetry_is_quick)))
+end
+world.addEventHandler(handler)
@@ -1,11 +1,19 @@
-import pickle
+import sys
 
 from dcs.mission import Mission
-from dcs.planes import A_10C
 
-for terrain in ["cau", "gulf", "nev"]:
+from theater.landmap import load_landmap, save_landmap
+
+"""
+Run from the root directory. Pass --convert to convert legacy pickled landmaps to the binary format instead.
+"""
+
+TERRAINS = ["cau", "gulf", "nev"]
+
+
+def generate_landmap(terrain: str):
     m = Mission()
-    m.load_file("./{}_terrain.miz".format(terrain))
+    m.load_file("resources/tools/{}_terrain.miz".format(terrain))
 
     inclusion_zones = []
     exclusion_zones = []
@@ -21,6 +29,18 @@ for terrain in ["cau", "gulf", "nev"]:
             else:
                 inclusion_zones.append(zone)
 
-    with open("../{}landmap.p".format(terrain), "wb") as f:
-        print(len(inclusion_zones), len(exclusion_zones))
-        pickle.dump((inclusion_zones, exclusion_zones), f)
+    print(len(inclusion_zones), len(exclusion_zones))
+    save_landmap("resources/{}landmap.lmap".format(terrain), (inclusion_zones, exclusion_zones))
+
+
+def convert_landmap(terrain: str):
+    landmap = load_landmap("resources/{}landmap.p".format(terrain))
+    print(len(landmap[0]), len(landmap[1]))
+    save_landmap("resources/{}landmap.lmap".format(terrain), landmap)
+
+
+for terrain in TERRAINS:
+    if "--convert" in sys.argv:
+        convert_landmap(terrain)
+    else:
+        generate_landmap(terrain)
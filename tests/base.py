@@ -0,0 +1,82 @@
+import itertools
+import math
+import pickle
+import random
+
+from dcs.task import *
+from dcs.vehicles import AirDefence
+
+from game import db
+from theater.base import Base, PLANES_SCRAMBLE_FACTOR, PLANES_SCRAMBLE_MIN_BASE, PLANES_SCRAMBLE_MAX_BASE
+
+SEQUENCES = 200
+STEPS = 30
+MULTIPLIERS = [0.5, 1, 2]
+TASKS = list(db.UNIT_BY_TASK)
+COMMISIONED_TASKS = [CAS, CAP, Embarking, PinpointStrike, AirDefence]
+
+# units commision_units accepts, SAM site parts go through the SAM_CONVERT path of commit_losses
+UNITS = [x for x in set(itertools.chain(*db.UNIT_BY_TASK.values())) if db.unit_task(x) in COMMISIONED_TASKS]
+UNITS.sort(key=db.unit_type_name)
+SAM_PARTS = sorted([x for x in db.SAM_CONVERT if x != "except"] + list(db.SAM_CONVERT["except"]), key=db.unit_type_name)
+
+
+def expected_total_units(base: Base, task: Task) -> int:
+    return sum([c for t, c in itertools.chain(base.aircraft.items(), base.armor.items(), base.aa.items()) if t in db.UNIT_BY_TASK[task]])
+
+
+def expected_scramble_count(base: Base, multiplier: float, task: Task) -> int:
+    count = sum([v for k, v in base.aircraft.items() if db.unit_task(k) == task])
+    count = int(math.ceil(count * PLANES_SCRAMBLE_FACTOR * base.strength))
+    return min(min(max(count, PLANES_SCRAMBLE_MIN_BASE), int(PLANES_SCRAMBLE_MAX_BASE * multiplier)), count)
+
+
+def check(base: Base, step: str):
+    for task in TASKS:
+        assert base.total_units(task) == expected_total_units(base, task), "total_units({}) mismatch after {}".format(task.__name__, step)
+        for multiplier in MULTIPLIERS:
+            assert base.scramble_count(multiplier, task) == expected_scramble_count(base, multiplier, task), \
+                "scramble_count({}, {}) mismatch after {}".format(multiplier, task.__name__, step)
+
+
+def random_units(rng: random.Random, units: list, max_count: int) -> dict:
+    return {rng.choice(units): rng.randint(1, max_count) for _ in range(rng.randint(1, 4))}
+
+
+def execute(seed: int):
+    rng = random.Random(seed)
+    base = Base()
+    base.strength = rng.choice([0.1, 0.5, 1])
+
+    for _ in range(STEPS):
+        step = rng.choice(["commision", "losses", "sam losses", "filter", "set", "pickle"])
+        if step == "commision":
+            base.commision_units(random_units(rng, UNITS + SAM_PARTS, 6))
+        elif step == "losses":
+            present = [t for t, _ in base.all_units]
+            if present:
+                base.commit_losses(random_units(rng, present, 4))
+        elif step == "sam losses":
+            base.commit_losses(random_units(rng, SAM_PARTS, 3))
+        elif step == "filter":
+            base.filter_units(rng.sample(UNITS, len(UNITS) // 2))
+        elif step == "set":
+            units = random_units(rng, UNITS, 6)
+            base.set_units({k: v for k, v in units.items() if k in db.UNIT_BY_TASK[CAP] or k in db.UNIT_BY_TASK[CAS]},
+                           {k: v for k, v in units.items() if k in db.UNIT_BY_TASK[PinpointStrike]},
+                           {k: v for k, v in units.items() if k in db.UNIT_BY_TASK[AirDefence]})
+        else:
+            # totals aren't pickled, they're rebuilt on demand
+            base = pickle.loads(pickle.dumps(base))
+
+        check(base, step)
+
+
+def execute_all():
+    for seed in range(SEQUENCES):
+        execute(seed)
+    print("Base totals match the recount in {} sequences of {} steps".format(SEQUENCES, STEPS))
+
+
+if __name__ == "__main__":
+    execute_all()
@@ -0,0 +1,10 @@
+from game import db
+
+
+def execute_all():
+    db.validate_db()
+    print("Unit tables of {} countries, {} tasks are valid".format(len(db.UNIT_BY_COUNTRY), len(db.UNIT_BY_TASK)))
+
+
+if __name__ == "__main__":
+    execute_all()
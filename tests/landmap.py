@@ -0,0 +1,65 @@
+import os
+import random
+
+from theater.landmap import *
+from theater.landmapgrid import *
+
+LANDMAP_FILES = ["resources/caulandmap.lmap", "resources/gulflandmap.lmap", "resources/nevlandmap.lmap"]
+RANDOM_POINTS_COUNT = 2000
+RANDOM_SEGMENTS_COUNT = 200
+
+
+def random_points(zone: Zone, count: int) -> typing.List[typing.Tuple[float, float]]:
+    xs, ys = [x for x, _ in zone], [y for _, y in zone]
+    result = [(random.uniform(min(xs), max(xs)), random.uniform(min(ys), max(ys))) for _ in range(count)]
+    # vertices are the edge cases for the ray casting
+    return result + list(zone)
+
+
+def execute(filename: str):
+    print("Landmap: {}".format(filename))
+    landmap = load_landmap(filename)
+    assert landmap, "failed to load {}".format(filename)
+
+    legacy_landmap = load_landmap(os.path.splitext(filename)[0] + ".p")
+    assert [list(x) for x in landmap[0]] == legacy_landmap[0], "inclusion zones mismatch for {}".format(filename)
+    assert [list(x) for x in landmap[1]] == legacy_landmap[1], "exclusion zones mismatch for {}".format(filename)
+
+    packed_inclusion, packed_exclusion = pack_landmap(landmap)
+    for zone, packed_zone in zip(list(landmap[0]) + list(landmap[1]), packed_inclusion + packed_exclusion):
+        points = random_points(zone, RANDOM_POINTS_COUNT)
+        expected = [poly_contains(x, y, zone) for x, y in points]
+        result = poly_contains_many([x for x, _ in points], [y for _, y in points], packed_zone)
+        assert expected == result, "poly_contains_many mismatch for {}".format(filename)
+
+    for zone, packed_zone in zip(list(landmap[0]) + list(landmap[1]), packed_inclusion + packed_exclusion):
+        # vertices are left out, segments between those would run along the zone edges
+        points = random_points(zone, RANDOM_SEGMENTS_COUNT * 2)[:RANDOM_SEGMENTS_COUNT * 2]
+        for (x1, y1), (x2, y2) in zip(points[::2], points[1::2]):
+            crossings = sorted(segment_crossings(x1, y1, x2, y2, packed_zone) | {0.0, 1.0})
+            for a, b in zip(crossings, crossings[1:]):
+                # segment can't enter or leave the zone in between of the crossings
+                samples = [a + (b - a) * k / 4 for k in range(1, 4)]
+                contains = [poly_contains(x1 + (x2 - x1) * t, y1 + (y2 - y1) * t, zone) for t in samples]
+                assert len(set(contains)) == 1, "segment_crossings missed crossing for {}".format(filename)
+
+    grid = LandmapGrid.build(landmap)
+    for x, y in random_points(landmap[0][0], RANDOM_POINTS_COUNT):
+        cell = grid.cell_at(x, y)
+        if cell == CELL_MIXED:
+            continue
+
+        is_included = any(poly_contains(x, y, zone) for zone in landmap[0])
+        is_excluded = any(poly_contains(x, y, zone) for zone in landmap[1])
+        assert (cell == CELL_SEA) == (not is_included), "grid sea mismatch for {}".format(filename)
+        assert (cell == CELL_LAND) == (is_included and not is_excluded), "grid land mismatch for {}".format(filename)
+
+
+def execute_all():
+    random.seed(0)
+    for filename in LANDMAP_FILES:
+        execute(filename)
+
+
+if __name__ == "__main__":
+    execute_all()
@@ -0,0 +1,100 @@
+import os
+import tempfile
+
+from dcs.task import CAP
+
+from game import db
+from game.game import Game
+from game.randomcontext import RandomContext
+from theater import registry, start_generator
+from userdata import persistency, savestate
+
+PLAYER_COUNTRY = "USA"
+ENEMY_COUNTRY = "Russia"
+TURNS = 3
+
+
+def new_game(theater_name: str) -> Game:
+    theater = registry.create_theater(theater_name)
+    random_context = RandomContext(1)
+    start_generator.generate_inital_units(theater, ENEMY_COUNTRY, True, 1)
+    start_generator.generate_groundobjects(theater, random_context.stream("groundobjects"))
+
+    game = Game(PLAYER_COUNTRY, ENEMY_COUNTRY, theater, random_context)
+    for _ in range(TURNS):
+        game.pass_turn(no_action=True)
+
+    delivery = game.units_delivery_event(theater.player_points()[0])
+    delivery.deliver({db.find_unittype(CAP, PLAYER_COUNTRY)[0]: 2})
+    return game
+
+
+def base_state(game: Game):
+    return [(cp.name, cp.captured, cp.base.aircraft, cp.base.armor, cp.base.aa, cp.base.strength, cp.base.commision_points)
+            for cp in game.theater.controlpoints]
+
+
+def ground_objects_state(game: Game):
+    return [(x.string_identifier, x.dcs_identifier, x.heading, x.position and (x.position.x, x.position.y), x.is_dead)
+            for cp in game.theater.controlpoints for x in cp.ground_objects]
+
+
+def events_state(game: Game):
+    index = {cp: i for i, cp in enumerate(game.theater.controlpoints)}
+    return [(type(x), index[x.from_cp], index[x.to_cp], (x.location.x, x.location.y), x.attacker_name, x.defender_name, getattr(x, "units", None))
+            for x in game.events]
+
+
+def execute(theater_name: str):
+    game = new_game(theater_name)
+    game.theater.controlpoints[0].ground_objects[0].is_dead = True
+
+    restored = savestate.loads(savestate.dumps(game))
+
+    assert restored.theater is not game.theater
+    assert restored.theater.controlpoints[0] is not game.theater.controlpoints[0], "control points are shared by the games"
+    assert (restored.turn, restored.budget, restored.settings.__dict__) == (game.turn, game.budget, game.settings.__dict__)
+    assert restored.campaign_id == game.campaign_id, "campaign id differs"
+    assert base_state(restored) == base_state(game), "bases differ"
+    assert any(x[-1] for x in base_state(game)), "no commision points to compare"
+    assert ground_objects_state(restored) == ground_objects_state(game), "ground objects differ"
+    assert events_state(restored) == events_state(game), "events differ"
+    assert events_state(game), "no events to compare"
+
+    print("{}: {} control points, {} ground objects, {} events restored".format(
+        theater_name, len(restored.theater.controlpoints), len(ground_objects_state(restored)), len(restored.events)))
+
+
+def turn_saves(campaign_id: str):
+    return sorted(x for x in os.listdir(persistency.base_path()) if persistency.TURN_SAVE_PATTERN.match(x) and x.endswith(campaign_id))
+
+
+def execute_turn_saves():
+    with tempfile.TemporaryDirectory() as user_folder:
+        os.mkdir(os.path.join(user_folder, "DCS"))
+        persistency.setup(user_folder)
+
+        # same seed and theater, still the other campaign
+        first, second = new_game(registry.DEFAULT_THEATER), new_game(registry.DEFAULT_THEATER)
+        assert first.campaign_id != second.campaign_id, "campaigns share the id"
+        for game, turns in [(first, 8), (second, 2)]:
+            for turn in range(turns):
+                game.turn = turn
+                assert persistency.save_game(game).result(), "failed to save"
+
+        expected = ["liberation_save_turn{}_{}".format(x, first.campaign_id) for x in range(8 - persistency.TURN_SAVES_COUNT, 8)]
+        assert turn_saves(first.campaign_id) == sorted(expected), "turn saves of the first campaign {}".format(turn_saves(first.campaign_id))
+        assert len(turn_saves(second.campaign_id)) == 2, "turn saves of the second campaign {}".format(turn_saves(second.campaign_id))
+        assert persistency.restore_game().campaign_id == second.campaign_id
+
+    print("Turn saves are kept for each of the campaigns")
+
+
+def execute_all():
+    for theater_name in registry.THEATERS:
+        execute(theater_name)
+    execute_turn_saves()
+
+
+if __name__ == "__main__":
+    execute_all()
@@ -0,0 +1,105 @@
+import json
+import socket
+import time
+
+from dcs.task import PinpointStrike
+
+from game import db
+from userdata.missionindex import MissionIndex
+from userdata.telemetry import TelemetryListener, TELEMETRY_HOST
+
+TEST_PORT = 16421
+RESULT_TIMEOUT = 5
+UNIT_TYPE = db.find_unittype(PinpointStrike, "Russia")[0]
+
+
+class StandInEmitter:
+    """
+    Sends the messages the way resources/scripts/liberation_telemetry.lua does in the mission.
+    """
+
+    def __init__(self, tcp: bool):
+        self.tcp = tcp
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM if tcp else socket.SOCK_DGRAM)
+        self.socket.connect((TELEMETRY_HOST, TEST_PORT))
+
+    def send_line(self, line: bytes):
+        if self.tcp:
+            self.socket.sendall(line + b"\n")
+        else:
+            self.socket.send(line + b"\n")
+
+    def send(self, **message):
+        self.send_line(json.dumps(message).encode("utf-8"))
+
+    def close(self):
+        self.socket.close()
+
+
+def mission_index(unit_ids, triggers: int) -> MissionIndex:
+    index = MissionIndex()
+    index.units = {unit_id: ("Russia", UNIT_TYPE, "Group {}".format(unit_id)) for unit_id in unit_ids}
+    index.totals = {"Russia": {UNIT_TYPE: len(unit_ids)}}
+    index.triggers = triggers
+    return index
+
+
+def wait_released(port: int):
+    # ports are free again once the listener stops
+    deadline = time.monotonic() + RESULT_TIMEOUT
+    while True:
+        try:
+            for kind in [socket.SOCK_DGRAM, socket.SOCK_STREAM]:
+                with socket.socket(socket.AF_INET, kind) as s:
+                    # same as the listener, so the connections closed by it don't hold the port
+                    s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+                    s.bind((TELEMETRY_HOST, port))
+            return
+        except OSError:
+            assert time.monotonic() < deadline, "listener didn't stop after the mission end"
+            time.sleep(0.1)
+
+
+def execute(tcp: bool):
+    print("Telemetry over {}".format(tcp and "TCP" or "UDP"))
+    listener = TelemetryListener(port=TEST_PORT)
+    listener.start()
+
+    emitter = StandInEmitter(tcp)
+    try:
+        emitter.send(type="mission start", is_quick=False)
+        emitter.send(type="dead", initiatorMissionID="3")
+        # mission restarted, kills of the previous run are dropped
+        emitter.send(type="mission start", is_quick=True)
+        emitter.send(type="hit", initiatorMissionID="11")
+        emitter.send(type="dead", initiatorMissionID="12")
+        emitter.send(type="crash", initiatorMissionID="14")
+        emitter.send(type="dead", initiatorMissionID="12")
+        emitter.send(type="dead")
+        emitter.send_line(b"not a json")
+        emitter.send(type="mission end")
+
+        debriefing = listener.results.get(timeout=RESULT_TIMEOUT)
+    finally:
+        emitter.close()
+        listener.stop()
+
+    assert debriefing.dead_units_count == 2, "unexpected dead units count {}".format(debriefing.dead_units_count)
+    assert debriefing.is_quick, "quick mission isn't reported"
+
+    # quick mission has the same triggers count the debriefing log would report, it's resolved by the reported one
+    debriefing.calculate_units(regular_index=mission_index([3, 12, 14], triggers=0),
+                               quick_index=mission_index([11, 12, 13, 14], triggers=0))
+    assert debriefing.destroyed_units == {"Russia": {UNIT_TYPE: 2}}, "unexpected destroyed units {}".format(debriefing.destroyed_units)
+    assert debriefing.alive_units == {"Russia": {UNIT_TYPE: 2}}, "unexpected alive units {}".format(debriefing.alive_units)
+
+    wait_released(TEST_PORT)
+
+
+def execute_all():
+    execute(tcp=False)
+    execute(tcp=True)
+
+
+if __name__ == "__main__":
+    execute_all()
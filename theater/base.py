@@ -8,7 +8,6 @@ from dcs.vehicles import *
 from dcs.task import *
 
 from game import db
-from gen import aaa
 
 STRENGTH_AA_ASSEMBLE_MIN = 0.2
 PLANES_SCRAMBLE_MIN_BASE = 2
@@ -18,6 +17,15 @@ PLANES_SCRAMBLE_FACTOR = 0.3
 BASE_MAX_STRENGTH = 1
 BASE_MIN_STRENGTH = 0
 
+_unit_member_tasks = {}  # type: typing.Dict[UnitType, typing.List[Task]]
+
+
+def _member_tasks(unit_type) -> typing.List[Task]:
+    # all of the tasks unit is listed for (unlike db.unit_task, which returns the first one)
+    if unit_type not in _unit_member_tasks:
+        _unit_member_tasks[unit_type] = [task for task, units in db.UNIT_BY_TASK.items() if unit_type in units]
+    return _unit_member_tasks[unit_type]
+
 
 class Base:
     aircraft = {}  # type: typing.Dict[PlaneType, int]
@@ -26,12 +34,51 @@ class Base:
     strength = 1  # type: float
     commision_points = {}
 
+    # unit totals by the task (as in db.UNIT_BY_TASK) and aircraft totals by the db.unit_task
+    # kept up to date by the methods changing the units, rebuilt on demand
+    _task_totals = None  # type: typing.Dict[Task, int]
+    _aircraft_task_totals = None  # type: typing.Dict[Task, int]
+
     def __init__(self):
         self.aircraft = {}
         self.armor = {}
         self.aa = {}
         self.commision_points = {}
         self.strength = 1
+        self._task_totals = {}
+        self._aircraft_task_totals = {}
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop("_task_totals", None)
+        state.pop("_aircraft_task_totals", None)
+        return state
+
+    def _update_totals(self, unit_type, count: int, is_aircraft: bool):
+        for task in _member_tasks(unit_type):
+            self._task_totals[task] = self._task_totals.get(task, 0) + count
+
+        if is_aircraft:
+            task = db.unit_task(unit_type)
+            self._aircraft_task_totals[task] = self._aircraft_task_totals.get(task, 0) + count
+
+    def _ensure_totals(self):
+        if self._task_totals is not None:
+            return
+
+        self._task_totals = {}
+        self._aircraft_task_totals = {}
+        for units in [self.aircraft, self.armor, self.aa]:
+            for unit_type, count in units.items():
+                self._update_totals(unit_type, count, units is self.aircraft)
+
+    def _set_count(self, units: typing.Dict, unit_type, count: int):
+        self._ensure_totals()
+        self._update_totals(unit_type, count - units.get(unit_type, 0), units is self.aircraft)
+        if count > 0:
+            units[unit_type] = count
+        else:
+            del units[unit_type]
 
     @property
     def total_planes(self) -> int:
@@ -46,10 +93,11 @@ class Base:
         return sum(self.aa.values())
 
     def total_units(self, task: Task) -> int:
-        return sum([c for t, c in itertools.chain(self.aircraft.items(), self.armor.items(), self.aa.items()) if t in db.UNIT_BY_TASK[task]])
+        self._ensure_totals()
+        return self._task_totals.get(task, 0)
 
     def total_units_of_type(self, unit_type) -> int:
-        return sum([c for t, c in itertools.chain(self.aircraft.items(), self.armor.items(), self.aa.items()) if t == unit_type])
+        return self.aircraft.get(unit_type, 0) + self.armor.get(unit_type, 0) + self.aa.get(unit_type, 0)
 
     @property
     def all_units(self):
@@ -96,9 +144,16 @@ class Base:
 
         return 0
 
+    def set_units(self, aircraft: typing.Dict[PlaneType, int], armor: typing.Dict[Armor, int], aa: typing.Dict[AirDefence, int]):
+        self.aircraft = aircraft
+        self.armor = armor
+        self.aa = aa
+        self._task_totals = None
+
     def filter_units(self, applicable_units: typing.Collection):
         self.aircraft = {k: v for k, v in self.aircraft.items() if k in applicable_units}
         self.armor = {k: v for k, v in self.armor.items() if k in applicable_units}
+        self._task_totals = None
 
     def commision_units(self, units: typing.Dict[typing.Any, int]):
         for value in units.values():
@@ -117,7 +172,7 @@ class Base:
                 target_dict = self.aa
 
             assert target_dict is not None
-            target_dict[unit_type] = target_dict.get(unit_type, 0) + unit_count
+            self._set_count(target_dict, unit_type, target_dict.get(unit_type, 0) + unit_count)
 
     def commit_losses(self, units_lost: typing.Dict[typing.Any, int]):
         # advanced SAM sites have multiple units - this code was not at all set up to handle that
@@ -156,9 +211,10 @@ class Base:
                 print("Base didn't find event type {}".format(unit_type))
                 continue
 
-            target_array[unit_type] = max(target_array[unit_type] - count, 0)
-            if target_array[unit_type] <= 0:
-                del target_array[unit_type]
+            self._set_count(target_array, unit_type, max(target_array[unit_type] - count, 0))
+
+        # generators import theater, so aaa is imported here
+        from gen import aaa
 
         # now that we have a complete picture of the SAM sites destroyed, determine if any were destroyed
         for sam_site, count in sams_destroyed.items():
@@ -169,12 +225,10 @@ class Base:
                 modified_sam_site = db.SAM_CONVERT[sam_site]['except']
 
             try:
-                self.aa[modified_sam_site] = max(
+                self._set_count(self.aa, modified_sam_site, max(
                     self.aa[modified_sam_site] - dead_count,
                     0
-                )
-                if self.aa[modified_sam_site] <= 0:
-                    del self.aa[modified_sam_site]
+                ))
             except KeyError:
                 # if you destroy all launchers and the radar, it's enough to kill 2 sites. move along.
                 pass
@@ -188,7 +242,8 @@ class Base:
 
     def scramble_count(self, multiplier: float, task: Task = None) -> int:
         if task:
-            count = sum([v for k, v in self.aircraft.items() if db.unit_task(k) == task])
+            self._ensure_totals()
+            count = self._aircraft_task_totals.get(task, 0)
         else:
             count = self.total_planes
 
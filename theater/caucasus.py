@@ -13,7 +13,8 @@ class CaucasusTheater(ConflictTheater):
     overview_image = "caumap.gif"
     reference_points = {(-317948.32727306, 635639.37385346): (278.5*4, 319*4),
                         (-355692.3067714, 617269.96285781): (263*4, 352*4), }
-    landmap = load_landmap("resources\\caulandmap.p")
+    landmap_file = "resources\\caulandmap.lmap"
+    landmap = load_landmap(landmap_file)
     daytime_map = {
         "dawn": (6, 9),
         "day": (9, 18),
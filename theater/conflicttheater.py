@@ -4,9 +4,10 @@ import itertools
 import dcs
 from dcs.mapping import Point
 
-from .landmap import Landmap, poly_contains
+from .landmap import Landmap, PackedLandmap, pack_landmap, landmap_contains_many, segment_crossings
+from .landmapgrid import LandmapGrid, load_landmap_grid, CELL_SEA, CELL_LAND, CELL_MIXED
 from .controlpoint import ControlPoint
-from .theatergroundobject import TheaterGroundObject
+from .theatergroundobject import TheaterGroundObject, GroundObjectStore
 
 SIZE_TINY = 150
 SIZE_SMALL = 600
@@ -46,6 +47,99 @@ COAST_DR_E = [315, 0, 45, 90, 135]
 COAST_DR_W = [135, 180, 225, 315]
 
 
+FrontlineVector = typing.Tuple[Point, int, int]
+
+
+class FrontlineCache:
+    """
+    Frontline vectors by the CP ids pair. Entry stays valid as long as strengths and ownership of both of the CPs
+    are the same, so changes made by Base.affect_strength or captures make it recomputed on the next lookup.
+    """
+    hits = 0
+    misses = 0
+
+    def __init__(self):
+        self.entries = {}  # type: typing.Dict[typing.Tuple[int, int], typing.Tuple[typing.Tuple, FrontlineVector]]
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _state(from_cp: ControlPoint, to_cp: ControlPoint) -> typing.Tuple:
+        return from_cp.base.strength, to_cp.base.strength, from_cp.captured, to_cp.captured
+
+    def get(self, from_cp: ControlPoint, to_cp: ControlPoint, compute: typing.Callable[[], FrontlineVector]) -> FrontlineVector:
+        key = from_cp.id, to_cp.id
+        state = self._state(from_cp, to_cp)
+        entry = self.entries.get(key)
+        if entry and entry[0] == state:
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        vector = compute()
+        self.entries[key] = state, vector
+        return vector
+
+    def clear(self):
+        self.entries = {}
+
+
+class OwnershipIndex:
+    """
+    Control points partitioned by the owner, along with the frontier ones (connected to CPs of the other side).
+    Lists are kept in the controlpoints order and updated by ControlPoint.captured setter on each of the captures,
+    so ownership queries don't have to scan the theater.
+    """
+
+    def __init__(self, controlpoints: typing.List[ControlPoint]):
+        self.order = {cp: i for i, cp in enumerate(controlpoints)}  # type: typing.Dict[ControlPoint, int]
+        # CPs having the key in the connected_points, connections aren't necessarily declared both ways
+        self.connected_from = {cp: [] for cp in controlpoints}  # type: typing.Dict[ControlPoint, typing.List[ControlPoint]]
+        self.points = {True: [], False: []}  # type: typing.Dict[bool, typing.List[ControlPoint]]
+        self.frontier = {True: [], False: []}  # type: typing.Dict[bool, typing.List[ControlPoint]]
+        self.opposing = {}  # type: typing.Dict[ControlPoint, typing.List[ControlPoint]]
+
+        for cp in controlpoints:
+            self.points[cp.captured].append(cp)
+            for connected_point in cp.connected_points:
+                if connected_point in self.connected_from:
+                    self.connected_from[connected_point].append(cp)
+
+        for cp in controlpoints:
+            self._update_frontier(cp)
+
+    def _insert(self, points: typing.List[ControlPoint], cp: ControlPoint):
+        index = self.order[cp]
+        low, high = 0, len(points)
+        while low < high:
+            middle = (low + high) // 2
+            if self.order[points[middle]] < index:
+                low = middle + 1
+            else:
+                high = middle
+        points.insert(low, cp)
+
+    def _update_frontier(self, cp: ControlPoint):
+        opposing = [x for x in cp.connected_points if x.captured != cp.captured]
+        for points in self.frontier.values():
+            if cp in self.opposing and cp in points:
+                points.remove(cp)
+
+        if opposing:
+            self.opposing[cp] = opposing
+            self._insert(self.frontier[cp.captured], cp)
+        else:
+            self.opposing.pop(cp, None)
+
+    def update(self, cp: ControlPoint):
+        self.points[not cp.captured].remove(cp)
+        self._insert(self.points[cp.captured], cp)
+
+        self._update_frontier(cp)
+        for other in self.connected_from[cp]:
+            self._update_frontier(other)
+
+
 class ConflictTheater:
     terrain = None  # type: dcs.terrain.Terrain
     controlpoints = None  # type: typing.Collection[ControlPoint]
@@ -53,13 +147,22 @@ class ConflictTheater:
     reference_points = None  # type: typing.Dict
     overview_image = None  # type: str
     landmap = None  # type: landmap.Landmap
+    landmap_file = None  # type: str
     """
     land_poly = None  # type: Polygon
     """
     daytime_map = None  # type: typing.Dict[str, typing.Tuple[int, int]]
 
+    _packed_landmap = None  # type: PackedLandmap
+    _landmap_grid = None  # type: LandmapGrid
+    _frontline_cache = None  # type: FrontlineCache
+    _ownership = None  # type: OwnershipIndex
+    _ground_object_index = None  # type: typing.Dict[str, TheaterGroundObject]
+    _ground_object_store = None  # type: GroundObjectStore
+
     def __init__(self):
         self.controlpoints = []
+        self._packed_landmap = self.landmap and pack_landmap(self.landmap) or None
         """
         self.land_poly = geometry.Polygon(self.landmap[0][0])
         for x in self.landmap[1]:
@@ -70,43 +173,159 @@ class ConflictTheater:
         for connected_point in connected_to:
             point.connect(to=connected_point)
 
+        point.theater = self
         self.controlpoints.append(point)
+        self._ownership = None
 
-    def is_in_sea(self, point: Point) -> bool:
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # landmap derived data is rebuilt on demand, no need to store it in the save
+        state.pop("_packed_landmap", None)
+        state.pop("_landmap_grid", None)
+        state.pop("_frontline_cache", None)
+        state.pop("_ownership", None)
+        state.pop("_ground_object_index", None)
+        state.pop("_ground_object_store", None)
+        return state
+
+    @property
+    def packed_landmap(self) -> PackedLandmap:
+        if self._packed_landmap is None:
+            self._packed_landmap = pack_landmap(self.landmap)
+        return self._packed_landmap
+
+    @property
+    def landmap_grid(self) -> LandmapGrid:
+        if self._landmap_grid is None:
+            self._landmap_grid = load_landmap_grid(self.landmap_file, self.landmap)
+        return self._landmap_grid
+
+    @property
+    def ownership(self) -> OwnershipIndex:
+        if self._ownership is None:
+            for cp in self.controlpoints:
+                # saves made before CPs were referencing the theater
+                cp.theater = self
+            self._ownership = OwnershipIndex(self.controlpoints)
+        return self._ownership
+
+    def ownership_changed(self, cp: ControlPoint):
+        if self._ownership is not None:
+            self._ownership.update(cp)
+
+    @property
+    def ground_object_index(self) -> typing.Dict[str, TheaterGroundObject]:
+        """
+        Ground objects of all of the CPs by the string identifier (as the statics are named in the mission).
+        Rebuilt on demand after CP ground objects are replaced.
+        """
+        if self._ground_object_index is None:
+            self._ground_object_index = {x.string_identifier: x for x in self.ground_object_store.objects}
+        return self._ground_object_index
+
+    @property
+    def ground_object_store(self) -> GroundObjectStore:
+        """
+        Ground objects of all of the CPs in columns, CP ground objects become views of its rows once it's built.
+        Rebuilt on demand after CP ground objects are replaced.
+        """
+        if self._ground_object_store is None:
+            self._ground_object_store = GroundObjectStore()
+            for cp in self.controlpoints:
+                for ground_object in cp.ground_objects:
+                    self._ground_object_store.add(ground_object)
+        return self._ground_object_store
+
+    def ground_objects_changed(self, cp: ControlPoint):
+        self._ground_object_index = None
+        self._ground_object_store = None
+
+    def find_ground_object(self, identifier: str) -> typing.Optional[TheaterGroundObject]:
+        return self.ground_object_index.get(identifier)
+
+    @property
+    def frontline_cache(self) -> FrontlineCache:
+        if self._frontline_cache is None:
+            self._frontline_cache = FrontlineCache()
+        return self._frontline_cache
+
+    def _is_in_sea_exact(self, xs: typing.List[float], ys: typing.List[float]) -> typing.List[bool]:
+        included = landmap_contains_many(xs, ys, self.packed_landmap[0])
+        return [not x for x in included]
+
+    def _is_on_land_exact(self, xs: typing.List[float], ys: typing.List[float]) -> typing.List[bool]:
+        included = landmap_contains_many(xs, ys, self.packed_landmap[0])
+        excluded = landmap_contains_many(xs, ys, self.packed_landmap[1], mask=included)
+        return [a and not b for a, b in zip(included, excluded)]
+
+    def _classify_many(self, points: typing.Collection[Point], cell_value: typing.Callable[[int], bool], exact: typing.Callable) -> typing.List[bool]:
+        xs, ys = [p.x for p in points], [p.y for p in points]
+        cells = self.landmap_grid.cells_at(xs, ys)
+        result = [cell != CELL_MIXED and cell_value(cell) for cell in cells]
+
+        # only points on the coastline cells require exact polygon tests
+        mixed = [i for i, cell in enumerate(cells) if cell == CELL_MIXED]
+        if mixed:
+            for i, value in zip(mixed, exact([xs[i] for i in mixed], [ys[i] for i in mixed])):
+                result[i] = value
+        return result
+
+    def is_in_sea_many(self, points: typing.Collection[Point]) -> typing.List[bool]:
         if not self.landmap:
-            return False
+            return [False] * len(points)
 
-        for inclusion_zone in self.landmap[0]:
-            if poly_contains(point.x, point.y, inclusion_zone):
-                return False
+        return self._classify_many(points, lambda cell: cell == CELL_SEA, self._is_in_sea_exact)
 
-        return True
+    def is_on_land_many(self, points: typing.Collection[Point]) -> typing.List[bool]:
+        if not self.landmap:
+            return [True] * len(points)
+
+        return self._classify_many(points, lambda cell: cell == CELL_LAND, self._is_on_land_exact)
+
+    def is_in_sea(self, point: Point) -> bool:
+        return self.is_in_sea_many([point])[0]
 
     def is_on_land(self, point: Point) -> bool:
-        if not self.landmap:
-            return True
+        return self.is_on_land_many([point])[0]
+
+    def land_intervals(self, start: Point, heading: int, distance: float) -> typing.List[typing.Tuple[float, float]]:
+        """
+        Returns sorted (enter, exit) distances from the start along the heading at which the segment is on land.
+        Segment is split on exact intersections with zone edges, and each of the pieces is classified by its middle point.
+        """
+        if distance <= 0:
+            return []
 
-        is_point_included = False
-        for inclusion_zone in self.landmap[0]:
-            if poly_contains(point.x, point.y, inclusion_zone):
-                is_point_included = True
+        if not self.landmap:
+            return [(0, distance)]
 
-        if not is_point_included:
-            return False
+        end = start.point_from_heading(heading, distance)
+        crossings = {0.0, 1.0}
+        for zone in self.packed_landmap[0] + self.packed_landmap[1]:
+            crossings.update(segment_crossings(start.x, start.y, end.x, end.y, zone))
+        crossings = sorted(crossings)
 
-        for exclusion_zone in self.landmap[1]:
-            if poly_contains(point.x, point.y, exclusion_zone):
-                return False
+        pieces = list(zip(crossings, crossings[1:]))
+        middles = [Point(start.x + (end.x - start.x) * (a + b) / 2, start.y + (end.y - start.y) * (a + b) / 2) for a, b in pieces]
 
-        return True
+        result = []
+        previous_on_land = False
+        for (a, b), on_land in zip(pieces, self.is_on_land_many(middles)):
+            if on_land and previous_on_land:
+                result[-1] = result[-1][0], b * distance
+            elif on_land:
+                result.append((a * distance, b * distance))
+            previous_on_land = on_land
+        return result
 
     def player_points(self) -> typing.Collection[ControlPoint]:
-        return [point for point in self.controlpoints if point.captured]
+        return list(self.ownership.points[True])
 
     def conflicts(self, from_player=True) -> typing.Collection[typing.Tuple[ControlPoint, ControlPoint]]:
-        for cp in [x for x in self.controlpoints if x.captured == from_player]:
-            for connected_point in [x for x in cp.connected_points if x.captured != from_player]:
+        ownership = self.ownership
+        for cp in list(ownership.frontier[from_player]):
+            for connected_point in ownership.opposing.get(cp, []):
                 yield (cp, connected_point)
 
     def enemy_points(self) -> typing.Collection[ControlPoint]:
-        return [point for point in self.controlpoints if not point.captured]
+        return list(self.ownership.points[False])
@@ -17,9 +17,10 @@ class ControlPoint:
     at = None  # type: db.StartPosition
 
     connected_points = None  # type: typing.List[ControlPoint]
-    ground_objects = None  # type: typing.List[TheaterGroundObject]
+    theater = None  # type: theater.conflicttheater.ConflictTheater
 
-    captured = False
+    _captured = False
+    _ground_objects = None  # type: typing.List[TheaterGroundObject]
     has_frontline = True
     frontline_offset = 0.0
 
@@ -31,11 +32,11 @@ class ControlPoint:
         self.full_name = name
         self.position = position
         self.at = at
-        self.ground_objects = []
+        self._ground_objects = []
 
         self.size = size
         self.importance = importance
-        self.captured = False
+        self._captured = False
         self.has_frontline = has_frontline
         self.radials = radials
         self.connected_points = []
@@ -54,6 +55,38 @@ class ControlPoint:
     def __str__(self):
         return self.name
 
+    def __setstate__(self, state):
+        # saves made before captured became a property
+        if "captured" in state:
+            state["_captured"] = state.pop("captured")
+        # and before ground objects became one
+        if "ground_objects" in state:
+            state["_ground_objects"] = state.pop("ground_objects")
+        self.__dict__.update(state)
+
+    @property
+    def captured(self) -> bool:
+        return self._captured
+
+    @captured.setter
+    def captured(self, value: bool):
+        if value == self._captured:
+            return
+
+        self._captured = value
+        if self.theater:
+            self.theater.ownership_changed(self)
+
+    @property
+    def ground_objects(self) -> typing.List[TheaterGroundObject]:
+        return self._ground_objects
+
+    @ground_objects.setter
+    def ground_objects(self, value: typing.List[TheaterGroundObject]):
+        self._ground_objects = value
+        if self.theater:
+            self.theater.ground_objects_changed(self)
+
     @property
     def is_global(self):
         return not self.connected_points
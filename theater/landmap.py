@@ -1,13 +1,126 @@
+import array
+import collections.abc
+import mmap
 import pickle
+import struct
+import sys
 import typing
 
 Zone = typing.Collection[typing.Tuple[float, float]]
 Landmap = typing.Tuple[typing.Collection[Zone], typing.Collection[Zone]]
 
+"""
+Edge of the zone packed for the ray casting, in form of (min y, max y, max x, x1, y1, dx, dy)
+"""
+PackedEdge = typing.Tuple[float, float, float, float, float, float, float]
+
+"""
+Edge of the zone packed for the segment intersections, in form of (min x, max x, x1, y1, dx, dy)
+"""
+SegmentEdge = typing.Tuple[float, float, float, float, float, float]
+
+"""
+Height of horizontal bands zone edges are bucketed into. Ray cast from the point only tests edges of the band point is in.
+"""
+LANDMAP_INDEX_BAND_SIZE = 2000
+
+PackedLandmap = typing.Tuple[typing.List["PackedZone"], typing.List["PackedZone"]]
+
+
+"""
+Binary landmap format: header, zone offsets table (in vertices, inclusion zones first) and flat float64 vertex array
+of interleaved x and y coordinates. Vertex array is memory-mapped, so it's loaded lazily and shared between processes.
+"""
+LANDMAP_FILE_MAGIC = b"LMAP"
+LANDMAP_FILE_VERSION = 1
+
+_landmap_header = struct.Struct("<4sHxxII")
+_VERTEX_ALIGNMENT = 8
+
+
+class ZoneView(collections.abc.Sequence):
+    """
+    Read-only zone backed by the memory-mapped vertex array.
+    """
+
+    def __init__(self, vertices: memoryview, start: int, end: int):
+        self._vertices = vertices
+        self._start = start
+        self._end = end
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+
+        offset = (self._start + index) * 2
+        return self._vertices[offset], self._vertices[offset + 1]
+
+    def __reduce__(self):
+        return list, (list(self), )
+
+
+def _vertices_offset(zones_count: int) -> int:
+    offset = _landmap_header.size + 4 * (zones_count + 1)
+    return offset + (-offset % _VERTEX_ALIGNMENT)
+
+
+def save_landmap(filename: str, landmap: Landmap):
+    inclusion_zones, exclusion_zones = list(landmap[0]), list(landmap[1])
+    zones = inclusion_zones + exclusion_zones
+
+    offsets = [0]
+    for zone in zones:
+        offsets.append(offsets[-1] + len(zone))
+
+    with open(filename, "wb") as f:
+        f.write(_landmap_header.pack(LANDMAP_FILE_MAGIC, LANDMAP_FILE_VERSION, len(inclusion_zones), len(exclusion_zones)))
+        f.write(struct.pack("<{}I".format(len(offsets)), *offsets))
+        f.write(b"\x00" * (_vertices_offset(len(zones)) - f.tell()))
+        for zone in zones:
+            flat = [coordinate for vertex in zone for coordinate in vertex]
+            f.write(struct.pack("<{}d".format(len(flat)), *flat))
+
+
+def _map_landmap(f) -> Landmap:
+    buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, inclusion_count, exclusion_count = _landmap_header.unpack_from(buffer, 0)
+    assert magic == LANDMAP_FILE_MAGIC and version == LANDMAP_FILE_VERSION, "Invalid landmap file"
+
+    zones_count = inclusion_count + exclusion_count
+    offsets = struct.unpack_from("<{}I".format(zones_count + 1), buffer, _landmap_header.size)
+
+    vertices_start = _vertices_offset(zones_count)
+    vertices_end = vertices_start + offsets[-1] * 2 * 8
+    if sys.byteorder == "little":
+        vertices = memoryview(buffer)[vertices_start:vertices_end].cast("d")
+    else:
+        # memoryview casts are native-endian only, so fall back to a swapped copy
+        swapped = array.array("d", buffer[vertices_start:vertices_end])
+        swapped.byteswap()
+        vertices = memoryview(swapped)
+
+    zones = [ZoneView(vertices, offsets[i], offsets[i + 1]) for i in range(zones_count)]
+    return zones[:inclusion_count], zones[inclusion_count:]
+
 
 def load_landmap(filename: str) -> Landmap:
+    """
+    Loads landmap in either binary or legacy pickle format.
+    """
     try:
         with open(filename, "rb") as f:
+            if f.read(len(LANDMAP_FILE_MAGIC)) == LANDMAP_FILE_MAGIC:
+                return _map_landmap(f)
+
+            f.seek(0)
             return pickle.load(f)
     except:
         return None
@@ -30,6 +143,124 @@ def poly_contains(x, y, poly):
         p1x, p1y = p2x, p2y
     return inside
 
+
+class PackedZone:
+    """
+    Zone edges packed for the poly_contains_many, with bounding box and edges bucketed by horizontal bands.
+    Horizontal edges are dropped since they can't ever cross the ray. Values are kept in the same form poly_contains uses,
+    so results of both functions are exactly the same.
+    """
+    edges = None  # type: typing.List[PackedEdge]
+    bands = None  # type: typing.List[typing.List[PackedEdge]]
+    segment_bands = None  # type: typing.List[typing.List[SegmentEdge]]
+
+    def __init__(self, poly: Zone, band_size: float = LANDMAP_INDEX_BAND_SIZE):
+        self.edges = []
+        segment_edges = []
+        n = len(poly)
+        p1x, p1y = poly[0]
+        for i in range(n+1):
+            p2x, p2y = poly[i % n]
+            if p1y != p2y:
+                self.edges.append((min(p1y, p2y), max(p1y, p2y), max(p1x, p2x), p1x, p1y, p2x-p1x, p2y-p1y))
+            if i > 0:
+                segment_edges.append((min(p1x, p2x), max(p1x, p2x), p1x, p1y, p2x-p1x, p2y-p1y))
+            p1x, p1y = p2x, p2y
+
+        self.xmin = min(x for x, _ in poly)
+        self.xmax = max(x for x, _ in poly)
+        self.ymin = min(y for _, y in poly)
+        self.ymax = max(y for _, y in poly)
+
+        self.band_size = band_size
+        self.bands = [[] for _ in range(int((self.ymax - self.ymin) // band_size) + 1)]
+        for edge in self.edges:
+            for band in range(self.band_index(edge[0]), self.band_index(edge[1]) + 1):
+                self.bands[band].append(edge)
+
+        self.segment_bands = [[] for _ in self.bands]
+        for edge in segment_edges:
+            y1, y2 = edge[3], edge[3] + edge[5]
+            for band in range(self.band_index(min(y1, y2)), self.band_index(max(y1, y2)) + 1):
+                self.segment_bands[band].append(edge)
+
+    def band_index(self, y: float) -> int:
+        return min(max(int((y - self.ymin) // self.band_size), 0), len(self.bands) - 1)
+
+    def candidate_edges(self, x: float, y: float) -> typing.List[PackedEdge]:
+        # points above, below or to the right of the zone can't have any of the edges crossing the ray
+        if y <= self.ymin or y > self.ymax or x > self.xmax:
+            return []
+
+        return self.bands[self.band_index(y)]
+
+
+def pack_zone(poly: Zone) -> PackedZone:
+    return PackedZone(poly)
+
+
+def pack_landmap(landmap: Landmap) -> PackedLandmap:
+    return [pack_zone(x) for x in landmap[0]], [pack_zone(x) for x in landmap[1]]
+
+
+def poly_contains_many(xs: typing.Sequence[float], ys: typing.Sequence[float], zone: PackedZone) -> typing.List[bool]:
+    result = []
+    for x, y in zip(xs, ys):
+        inside = False
+        for ymin, ymax, xmax, x1, y1, dx, dy in zone.candidate_edges(x, y):
+            if ymin < y <= ymax and x <= xmax:
+                if dx == 0 or x <= (y-y1)*dx/dy+x1:
+                    inside = not inside
+        result.append(inside)
+    return result
+
+
+def segment_crossings(x1: float, y1: float, x2: float, y2: float, zone: PackedZone) -> typing.Set[float]:
+    """
+    Returns parameters (0 at the segment start, 1 at the end) at which segment crosses edges of the zone.
+    Edges parallel to the segment are skipped, those can't change whether the segment is inside of the zone or not.
+    """
+    segment_xmin, segment_xmax = min(x1, x2), max(x1, x2)
+    segment_ymin, segment_ymax = min(y1, y2), max(y1, y2)
+    if segment_xmax < zone.xmin or segment_xmin > zone.xmax or segment_ymax < zone.ymin or segment_ymin > zone.ymax:
+        return set()
+
+    dx, dy = x2 - x1, y2 - y1
+    result = set()
+    for band in zone.segment_bands[zone.band_index(segment_ymin):zone.band_index(segment_ymax) + 1]:
+        for edge_xmin, edge_xmax, ex1, ey1, edx, edy in band:
+            if edge_xmax < segment_xmin or edge_xmin > segment_xmax:
+                continue
+
+            denominator = dx * edy - dy * edx
+            if denominator != 0:
+                ox, oy = ex1 - x1, ey1 - y1
+                t = (ox * edy - oy * edx) / denominator
+                u = (ox * dy - oy * dx) / denominator
+                if 0 <= t <= 1 and 0 <= u <= 1:
+                    result.add(t)
+    return result
+
+
+def landmap_contains_many(xs: typing.Sequence[float], ys: typing.Sequence[float], zones: typing.Collection[PackedZone], mask: typing.List[bool] = None) -> typing.List[bool]:
+    """
+    Tests points against each of the zones, returning True for points contained in any.
+    Only points with truthy mask value (if provided) are tested, rest are reported as not contained.
+    """
+    result = [False] * len(xs)
+    pending = [i for i in range(len(xs)) if mask is None or mask[i]]
+    for zone in zones:
+        if not pending:
+            break
+
+        contains = poly_contains_many([xs[i] for i in pending], [ys[i] for i in pending], zone)
+        for i, is_inside in zip(pending, contains):
+            if is_inside:
+                result[i] = True
+        pending = [i for i, is_inside in zip(pending, contains) if not is_inside]
+    return result
+
+
 def poly_centroid(poly) -> typing.Tuple[float, float]:
     x_list = [vertex[0] for vertex in poly]
     y_list = [vertex[1] for vertex in poly]
@@ -0,0 +1,216 @@
+import logging
+import math
+import os
+import struct
+import typing
+import zlib
+
+from .landmap import Landmap, Zone
+
+"""
+Occupancy grid over the landmap, used to answer most of the land/sea queries without testing the polygons.
+Cells crossed by any of the zone edges are marked as mixed, those should be resolved with the exact polygon tests.
+"""
+
+LANDMAP_GRID_RESOLUTION = 250
+LANDMAP_GRID_EXTENSION = ".grid"
+
+CELL_SEA = 0  # outside of every inclusion zone
+CELL_LAND = 1  # inside of inclusion zone and outside of every exclusion zone
+CELL_WATER = 2  # inside of both inclusion and exclusion zones (lakes, rivers), neither land nor sea
+CELL_MIXED = 3  # crossed by the zone edge
+
+_FILE_MAGIC = b"LMGR"
+_FILE_VERSION = 1
+_FILE_HEADER = struct.Struct("<4sHIdddII")
+
+# mixed cells are marked with a bit of tolerance so float errors won't leave crossed cell out
+_EDGE_EPSILON = 1e-6
+
+_grids = {}  # type: typing.Dict[str, LandmapGrid]
+
+
+def landmap_checksum(landmap: Landmap) -> int:
+    checksum = 0
+    for zone in list(landmap[0]) + list(landmap[1]):
+        flat = [coordinate for vertex in zone for coordinate in vertex]
+        checksum = zlib.crc32(struct.pack("<I{}d".format(len(flat)), len(flat), *flat), checksum)
+    return checksum
+
+
+class LandmapGrid:
+    def __init__(self, origin: typing.Tuple[float, float], resolution: float, columns: int, rows: int, cells: bytearray, checksum: int = 0):
+        self.origin_x, self.origin_y = origin
+        self.resolution = resolution
+        self.columns = columns
+        self.rows = rows
+        self.cells = cells
+        self.checksum = checksum
+
+    def cell_at(self, x: float, y: float) -> int:
+        column = int((x - self.origin_x) // self.resolution)
+        row = int((y - self.origin_y) // self.resolution)
+        if column < 0 or row < 0 or column >= self.columns or row >= self.rows:
+            return CELL_SEA
+
+        return self.cells[row * self.columns + column]
+
+    def cells_at(self, xs: typing.Sequence[float], ys: typing.Sequence[float]) -> typing.List[int]:
+        return [self.cell_at(x, y) for x, y in zip(xs, ys)]
+
+    @property
+    def mixed_ratio(self) -> float:
+        return self.cells.count(CELL_MIXED) / max(len(self.cells), 1)
+
+    @classmethod
+    def build(cls, landmap: Landmap, resolution: float = LANDMAP_GRID_RESOLUTION) -> "LandmapGrid":
+        inclusion_zones, exclusion_zones = list(landmap[0]), list(landmap[1])
+        vertices = [vertex for zone in inclusion_zones for vertex in zone]
+        origin_x = math.floor(min(x for x, _ in vertices) / resolution) * resolution
+        origin_y = math.floor(min(y for _, y in vertices) / resolution) * resolution
+        columns = int((max(x for x, _ in vertices) - origin_x) // resolution) + 1
+        rows = int((max(y for _, y in vertices) - origin_y) // resolution) + 1
+
+        grid = cls((origin_x, origin_y), resolution, columns, rows, bytearray(columns * rows), landmap_checksum(landmap))
+        grid._fill_centers(inclusion_zones, exclusion_zones)
+        for zone in inclusion_zones + exclusion_zones:
+            grid._mark_edges(zone)
+        return grid
+
+    def _row_spans(self, zones: typing.List[Zone]) -> typing.Dict[int, typing.List[typing.Tuple[int, float, float, float, float]]]:
+        """
+        Buckets non-horizontal edges by the rows which centers they span, using the same half-open rule as poly_contains.
+        """
+        result = {}
+        for zone_index, zone in enumerate(zones):
+            n = len(zone)
+            p1x, p1y = zone[0]
+            for i in range(n + 1):
+                p2x, p2y = zone[i % n]
+                if p1y != p2y:
+                    first_row = max(math.floor((min(p1y, p2y) - self.origin_y) / self.resolution - 0.5) + 1, 0)
+                    last_row = min(math.floor((max(p1y, p2y) - self.origin_y) / self.resolution - 0.5), self.rows - 1)
+                    for row in range(first_row, last_row + 1):
+                        result.setdefault(row, []).append((zone_index, p1x, p1y, p2x - p1x, p2y - p1y))
+                p1x, p1y = p2x, p2y
+        return result
+
+    def _row_mask(self, row: int, edges: typing.List[typing.Tuple[int, float, float, float, float]]) -> bytearray:
+        """
+        Returns 0/1 mask of row cells which centers are contained in any of the zones.
+        """
+        y = self.origin_y + (row + 0.5) * self.resolution
+        crossings_by_zone = {}
+        for zone_index, x1, y1, dx, dy in edges:
+            crossings_by_zone.setdefault(zone_index, []).append(x1 if dx == 0 else (y - y1) * dx / dy + x1)
+
+        mask = bytearray(self.columns)
+        for crossings in crossings_by_zone.values():
+            crossings.sort()
+            for enter_x, exit_x in zip(crossings[::2], crossings[1::2]):
+                # cell centers within (enter_x, exit_x] are inside the zone
+                first = max(math.floor((enter_x - self.origin_x) / self.resolution - 0.5) + 1, 0)
+                last = min(math.floor((exit_x - self.origin_x) / self.resolution - 0.5), self.columns - 1)
+                if first <= last:
+                    mask[first:last + 1] = b"\x01" * (last - first + 1)
+        return mask
+
+    def _fill_centers(self, inclusion_zones: typing.List[Zone], exclusion_zones: typing.List[Zone]):
+        inclusion_rows = self._row_spans(inclusion_zones)
+        exclusion_rows = self._row_spans(exclusion_zones)
+
+        for row, edges in inclusion_rows.items():
+            included = self._row_mask(row, edges)
+            if row in exclusion_rows:
+                # both masks are 0/1 per byte, so included + (included & excluded) gives land 1 and water 2
+                excluded = self._row_mask(row, exclusion_rows[row])
+                included_int = int.from_bytes(included, "big")
+                excluded_int = int.from_bytes(excluded, "big")
+                included = (included_int + (included_int & excluded_int)).to_bytes(self.columns, "big")
+
+            offset = row * self.columns
+            self.cells[offset:offset + self.columns] = included
+
+    def _mark_edges(self, zone: Zone):
+        n = len(zone)
+        for i in range(n):
+            (p1x, p1y), (p2x, p2y) = zone[i], zone[(i + 1) % n]
+
+            first_row = max(math.floor((min(p1y, p2y) - self.origin_y) / self.resolution - _EDGE_EPSILON), 0)
+            last_row = min(math.floor((max(p1y, p2y) - self.origin_y) / self.resolution + _EDGE_EPSILON), self.rows - 1)
+            for row in range(first_row, last_row + 1):
+                if p1y != p2y:
+                    # clip the edge by the row band
+                    band_low = self.origin_y + row * self.resolution
+                    band_high = band_low + self.resolution
+                    t1 = min(max((band_low - p1y) / (p2y - p1y), 0.0), 1.0)
+                    t2 = min(max((band_high - p1y) / (p2y - p1y), 0.0), 1.0)
+                    x1, x2 = p1x + (p2x - p1x) * t1, p1x + (p2x - p1x) * t2
+                else:
+                    x1, x2 = p1x, p2x
+
+                first_column = max(math.floor((min(x1, x2) - self.origin_x) / self.resolution - _EDGE_EPSILON), 0)
+                last_column = min(math.floor((max(x1, x2) - self.origin_x) / self.resolution + _EDGE_EPSILON), self.columns - 1)
+                if first_column <= last_column:
+                    offset = row * self.columns
+                    self.cells[offset + first_column:offset + last_column + 1] = bytes([CELL_MIXED]) * (last_column - first_column + 1)
+
+    def save(self, filename: str):
+        with open(filename, "wb") as f:
+            f.write(_FILE_HEADER.pack(_FILE_MAGIC, _FILE_VERSION, self.checksum, self.resolution, self.origin_x, self.origin_y, self.columns, self.rows))
+            f.write(zlib.compress(bytes(self.cells)))
+
+    @classmethod
+    def load(cls, filename: str) -> typing.Optional["LandmapGrid"]:
+        with open(filename, "rb") as f:
+            header = f.read(_FILE_HEADER.size)
+            if len(header) != _FILE_HEADER.size:
+                return None
+
+            magic, version, checksum, resolution, origin_x, origin_y, columns, rows = _FILE_HEADER.unpack(header)
+            if magic != _FILE_MAGIC or version != _FILE_VERSION:
+                return None
+
+            cells = bytearray(zlib.decompress(f.read()))
+            if len(cells) != columns * rows:
+                return None
+
+            return cls((origin_x, origin_y), resolution, columns, rows, cells, checksum)
+
+
+def landmap_grid_path(landmap_filename: str) -> str:
+    return os.path.splitext(landmap_filename)[0] + LANDMAP_GRID_EXTENSION
+
+
+def load_landmap_grid(landmap_filename: typing.Optional[str], landmap: Landmap, resolution: float = LANDMAP_GRID_RESOLUTION) -> LandmapGrid:
+    """
+    Returns grid for the landmap, loading it from the cache file next to the landmap one.
+    Grid is rebuilt (and cache is updated) in case it's missing or was built for the different landmap or resolution.
+    """
+    key = "{}@{}".format(landmap_filename, resolution)
+    if landmap_filename and key in _grids:
+        return _grids[key]
+
+    checksum = landmap_checksum(landmap)
+    grid = None
+    if landmap_filename:
+        try:
+            grid = LandmapGrid.load(landmap_grid_path(landmap_filename))
+        except (IOError, zlib.error, struct.error):
+            grid = None
+
+        if grid and (grid.checksum != checksum or grid.resolution != resolution):
+            grid = None
+
+    if not grid:
+        logging.info("landmap grid: building for {}".format(landmap_filename))
+        grid = LandmapGrid.build(landmap, resolution)
+        if landmap_filename:
+            try:
+                grid.save(landmap_grid_path(landmap_filename))
+            except IOError as e:
+                logging.warning("landmap grid: failed to cache {}: {}".format(landmap_filename, e))
+
+    if landmap_filename:
+        _grids[key] = grid
+    return grid
@@ -11,7 +11,8 @@ class NevadaTheater(ConflictTheater):
     overview_image = "nevada.gif"
     reference_points = {(nevada.Mina_Airport_3Q0.position.x, nevada.Mina_Airport_3Q0.position.y): (45*2, -360*2),
                         (nevada.Laughlin_Airport.position.x, nevada.Laughlin_Airport.position.y): (440*2, 80*2), }
-    landmap = load_landmap("resources\\nev_landmap.p")
+    landmap_file = "resources\\nevlandmap.lmap"
+    landmap = load_landmap(landmap_file)
     daytime_map = {
         "dawn": (4, 6),
         "day": (6, 17),
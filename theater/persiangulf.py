@@ -11,7 +11,8 @@ class PersianGulfTheater(ConflictTheater):
     overview_image = "persiangulf.gif"
     reference_points = {(persiangulf.Sir_Abu_Nuayr.position.x, persiangulf.Sir_Abu_Nuayr.position.y): (321*4, 145*4),
                         (persiangulf.Sirri_Island.position.x, persiangulf.Sirri_Island.position.y): (347*4, 82*4), }
-    landmap = load_landmap("resources\\gulflandmap.p")
+    landmap_file = "resources\\gulflandmap.lmap"
+    landmap = load_landmap(landmap_file)
     daytime_map = {
         "dawn": (6, 8),
         "day": (8, 16),
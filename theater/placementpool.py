@@ -0,0 +1,140 @@
+import array
+import logging
+import math
+import os
+import pickle
+import random
+import typing
+
+from dcs.mapping import Point
+
+from .controlpoint import ControlPoint
+from .landmapgrid import landmap_checksum
+
+"""
+Pools of the valid ground object locations around each of the control points, with land/sea clearance already checked.
+Candidates are jittered over the square grid (so there is one candidate per cell at most), pools are cached next
+to the landmap file and rebuilt in case landmap, placement parameters or control point position changes.
+"""
+
+PLACEMENT_POOL_SPACING = 2500
+PLACEMENT_POOL_CLEARANCE = 2500
+PLACEMENT_POOL_EXTENSION = ".pools"
+PLACEMENT_POOL_VERSION = 1
+
+# draws are retried on already used points, pools are large enough so this is only hit on the nearly exhausted ones
+PLACEMENT_POOL_DRAW_ATTEMPTS = 10
+
+_pools = {}  # type: typing.Dict[str, typing.Dict[int, PlacementPool]]
+
+
+class PlacementPool:
+    def __init__(self, position: typing.Tuple[float, float], land: array.array, sea: array.array):
+        self.position = position
+        # flat arrays of x and y coordinates
+        self.land = land
+        self.sea = sea
+
+    def count(self, on_ground: bool) -> int:
+        return len(self.land if on_ground else self.sea) // 2
+
+    def draw(self, on_ground: bool, used: typing.Set[typing.Tuple[float, float]], rng: random.Random = random) -> typing.Optional[Point]:
+        """
+        Returns random point of the pool which is not in the used set, adding it there.
+        """
+        coordinates = self.land if on_ground else self.sea
+        count = len(coordinates) // 2
+        for _ in range(min(PLACEMENT_POOL_DRAW_ATTEMPTS, count)):
+            index = rng.randrange(count) * 2
+            location = coordinates[index], coordinates[index + 1]
+            if location not in used:
+                used.add(location)
+                return Point(*location)
+
+        return None
+
+    @classmethod
+    def build(cls, theater, cp: ControlPoint, min_distance: float, max_distance: float) -> "PlacementPool":
+        # seeded by the CP so the pool is the same on every build
+        rng = random.Random("{}:{}".format(cp.id, cp.name))
+        cells = int(math.ceil(max_distance / PLACEMENT_POOL_SPACING))
+
+        candidates = []
+        for row in range(-cells, cells):
+            for column in range(-cells, cells):
+                dx = (column + rng.random()) * PLACEMENT_POOL_SPACING
+                dy = (row + rng.random()) * PLACEMENT_POOL_SPACING
+                if min_distance <= math.hypot(dx, dy) <= max_distance:
+                    candidates.append(Point(cp.position.x + dx, cp.position.y + dy))
+
+        return cls((cp.position.x, cp.position.y),
+                   cls._filter(candidates, theater.is_on_land_many),
+                   cls._filter(candidates, theater.is_in_sea_many))
+
+    @staticmethod
+    def _filter(candidates: typing.List[Point], classify: typing.Callable[[typing.List[Point]], typing.List[bool]]) -> array.array:
+        points = [point for point, is_valid in zip(candidates, classify(candidates)) if is_valid]
+
+        clearance = [point.point_from_heading(angle, PLACEMENT_POOL_CLEARANCE) for point in points for angle in range(0, 360, 45)]
+        clearance_valid = classify(clearance)
+
+        result = array.array("d")
+        for i, point in enumerate(points):
+            if all(clearance_valid[i * 8:i * 8 + 8]):
+                result.extend((point.x, point.y))
+        return result
+
+
+def placement_pools_path(landmap_filename: str) -> str:
+    return os.path.splitext(landmap_filename)[0] + PLACEMENT_POOL_EXTENSION
+
+
+def _load(filename: str, checksum: int, parameters: typing.Tuple) -> typing.Dict[int, PlacementPool]:
+    try:
+        with open(filename, "rb") as f:
+            version, cached_checksum, cached_parameters, pools = pickle.load(f)
+    except (IOError, EOFError, ValueError, pickle.UnpicklingError):
+        return {}
+
+    if version != PLACEMENT_POOL_VERSION or cached_checksum != checksum or cached_parameters != parameters:
+        return {}
+
+    return {cp_id: PlacementPool(position, land, sea) for cp_id, (position, land, sea) in pools.items()}
+
+
+def _save(filename: str, checksum: int, parameters: typing.Tuple, pools: typing.Dict[int, PlacementPool]):
+    with open(filename, "wb") as f:
+        pickle.dump((PLACEMENT_POOL_VERSION, checksum, parameters, {cp_id: (x.position, x.land, x.sea) for cp_id, x in pools.items()}), f)
+
+
+def load_placement_pools(theater, controlpoints: typing.Collection[ControlPoint], min_distance: float, max_distance: float) -> typing.Dict[int, PlacementPool]:
+    """
+    Returns placement pools by the CP id, loading them from the cache file next to the landmap one.
+    Pools of the control points missing from the cache (or moved since) are built and cache is updated.
+    """
+    parameters = (min_distance, max_distance, PLACEMENT_POOL_SPACING, PLACEMENT_POOL_CLEARANCE)
+    filename = theater.landmap and theater.landmap_file and placement_pools_path(theater.landmap_file)
+    key = "{}@{}".format(filename, parameters)
+
+    checksum = theater.landmap and landmap_checksum(theater.landmap) or 0
+    if filename:
+        if key not in _pools:
+            _pools[key] = _load(filename, checksum, parameters)
+        pools = _pools[key]
+    else:
+        pools = {}
+
+    updated = False
+    for cp in controlpoints:
+        if cp.id not in pools or pools[cp.id].position != (cp.position.x, cp.position.y):
+            logging.info("placement pools: building for {}".format(cp))
+            pools[cp.id] = PlacementPool.build(theater, cp, min_distance, max_distance)
+            updated = True
+
+    if filename and updated:
+        try:
+            _save(filename, checksum, parameters, pools)
+        except IOError as e:
+            logging.warning("placement pools: failed to cache {}: {}".format(filename, e))
+
+    return pools
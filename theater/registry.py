@@ -0,0 +1,52 @@
+import copy
+import importlib
+import typing
+
+from dcs.mapping import Point
+
+from .conflicttheater import ConflictTheater
+
+"""
+Theaters by the name used in the new game menu. Theater modules build pydcs terrain, load the landmap and create
+control points on import, so they're only imported once the theater is actually requested.
+Saved games import the module of their theater on unpickling.
+Control points are the class attributes of the theater classes, so each of the theaters created is a copy of the one
+built once per process: games don't share the CPs, and the theater constructor doesn't connect them again.
+"""
+
+THEATERS = {
+    "caucasus": ("theater.caucasus", "CaucasusTheater"),
+    "persiangulf": ("theater.persiangulf", "PersianGulfTheater"),
+    "nevada": ("theater.nevada", "NevadaTheater"),
+}  # type: typing.Dict[str, typing.Tuple[str, str]]
+
+DEFAULT_THEATER = "caucasus"
+
+_prototypes = {}  # type: typing.Dict[typing.Type[ConflictTheater], ConflictTheater]
+
+
+def theater_class(name: str) -> typing.Type[ConflictTheater]:
+    module_name, class_name = THEATERS.get(name, THEATERS[DEFAULT_THEATER])
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def create_theater(name: str) -> ConflictTheater:
+    klass = theater_class(name)
+    if klass not in _prototypes:
+        _prototypes[klass] = klass()
+
+    prototype = _prototypes[klass]
+    # terrain and airports are the same for all of the games
+    memo = {id(prototype.terrain): prototype.terrain}
+    for cp in prototype.controlpoints:
+        if not isinstance(cp.at, Point):
+            memo[id(cp.at)] = cp.at
+    return copy.deepcopy(prototype, memo)
+
+
+def theater_name(theater: ConflictTheater) -> str:
+    for name, (module_name, class_name) in THEATERS.items():
+        if type(theater).__module__ == module_name and type(theater).__name__ == class_name:
+            return name
+
+    assert False, "theater {} is not registered".format(type(theater).__name__)
@@ -1,16 +1,19 @@
 import math
 import pickle
 import random
-import typing
 import logging
 
 from theater.base import *
 from theater.conflicttheater import *
+from theater.placementpool import load_placement_pools
 
 UNIT_VARIETY = 3
 UNIT_AMOUNT_FACTOR = 16
 UNIT_COUNT_IMPORTANCE_LOG = 1.3
 
+GROUNDOBJECT_MIN_DISTANCE = 15000
+GROUNDOBJECT_MAX_DISTANCE = 80000
+
 COUNT_BY_TASK = {
     PinpointStrike: 12,
     CAP: 8,
@@ -43,53 +46,27 @@ def generate_inital_units(theater: ConflictTheater, enemy: str, sams: bool, mult
                 cp.base.commision_units({unit_type: count_per_type})
 
 
-def generate_groundobjects(theater: ConflictTheater):
+def generate_groundobjects(theater: ConflictTheater, rng: random.Random = random):
     with open("resources/groundobject_templates.p", "rb") as f:
         tpls = pickle.load(f)
 
-    def find_location(on_ground, near, theater, min, max) -> typing.Optional[Point]:
-        point = None
-        for _ in range(1000):
-            p = near.random_point_within(max, min)
-            if on_ground and theater.is_on_land(p):
-                point = p
-            elif not on_ground and theater.is_in_sea(p):
-                point = p
-
-            if point:
-                for angle in range(0, 360, 45):
-                    p = point.point_from_heading(angle, 2500)
-                    if on_ground and not theater.is_on_land(p):
-                        point = None
-                        break
-                    elif not on_ground and not theater.is_in_sea(p):
-                        point = None
-                        break
-
-            if point:
-                return point
-
-        return None
+    controlpoints = [cp for cp in theater.controlpoints if not cp.is_global and cp.has_frontline]
+    pools = load_placement_pools(theater, controlpoints, GROUNDOBJECT_MIN_DISTANCE, GROUNDOBJECT_MAX_DISTANCE)
+    used_locations = set()
 
     group_id = 0
-    for cp in theater.controlpoints:
-        if cp.is_global:
-            continue
-
-        if not cp.has_frontline:
-            continue
-
-        amount = random.randrange(5, 7)
+    for cp in controlpoints:
+        amount = rng.randrange(5, 7)
         for i in range(0, amount):
             available_categories = list(tpls)
             if i >= amount - 1:
                 tpl_category = "aa"
             else:
-                tpl_category = random.choice(available_categories)
+                tpl_category = rng.choice(available_categories)
 
-            tpl = random.choice(list(tpls[tpl_category].values()))
+            tpl = rng.choice(list(tpls[tpl_category].values()))
 
-            point = find_location(tpl_category != "oil", cp.position, theater, 15000, 80000)
+            point = pools[cp.id].draw(tpl_category != "oil", used_locations, rng)
 
             if point is None:
                 print("Couldn't find point for {}".format(cp))
@@ -102,13 +79,14 @@ def generate_groundobjects(theater: ConflictTheater):
             for object in tpl:
                 object_id += 1
 
-                g = TheaterGroundObject()
-                g.group_id = group_id
-                g.object_id = object_id
-                g.cp_id = cp.id
-
-                g.dcs_identifier = object["type"]
-                g.heading = object["heading"]
-                g.position = Point(point.x + object["offset"].x, point.y + object["offset"].y)
+                g = TheaterGroundObject(cp_id=cp.id,
+                                        group_id=group_id,
+                                        object_id=object_id,
+                                        dcs_identifier=object["type"],
+                                        heading=object["heading"],
+                                        position=Point(point.x + object["offset"].x, point.y + object["offset"].y))
 
                 cp.ground_objects.append(g)
+
+        # appended in place, so the theater isn't notified by the setter
+        theater.ground_objects_changed(cp)
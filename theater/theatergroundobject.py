@@ -1,3 +1,5 @@
+import array
+import math
 import typing
 
 from dcs.mapping import Point
@@ -43,32 +45,286 @@ CATEGORY_MAP = {
     "oil": ["Oil platform"],
 }
 
+CATEGORY_BY_IDENTIFIER = {identifier: category for category, identifiers in CATEGORY_MAP.items() for identifier in identifiers}
+
+
+# category code of the identifiers missing from the CATEGORY_MAP
+NO_CATEGORY = 255
+CATEGORIES = list(CATEGORY_MAP)
+CATEGORY_CODES = {category: code for code, category in enumerate(CATEGORIES)}
+
+
+def _category_code(dcs_identifier: str) -> int:
+    return CATEGORY_CODES.get(CATEGORY_BY_IDENTIFIER.get(dcs_identifier), NO_CATEGORY)
+
+
+class GroundObjectStore:
+    """
+    Ground objects of the theater in columns, TheaterGroundObject instances are views of the rows.
+    Objects are added in the CP and group order, so each group takes a continuous range of rows: group_starts holds
+    the first row of each of the groups (group_ids their ids), range ends with the start of the next one.
+    Positions are kept as they're set (so the accessor doesn't build the point) along with the x and y columns queried.
+    """
+
+    def __init__(self):
+        self.x = array.array("d")
+        self.y = array.array("d")
+        self.heading = array.array("d")
+        self.category = array.array("B")
+        self.cp_id = array.array("l")
+        self.group_id = array.array("l")
+        self.object_id = array.array("l")
+        self.dead = array.array("B")
+        self.dcs_identifier = []  # type: typing.List[str]
+        self.position = []  # type: typing.List[typing.Optional[Point]]
+        self.objects = []  # type: typing.List[TheaterGroundObject]
+
+        self.group_ids = array.array("l")
+        self.group_starts = array.array("l")
+
+    def __len__(self):
+        return len(self.objects)
+
+    def append(self, ground_object: "TheaterGroundObject", cp_id: int, group_id: int, object_id: int, dcs_identifier: str,
+               heading: float, position: typing.Optional[Point], is_dead: bool):
+        """
+        Appends the row, making the ground object its view.
+        """
+        row = len(self.objects)
+        if not row or self.group_id[row - 1] != group_id or self.cp_id[row - 1] != cp_id:
+            self.group_ids.append(group_id)
+            self.group_starts.append(row)
+
+        self.x.append(position.x if position else math.nan)
+        self.y.append(position.y if position else math.nan)
+        self.heading.append(heading)
+        self.category.append(_category_code(dcs_identifier))
+        self.cp_id.append(cp_id)
+        self.group_id.append(group_id)
+        self.object_id.append(object_id)
+        self.dead.append(is_dead)
+        self.dcs_identifier.append(dcs_identifier)
+        self.position.append(position)
+        self.objects.append(ground_object)
+
+        ground_object._store = self
+        ground_object._row = row
+
+    def add(self, ground_object: "TheaterGroundObject"):
+        """
+        Copies the ground object (detached, or view of the other store) to the new row.
+        """
+        self.append(ground_object,
+                    ground_object.cp_id,
+                    ground_object.group_id,
+                    ground_object.object_id,
+                    ground_object.dcs_identifier,
+                    ground_object.heading,
+                    ground_object.position,
+                    ground_object.is_dead)
+
+    def group_ranges(self, cp_id: int = None) -> typing.List[typing.Tuple[int, int]]:
+        """
+        Returns start and end rows of each of the groups, of all of them or of the CP.
+        """
+        ends = self.group_starts[1:] + array.array("l", [len(self.objects)])
+        return [(start, end) for start, end in zip(self.group_starts, ends) if cp_id is None or self.cp_id[start] == cp_id]
+
+    def query(self, category: str = None, position: Point = None, radius: float = None, cp_id: int = None,
+              alive: bool = None) -> typing.List["TheaterGroundObject"]:
+        """
+        Returns ground objects matching all of the given filters, i.e. alive ones of the category within the radius
+        of the point. Only the rows of the CP are scanned if it's given (those are continuous), and the bounding
+        square of the radius is checked before the distance.
+        """
+        rows = range(len(self.objects))
+        if cp_id is not None:
+            ranges = self.group_ranges(cp_id)
+            rows = range(ranges[0][0], ranges[-1][1]) if ranges else range(0)
+
+        category_code = CATEGORY_CODES[category] if category is not None else None
+        if position is not None:
+            min_x, max_x = position.x - radius, position.x + radius
+            min_y, max_y = position.y - radius, position.y + radius
+            radius_squared = radius * radius
+
+        xs, ys, categories, cp_ids, dead = self.x, self.y, self.category, self.cp_id, self.dead
+        result = []
+        for row in rows:
+            if category_code is not None and categories[row] != category_code:
+                continue
+            if cp_id is not None and cp_ids[row] != cp_id:
+                continue
+            if alive is not None and alive == bool(dead[row]):
+                continue
+            if position is not None:
+                x, y = xs[row], ys[row]
+                if not (min_x <= x <= max_x and min_y <= y <= max_y):
+                    continue
+                if (x - position.x) ** 2 + (y - position.y) ** 2 > radius_squared:
+                    continue
+
+            result.append(self.objects[row])
+        return result
+
+
+class _DetachedRow:
+    """
+    Fields of the ground object created on its own, until it's added to the store.
+    """
+    __slots__ = ("x", "y", "heading", "category", "cp_id", "group_id", "object_id", "dead", "dcs_identifier", "position")
+
+    def __init__(self, cp_id: int, group_id: int, object_id: int, dcs_identifier: str, heading: float,
+                 position: typing.Optional[Point], is_dead: bool):
+        self.x = position.x if position else math.nan
+        self.y = position.y if position else math.nan
+        self.heading = heading
+        self.category = _category_code(dcs_identifier)
+        self.cp_id = cp_id
+        self.group_id = group_id
+        self.object_id = object_id
+        self.dead = is_dead
+        self.dcs_identifier = dcs_identifier
+        self.position = position
+
+
+class _DetachedColumn:
+    def __init__(self, name: str):
+        self.name = name
+
+    def __getitem__(self, row: _DetachedRow):
+        return getattr(row, self.name)
+
+    def __setitem__(self, row: _DetachedRow, value):
+        setattr(row, self.name, value)
+
+
+class _DetachedStore:
+    """
+    Stands in for the store of the objects created on their own: columns read and write the fields of the
+    _DetachedRow of the object, so those don't allocate the store each.
+    """
+
+    def __init__(self):
+        for name in _DetachedRow.__slots__:
+            setattr(self, name, _DetachedColumn(name))
+
+
+_DETACHED_STORE = _DetachedStore()
+
 
 class TheaterGroundObject:
-    cp_id = 0
-    group_id = 0
-    object_id = 0
+    """
+    Single static of the CP ground objects group, view of the GroundObjectStore row. Objects created on their own
+    keep the fields in the detached row, they become views of the theater store once it's built from the CP ground objects.
+    Identifiers are memoized until any of the fields they're made of changes.
+    """
+    __slots__ = ("_store", "_row", "_string_identifier", "_group_identifier")
+
+    # pickled fields, store itself is rebuilt by the theater
+    STATE_SLOTS = ("cp_id", "group_id", "object_id", "dcs_identifier", "is_dead", "heading", "position")
+
+    def __init__(self, cp_id: int = 0, group_id: int = 0, object_id: int = 0, dcs_identifier: str = None,
+                 heading: float = 0, position: Point = None, is_dead: bool = False):
+        self._string_identifier = None
+        self._group_identifier = None
+        self._store = _DETACHED_STORE
+        self._row = _DetachedRow(cp_id, group_id, object_id, dcs_identifier, heading, position, is_dead)
+
+    def __getstate__(self):
+        return {name: getattr(self, name) for name in self.STATE_SLOTS}
+
+    def __setstate__(self, state):
+        # same as __getstate__, or the instance dict of pickles made before slots (only set attributes are there)
+        self.__init__()
+        for name, value in state.items():
+            if name in self.STATE_SLOTS:
+                setattr(self, name, value)
+
+    def _identity_changed(self):
+        self._string_identifier = None
+        self._group_identifier = None
+
+    @property
+    def cp_id(self) -> int:
+        return self._store.cp_id[self._row]
+
+    @cp_id.setter
+    def cp_id(self, value: int):
+        self._store.cp_id[self._row] = value
+        self._identity_changed()
+
+    @property
+    def group_id(self) -> int:
+        return self._store.group_id[self._row]
+
+    @group_id.setter
+    def group_id(self, value: int):
+        self._store.group_id[self._row] = value
+        self._identity_changed()
 
-    dcs_identifier = None  # type: str
-    is_dead = False
+    @property
+    def object_id(self) -> int:
+        return self._store.object_id[self._row]
+
+    @object_id.setter
+    def object_id(self, value: int):
+        self._store.object_id[self._row] = value
+        self._identity_changed()
+
+    @property
+    def dcs_identifier(self) -> str:
+        return self._store.dcs_identifier[self._row]
+
+    @dcs_identifier.setter
+    def dcs_identifier(self, value: str):
+        self._store.dcs_identifier[self._row] = value
+        self._store.category[self._row] = _category_code(value)
+        self._identity_changed()
+
+    @property
+    def is_dead(self) -> bool:
+        return bool(self._store.dead[self._row])
+
+    @is_dead.setter
+    def is_dead(self, value: bool):
+        self._store.dead[self._row] = value
+
+    @property
+    def heading(self) -> float:
+        return self._store.heading[self._row]
+
+    @heading.setter
+    def heading(self, value: float):
+        self._store.heading[self._row] = value
+
+    @property
+    def position(self) -> typing.Optional[Point]:
+        return self._store.position[self._row]
 
-    heading = 0
-    position = None  # type: Point
+    @position.setter
+    def position(self, value: typing.Optional[Point]):
+        self._store.position[self._row] = value
+        self._store.x[self._row] = value.x if value else math.nan
+        self._store.y[self._row] = value.y if value else math.nan
 
     @property
     def category(self) -> str:
-        for k, v in CATEGORY_MAP.items():
-            if self.dcs_identifier in v:
-                return k
-        assert False, "Identifier not found in mapping: {}".format(self.dcs_identifier)
+        code = self._store.category[self._row]
+        assert code != NO_CATEGORY, "Identifier not found in mapping: {}".format(self.dcs_identifier)
+        return CATEGORIES[code]
 
     @property
     def string_identifier(self):
-        return "{}|{}|{}|{}".format(self.category, self.cp_id, self.group_id, self.object_id)
+        if self._string_identifier is None:
+            self._string_identifier = "{}|{}|{}|{}".format(self.category, self.cp_id, self.group_id, self.object_id)
+        return self._string_identifier
 
     @property
     def group_identifier(self) -> str:
-        return "{}|{}".format(self.category, self.group_id)
+        if self._group_identifier is None:
+            self._group_identifier = "{}|{}".format(self.category, self.group_id)
+        return self._group_identifier
 
     @property
     def name_abbrev(self) -> str:
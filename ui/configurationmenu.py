@@ -36,6 +36,9 @@ class ConfigurationMenu(Menu):
         self.cold_start_var = BooleanVar()
         self.cold_start_var.set(self.game.settings.cold_start)
 
+        self.live_telemetry_var = BooleanVar()
+        self.live_telemetry_var.set(self.game.settings.live_telemetry)
+
     def dismiss(self):
         self.game.settings.player_skill = self.player_skill_var.get()
         self.game.settings.enemy_skill = self.enemy_skill_var.get()
@@ -45,6 +48,7 @@ class ConfigurationMenu(Menu):
         self.game.settings.only_player_takeoff = self.takeoff_var.get()
         self.game.settings.night_disabled = self.night_var.get()
         self.game.settings.cold_start = self.cold_start_var.get()
+        self.game.settings.live_telemetry = self.live_telemetry_var.get()
         super(ConfigurationMenu, self).dismiss()
 
     def display(self):
@@ -104,6 +108,10 @@ class ConfigurationMenu(Menu):
         Checkbutton(body, variable=self.night_var, **STYLES["radiobutton"]).grid(row=row, column=1, sticky=E)
         row += 1
 
+        Label(body, text="Live kill telemetry (needs liberation_telemetry.lua)", **STYLES["widget"]).grid(row=row, column=0, sticky=W)
+        Checkbutton(body, variable=self.live_telemetry_var, **STYLES["radiobutton"]).grid(row=row, column=1, sticky=E)
+        row += 1
+
         Label(body, text="Contributors: ", **STYLES["strong"]).grid(row=row, column=0, columnspan=2, sticky=EW)
         row += 1
 
@@ -14,5 +14,5 @@ class CorruptedSaveMenu(Menu):
         self.window.clear_right_pane()
 
         Label(text="Your save game is either incompatible or was corrupted!", **STYLES["widget"]).grid(row=0, column=0)
-        Label(text="Please restore it by replacing \"liberation_save\" file with \"liberation_save_tmp\" to restore last saved copy.", **STYLES["widget"]).grid(row=1, column=0)
+        Label(text="Please restore it by replacing \"liberation_save\" file with one of the \"liberation_save_turnN_ID\" files to restore the save of the last turns (ID is the same for all of the turns of the campaign).", **STYLES["widget"]).grid(row=1, column=0)
         Label(text="You can find those files under user Saved Games\\DCS directory.", **STYLES["widget"]).grid(row=2, column=0)
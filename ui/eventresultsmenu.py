@@ -1,10 +1,15 @@
+import queue
+
 from tkinter.ttk import *
 from ui.window import *
 
 from game.game import *
 from userdata.debriefing import *
+from userdata.telemetry import TelemetryListener
 from .styles import STYLES
 
+DEBRIEFING_POLL_INTERVAL = 100
+
 
 class EventResultsMenu(Menu):
     debriefing = None  # type: Debriefing
@@ -18,7 +23,17 @@ class EventResultsMenu(Menu):
         self.event = event
         self.finished = False
 
-        wait_for_debriefing(callback=self.process_debriefing)
+        # results come from whichever is first: the debriefing log or the live telemetry
+        self.sources = [wait_for_debriefing()]
+        if self.game.settings.live_telemetry:
+            telemetry = TelemetryListener()
+            try:
+                telemetry.start()
+                self.sources.append(telemetry)
+            except OSError:
+                pass
+
+        self.window.tk.after(DEBRIEFING_POLL_INTERVAL, self.poll_debriefing)
 
     def display(self):
         self.window.clear_right_pane()
@@ -44,7 +59,11 @@ class EventResultsMenu(Menu):
             label("In DCS, open and play the mission:")
             label("liberation_nextturn", "italic")
             label("or")
-            label("liberation_nextturn_quick", "italic")
+            if self.event.is_quick_generated:
+                label("liberation_nextturn_quick", "italic")
+            else:
+                Button(self.frame, text="Generate quick mission", command=self.generate_quick, **STYLES["btn-primary"]).grid(row=row, column=0, sticky=NW, columnspan=2, pady=5)
+                row += 1
             header("Then save the debriefing to the folder:")
             label(debriefing_directory_location(), "italic")
             header("Waiting for results...")
@@ -104,13 +123,36 @@ class EventResultsMenu(Menu):
             Button(self.frame, text="Okay", command=self.dismiss, **STYLES["btn-primary"]).grid(columnspan=1, row=row)
             row += 1
 
+    def generate_quick(self):
+        self.game.initiate_quick_event(self.event)
+        self.display()
+
+    def poll_debriefing(self):
+        # tkinter isn't thread safe, so the debriefing is processed from the UI thread
+        if self.finished:
+            return
+
+        for source in self.sources:
+            try:
+                debriefing = source.results.get_nowait()
+            except queue.Empty:
+                continue
+
+            self.stop_sources()
+            self.process_debriefing(debriefing)
+            return
+
+        self.window.tk.after(DEBRIEFING_POLL_INTERVAL, self.poll_debriefing)
+
+    def stop_sources(self):
+        for source in self.sources:
+            source.stop()
+
     def process_debriefing(self, debriefing: Debriefing):
         self.debriefing = debriefing
 
-        debriefing.calculate_units(regular_mission=self.event.operation.regular_mission,
-                                   quick_mission=self.event.operation.quick_mission,
-                                   player_name=self.game.player,
-                                   enemy_name=self.game.enemy)
+        regular_index, quick_index = self.event.load_mission_indexes()
+        debriefing.calculate_units(regular_index=regular_index, quick_index=quick_index)
 
         self.game.finish_event(event=self.event, debriefing=debriefing)
         self.game.pass_turn(ignored_cps=[self.event.to_cp, ])
@@ -122,51 +164,12 @@ class EventResultsMenu(Menu):
 
     def simulate_result(self, player_factor: float, enemy_factor: float):
         def action():
-            debriefing = Debriefing({})
-
-            def count(country: Country) -> typing.Dict[UnitType, int]:
-                result = {}
-                for g in country.plane_group + country.vehicle_group + country.helicopter_group + country.ship_group:
-                    group = g  # type: Group
-                    for unit in group.units:
-                        unit_type = None
-                        if isinstance(unit, Vehicle):
-                            unit_type = vehicle_map[unit.type]
-                        elif isinstance(unit, Ship):
-                            unit_type = ship_map[unit.type]
-                        else:
-                            unit_type = unit.unit_type
-
-                        if unit_type in db.EXTRA_AA.values():
-                            continue
-
-                        result[unit_type] = result.get(unit_type, 0) + 1
-
-                return result
-
-            player = self.event.operation.mission.country(self.game.player)
-            enemy = self.event.operation.mission.country(self.game.enemy)
-
-            alive_player_units = count(player)
-            alive_enemy_units = count(enemy)
-
-            destroyed_player_units = db.unitdict_restrict_count(alive_player_units, math.ceil(
-                sum(alive_player_units.values()) * player_factor))
-            destroyed_enemy_units = db.unitdict_restrict_count(alive_enemy_units, math.ceil(
-                sum(alive_enemy_units.values()) * enemy_factor))
-
-            alive_player_units = {k: v - destroyed_player_units.get(k, 0) for k, v in alive_player_units.items()}
-            alive_enemy_units = {k: v - destroyed_enemy_units.get(k, 0) for k, v in alive_enemy_units.items()}
-
-            debriefing.alive_units = {
-                enemy.name: alive_enemy_units,
-                player.name: alive_player_units,
-            }
-
-            debriefing.destroyed_units = {
-                player.name: destroyed_player_units,
-                enemy.name: destroyed_enemy_units,
-            }
+            self.stop_sources()
+            debriefing = Debriefing.simulated(mission=self.event.operation.current_mission,
+                                              player_name=self.game.player,
+                                              enemy_name=self.game.enemy,
+                                              player_factor=player_factor,
+                                              enemy_factor=enemy_factor)
 
             self.finished = True
             self.debriefing = debriefing
@@ -0,0 +1,33 @@
+import concurrent.futures
+import typing
+
+from tkinter import *
+from tkinter.ttk import *
+from .styles import STYLES
+
+from ui.window import *
+from userdata.saveheader import SaveHeader
+
+LOADING_POLL_INTERVAL = 50
+
+
+class LoadingMenu(Menu):
+    def __init__(self, window: Window, header: SaveHeader, future: concurrent.futures.Future, callback: typing.Callable):
+        super(LoadingMenu, self).__init__(window, None, None)
+        self.frame = window.right_pane
+        self.header = header
+        self.future = future
+        self.callback = callback
+
+    def display(self):
+        self.window.clear_right_pane()
+
+        Label(text="Loading the campaign ({}, turn {})...".format(self.header.theater, self.header.turn), **STYLES["widget"]).grid(row=0, column=0)
+        self.window.tk.after(LOADING_POLL_INTERVAL, self.poll)
+
+    def poll(self):
+        # tkinter isn't thread safe, so the callback is called from the UI thread once the game is restored
+        if self.future.done():
+            self.callback(self.future)
+        else:
+            self.window.tk.after(LOADING_POLL_INTERVAL, self.poll)
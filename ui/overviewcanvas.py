@@ -39,7 +39,6 @@ class OverviewCanvas:
     ground_assets_icons = None  # type: typing.Dict[str, pygame.Surface]
     event_icons = None  # type: typing.Dict[typing.Type, pygame.Surface]
     selected_event_info = None  # type: typing.Tuple[Event, typing.Tuple[int, int]]
-    frontline_vector_cache = None  # type: typing.Dict[str, typing.Tuple[Point, int, int]]
 
     def __init__(self, frame: Frame, parent, game: Game):
 
@@ -62,9 +61,6 @@ class OverviewCanvas:
         self.fontsmall: pygame.font.SysFont = pygame.font.SysFont("arial", 10)
         self.ground_assets_icons = {}
 
-        # Frontline are too heavy on performance to compute in realtime, so keep them in a cache
-        self.frontline_vector_cache = {}
-
         # Map state
         self.redraw_required = True
         self.zoom = 1
@@ -178,14 +174,9 @@ class OverviewCanvas:
 
     def sdl_thread(self):
         self.redraw_required = True
-        i = 0
         while not self.exited:
             self.clock.tick(30)
             self.draw()
-            i += 1
-            if i == 600:
-                self.frontline_vector_cache = {}
-                i = 0
         print("Stopped SDL app")
 
     def draw(self):
@@ -523,7 +514,7 @@ class OverviewCanvas:
             if self. _cp_available_for_selected_event(cp):
                 event = self.selected_event_info[0]
                 event.departure_cp = cp
-                event.environment_settings = environmentgen.generate()
+                event.environment_settings = environmentgen.generate(event.random_stream("environment"))
 
                 self.selected_event_info = None
                 self.parent.start_event(event)
@@ -561,14 +552,8 @@ class OverviewCanvas:
         return X > treshold and X or treshold, Y > treshold and Y or treshold
 
     def _frontline_vector(self, from_cp: ControlPoint, to_cp: ControlPoint):
-        # Cache mechanism to avoid performing frontline vector computation on every frame
-        key = str(from_cp.id) + "_" + str(to_cp.id)
-        if key in self.frontline_vector_cache:
-            return self.frontline_vector_cache[key]
-        else:
-            frontline = Conflict.frontline_vector(from_cp, to_cp, self.game.theater)
-            self.frontline_vector_cache[key] = frontline
-            return frontline
+        # Frontlines are cached by the theater until strength or ownership of the CPs changes
+        return Conflict.frontline_vector(from_cp, to_cp, self.game.theater)
 
     def _frontline_center(self, from_cp: ControlPoint, to_cp: ControlPoint) -> typing.Optional[Point]:
         frontline_vector = self._frontline_vector(from_cp, to_cp)
@@ -4,7 +4,8 @@ from tkinter import messagebox
 
 from .styles import BG_COLOR,BG_TITLE_COLOR
 from game.game import *
-from theater import persiangulf, nevada, caucasus, start_generator
+from game.randomcontext import RandomContext
+from theater import registry, start_generator
 from userdata import logging as logging_module
 
 import sys
@@ -87,23 +88,20 @@ class Window:
         self.right_pane.grid_remove()
         self.build()
 
-    def start_new_game(self, player_name: str, enemy_name: str, terrain: str, sams: bool, midgame: bool, multiplier: float):
-        if terrain == "persiangulf":
-            conflicttheater = persiangulf.PersianGulfTheater()
-        elif terrain == "nevada":
-            conflicttheater = nevada.NevadaTheater()
-        else:
-            conflicttheater = caucasus.CaucasusTheater()
+    def start_new_game(self, player_name: str, enemy_name: str, terrain: str, sams: bool, midgame: bool, multiplier: float, seed: int = None):
+        conflicttheater = registry.create_theater(terrain)
 
         if midgame:
             for i in range(0, int(len(conflicttheater.controlpoints) / 2)):
                 conflicttheater.controlpoints[i].captured = True
 
+        random_context = RandomContext(seed)
         start_generator.generate_inital_units(conflicttheater, enemy_name, sams, multiplier)
-        start_generator.generate_groundobjects(conflicttheater)
+        start_generator.generate_groundobjects(conflicttheater, random_context.stream("groundobjects"))
         game = Game(player_name=player_name,
                     enemy_name=enemy_name,
-                    theater=conflicttheater)
+                    theater=conflicttheater,
+                    random_context=random_context)
         game.budget = int(game.budget * multiplier)
         game.settings.multiplier = multiplier
         game.settings.sams = sams
@@ -1,11 +1,8 @@
 import logging
+import math
 import typing
-import re
-import threading
-import time
 import os
 
-from dcs.lua import parse
 from dcs.mission import Mission
 
 from dcs.unit import Vehicle, Ship
@@ -16,116 +13,63 @@ from dcs.unit import UnitType
 
 from game import db
 
+from .debriefinglog import DebriefingLog
+from .debriefingwatcher import DebriefingWatcher
+from .missionindex import MissionIndex
 from .persistency import base_path
 from theater.theatergroundobject import CATEGORY_MAP
 
 DEBRIEFING_LOG_EXTENSION = "log"
 
 
-def parse_mutliplayer_debriefing(contents: str):
-    result = {}
-    element = None
-
-    in_events = False
-
-    for line in [x.strip() for x in contents.splitlines()]:
-        if line.startswith("events ="):
-            in_events = True
-        elif line.startswith("} -- end of events"):
-            in_events = False
-
-        if not in_events:
-            continue
-
-        key = None
-        if line.startswith("initiator\t"):
-            key = "initiator"
-            if element is None:
-                element = {}
-        elif line.startswith("initiatorMissionID\t"):
-            key = "initiatorMissionID"
-            if element is None:
-                element = {}
-        elif line.startswith("type\t"):
-            key = "type"
-            if element is None:
-                element = {}
-        elif line.startswith("}, -- end of ["):
-            result[len(result)] = element
-            element = None
-            continue
-        else:
-            continue
-
-        value = re.findall(r"=\s*\"(.*?)\",", line)[0]
-        element[key] = value
-
-    return {"debriefing": {"events": result}}
-
-
 class Debriefing:
     def __init__(self, dead_units, trigger_state):
         self.destroyed_units = {}  # type: typing.Dict[str, typing.Dict[UnitType, int]]
         self.alive_units = {}  # type: typing.Dict[str, typing.Dict[UnitType, int]]
         self.destroyed_objects = []  # type: typing.List[str]
 
+        # reported by the live telemetry, otherwise the mission is told by the triggers state of the debriefing log
+        self.is_quick = None  # type: typing.Optional[bool]
         self._trigger_state = trigger_state
         self._dead_units = dead_units
+        self._dead_units_set = set(dead_units)
 
     @classmethod
     def parse(cls, path: str):
-        dead_units = []
+        with open(path, "r") as f:
+            log = DebriefingLog(f)
+            # triggers state is filled by the log as it's read
+            debriefing = Debriefing([], log.triggers_state)
+            for event_type, object_mission_id_str in log.dead_events():
+                debriefing.append_dead_unit(object_mission_id_str)
+
+        return debriefing
 
-        def append_dead_object(object_mission_id_str):
-            nonlocal dead_units
+    def append_dead_unit(self, object_mission_id_str: str) -> bool:
+        try:
             object_mission_id = int(object_mission_id_str)
-            if object_mission_id in dead_units:
-                logging.error("debriefing: failed to append_dead_object {}: already exists!".format(object_mission_id))
-                return
-
-            dead_units.append(object_mission_id)
-
-        def parse_dead_object(event):
-            try:
-                append_dead_object(event["initiatorMissionID"])
-            except KeyError:
-                try:
-                    append_dead_object([x['initiatorMissionID'] for x in event.values() if 'initiatorMissionID' in x][0])
-                except Exception as e:
-                    logging.error(e)
-            except Exception as e:
-                logging.error(e)
+        except ValueError as e:
+            logging.error(e)
+            return False
 
-        with open(path, "r") as f:
-            table_string = f.read()
-            try:
-                table = parse.loads(table_string)
-            except Exception as e:
-                table = parse_mutliplayer_debriefing(table_string)
-
-            try:
-                events = table["debriefing"].get("events", {})
-            except KeyError:
-                events = table.get('events', {})
-            for event in events.values():
-                try:
-                    event_type = event["type"]
-                except KeyError:
-                    # this means we've encountered a different version of the parsed debrief.  This means we must search
-                    # for the key we want :|
-                    try:
-                        event_type = [x['type'] for x in event.values() if 'type' in x][0]
-                    except Exception as e:
-                        print("Failed to parse event - {} ({})".format(event, e))
-                if event_type in ["crash", "dead"]:
-                    parse_dead_object(event)
-
-            trigger_state = table.get("debriefing", {}).get("triggers_state", {})
-
-        return Debriefing(dead_units, trigger_state)
-
-    def calculate_units(self, regular_mission: Mission, quick_mission: Mission, player_name: str, enemy_name: str):
-        def count_groups(groups: typing.List[UnitType]) -> typing.Dict[UnitType, int]:
+        if object_mission_id in self._dead_units_set:
+            logging.error("debriefing: failed to append_dead_object {}: already exists!".format(object_mission_id))
+            return False
+
+        self._dead_units.append(object_mission_id)
+        self._dead_units_set.add(object_mission_id)
+        return True
+
+    @property
+    def dead_units_count(self) -> int:
+        return len(self._dead_units)
+
+    @classmethod
+    def simulated(cls, mission: Mission, player_name: str, enemy_name: str, player_factor: float, enemy_factor: float):
+        """
+        Builds debriefing for the mission with player_factor and enemy_factor fractions of the units destroyed.
+        """
+        def count(groups) -> typing.Dict[UnitType, int]:
             result = {}
             for group in groups:
                 for unit in group.units:
@@ -137,52 +81,66 @@ class Debriefing:
 
             return result
 
-        mission = regular_mission if len(self._trigger_state) else quick_mission
-
         player = mission.country(player_name)
         enemy = mission.country(enemy_name)
 
-        player_units = count_groups(player.plane_group + player.vehicle_group + player.ship_group)
-        enemy_units = count_groups(enemy.plane_group + enemy.vehicle_group + enemy.ship_group)
+        alive_player_units = count(player.plane_group + player.vehicle_group + player.helicopter_group + player.ship_group)
+        alive_enemy_units = count(enemy.plane_group + enemy.vehicle_group + enemy.helicopter_group + enemy.ship_group)
 
-        self.destroyed_units = {
-            player.name: {},
-            enemy.name: {},
+        destroyed_player_units = db.unitdict_restrict_count(alive_player_units, math.ceil(sum(alive_player_units.values()) * player_factor))
+        destroyed_enemy_units = db.unitdict_restrict_count(alive_enemy_units, math.ceil(sum(alive_enemy_units.values()) * enemy_factor))
+
+        debriefing = cls([], {})
+        debriefing.alive_units = {
+            player.name: {k: v - destroyed_player_units.get(k, 0) for k, v in alive_player_units.items()},
+            enemy.name: {k: v - destroyed_enemy_units.get(k, 0) for k, v in alive_enemy_units.items()},
         }
 
-        all_groups = {
-            player.name: player.plane_group + player.helicopter_group + player.vehicle_group + player.ship_group,
-            enemy.name: enemy.plane_group + enemy.helicopter_group + enemy.vehicle_group + enemy.ship_group,
+        debriefing.destroyed_units = {
+            player.name: destroyed_player_units,
+            enemy.name: destroyed_enemy_units,
         }
+        return debriefing
 
-        static_groups = enemy.static_group
+    def _mission_index(self, regular_index: MissionIndex, quick_index: typing.Optional[MissionIndex]) -> MissionIndex:
+        # quick mission is generated on demand, so it might not exist
+        if quick_index is None:
+            return regular_index
 
-        for country_name, country_groups in all_groups.items():
-            for group in country_groups:
-                for unit in group.units:
-                    if unit.id in self._dead_units:
-                        unit_type = db.unit_type_of(unit)
-                        logging.info("debriefing: found dead unit {} ({}, {})".format(str(unit.name), unit.id, unit_type))
+        if self.is_quick is not None:
+            return quick_index if self.is_quick else regular_index
+        else:
+            return quick_index if len(self._trigger_state) == quick_index.triggers else regular_index
 
-                        assert country_name
-                        assert unit_type
-                        self.destroyed_units[country_name][unit_type] = self.destroyed_units[country_name].get(unit_type, 0) + 1
-                        self._dead_units.remove(unit.id)
+    def calculate_units(self, regular_index: MissionIndex, quick_index: typing.Optional[MissionIndex]):
+        index = self._mission_index(regular_index, quick_index)
 
-        for group in static_groups:
-            identifier = group.units[0].id
-            if identifier in self._dead_units and group.units[0].type != 'big_smoke':
-                logging.info("debriefing: found dead static {} ({})".format(str(group.name), identifier))
+        self.destroyed_units = {country_name: {} for country_name in index.totals}
 
-                assert str(group.name)
-                self.destroyed_objects.append(str(group.name))
-                self._dead_units.remove(identifier)
+        unsatisfied = []
+        for unit_id in self._dead_units:
+            if unit_id in index.units:
+                country_name, unit_type, group_name = index.units[unit_id]
+                logging.info("debriefing: found dead unit of {} ({}, {})".format(group_name, unit_id, unit_type))
 
+                assert country_name
+                assert unit_type
+                self.destroyed_units[country_name][unit_type] = self.destroyed_units[country_name].get(unit_type, 0) + 1
+            elif unit_id in index.statics:
+                group_name = index.statics[unit_id]
+                logging.info("debriefing: found dead static {} ({})".format(group_name, unit_id))
+
+                assert group_name
+                self.destroyed_objects.append(group_name)
+            else:
+                unsatisfied.append(unit_id)
+
+        self._dead_units = unsatisfied
         logging.info("debriefing: unsatistied ids: {}".format(self._dead_units))
 
         self.alive_units = {
-            player.name: {k: v - self.destroyed_units[player.name].get(k, 0) for k, v in player_units.items()},
-            enemy.name: {k: v - self.destroyed_units[enemy.name].get(k, 0) for k, v in enemy_units.items()},
+            country_name: {k: v - self.destroyed_units[country_name].get(k, 0) for k, v in totals.items()}
+            for country_name, totals in index.totals.items()
         }
 
 
@@ -190,31 +148,14 @@ def debriefing_directory_location() -> str:
     return os.path.join(base_path(), "liberation_debriefings")
 
 
-def _logfiles_snapshot() -> typing.Dict[str, float]:
-    result = {}
-    for file in os.listdir(debriefing_directory_location()):
-        fullpath = os.path.join(debriefing_directory_location(), file)
-        result[file] = os.path.getmtime(fullpath)
-
-    return result
-
-
-def _poll_new_debriefing_log(snapshot: typing.Dict[str, float], callback: typing.Callable):
-    should_run = True
-    while should_run:
-        for file, timestamp in _logfiles_snapshot().items():
-            if file not in snapshot or timestamp != snapshot[file]:
-                debriefing = Debriefing.parse(os.path.join(debriefing_directory_location(), file))
-                callback(debriefing)
-                should_run = False
-                break
-
-        time.sleep(3)
-
-
-def wait_for_debriefing(callback: typing.Callable):
+def wait_for_debriefing() -> DebriefingWatcher:
+    """
+    Starts watching for the debriefing log saved after the mission, parsed Debriefing is put into the results queue
+    of the returned watcher.
+    """
     if not os.path.exists(debriefing_directory_location()):
         os.mkdir(debriefing_directory_location())
 
-    threading.Thread(target=_poll_new_debriefing_log, args=(_logfiles_snapshot(), callback)).start()
-
+    watcher = DebriefingWatcher(debriefing_directory_location(), Debriefing.parse)
+    watcher.start()
+    return watcher
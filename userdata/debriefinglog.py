@@ -0,0 +1,139 @@
+import re
+import typing
+
+"""
+Streaming reader of the DCS debriefing log. The log is a serialized Lua table (either the whole "debriefing" table
+or its multiplayer variant with the top-level "events = {...}"), which is tokenized chunk by chunk, so the memory
+used doesn't depend on the log size. Only the things the debriefing needs are kept: crash and dead events with
+the mission id of the unit and the triggers state.
+"""
+
+DEAD_EVENT_TYPES = ("crash", "dead")
+CHUNK_SIZE = 1 << 16
+
+# separators are skipped along with the whitespace, keys are matched together with the assignment;
+# alternatives are ordered by how often they occur in the log
+_STRING = r'"[^"\\]*(?:\\[\s\S][^"\\]*)*"'
+_TOKEN = re.compile(r"""[\s,;]*(?:
+    (?P<name>[A-Za-z_]\w*)\s*= |
+    (?P<string>{string}) |
+    (?P<open>\{{) |
+    (?P<close>\}}) |
+    \[\s*(?P<key>{string}|-?[\w.]+)\s*\]\s*= |
+    (?P<value>-?[\w.]+(?:(?<=[eE])[-+]\d+)?) |
+    (?P<comment>--[^\n]*)
+)""".format(string=_STRING), re.X)
+
+_ESCAPE = re.compile(r"\\([\s\S])")
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r"}
+_VALUES = {"true": True, "false": False, "nil": None}
+
+
+def _decode_string(token: str) -> str:
+    value = token[1:-1]
+    if "\\" in value:
+        value = _ESCAPE.sub(lambda x: _ESCAPES.get(x.group(1), x.group(1)), value)
+    return value
+
+
+def _decode_value(token: str):
+    if token in _VALUES:
+        return _VALUES[token]
+
+    try:
+        return int(token)
+    except ValueError:
+        pass
+
+    try:
+        return float(token)
+    except ValueError:
+        return token
+
+
+def _decode_key(token: str):
+    return _decode_string(token) if token.startswith('"') else _decode_value(token)
+
+
+def tokenize(f: typing.TextIO, chunk_size: int = CHUNK_SIZE) -> typing.Iterator[typing.Tuple[str, str]]:
+    """
+    Yields (kind, text) tokens of the Lua table read from f: "key" and "name" (key of the assignment that follows),
+    "open", "close", "string" and "value". Only the complete lines of the buffer are tokenized until the end of file,
+    so the tokens (which aren't split over the lines by the DCS serializer, except the escaped newlines of the strings)
+    are never cut by the chunk boundary.
+    """
+    buffer = ""
+    eof = False
+    while not eof:
+        chunk = f.read(chunk_size)
+        eof = not chunk
+        buffer += chunk
+
+        pos = 0
+        match = _TOKEN.scanner(buffer, 0, len(buffer) if eof else buffer.rfind("\n") + 1).match
+        for m in iter(match, None):
+            kind = m.lastgroup
+            if kind != "comment":
+                yield kind, m.group(kind)
+            pos = m.end()
+
+        buffer = buffer[pos:]
+        if eof and buffer.strip():
+            raise ValueError("debriefing log: unexpected {!r}".format(buffer[:32]))
+
+
+class DebriefingLog:
+    """
+    Reader of the debriefing log. dead_events() is iterated for the crash and dead events; triggers_state is filled
+    once the triggers table is read, so it's complete after the iteration.
+    """
+
+    def __init__(self, f: typing.TextIO, chunk_size: int = CHUNK_SIZE):
+        self.triggers_state = {}  # type: typing.Dict[typing.Any, typing.Any]
+        self._f = f
+        self._chunk_size = chunk_size
+
+    def dead_events(self) -> typing.Iterator[typing.Tuple[str, str]]:
+        """
+        Yields (event type, initiator mission id) of the crash and dead events. Fields are looked up in the nested
+        tables of the event as well, since some versions of DCS wrap them.
+        """
+        depth = 0
+        key = None
+        events_depth = None
+        triggers_depth = None
+        event_type = initiator = None
+
+        for kind, text in tokenize(self._f, self._chunk_size):
+            if kind == "name":
+                key = text
+            elif kind == "key":
+                key = _decode_key(text)
+            elif kind == "open":
+                depth += 1
+                if events_depth is None and key == "events":
+                    events_depth = depth
+                elif triggers_depth is None and key == "triggers_state":
+                    triggers_depth = depth
+                key = None
+            elif kind == "close":
+                if depth == events_depth:
+                    events_depth = None
+                elif depth == triggers_depth:
+                    triggers_depth = None
+                elif events_depth is not None and depth == events_depth + 1:
+                    # end of the event
+                    if event_type in DEAD_EVENT_TYPES and initiator is not None:
+                        yield event_type, initiator
+                    event_type = initiator = None
+                depth -= 1
+                key = None
+            else:
+                if events_depth is not None and depth > events_depth:
+                    if key == "type" and event_type is None:
+                        event_type = _decode_string(text) if kind == "string" else text
+                    elif key == "initiatorMissionID" and initiator is None:
+                        initiator = _decode_string(text) if kind == "string" else text
+                elif triggers_depth is not None and depth == triggers_depth:
+                    self.triggers_state[key] = _decode_string(text) if kind == "string" else _decode_value(text)
+                key = None
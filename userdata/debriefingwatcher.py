@@ -0,0 +1,197 @@
+import ctypes
+import ctypes.util
+import logging
+import os
+import queue
+import selectors
+import struct
+import sys
+import threading
+import time
+import typing
+
+"""
+Watcher of the debriefings directory. On linux it waits for the inotify events of the files written and closed
+(or moved) in the directory, elsewhere it falls back to polling, which backs off while nothing changes.
+Either way the log is parsed only once it's stayed untouched for a while (debounce interval after the last event,
+or two polls), so the partial writes of DCS aren't picked up, and the result is put into the results queue for the UI
+thread to pick up.
+"""
+
+DEBOUNCE_INTERVAL = 0.25
+# polling interval is reset to the minimum on changes and doubled up to the maximum while nothing changes,
+# the maximum keeps the results within a second (file has to stay the same for two polls)
+POLL_INTERVAL_MIN = 0.1
+POLL_INTERVAL_MAX = 0.5
+
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+# wd, mask, cookie and length of the name that follows
+_INOTIFY_EVENT = struct.Struct("iIII")
+_INOTIFY_BUFFER_SIZE = 64 * 1024
+
+FileStat = typing.Tuple[float, int]
+
+
+class _Inotify:
+    """
+    Minimal ctypes wrapper of inotify watching a single directory, with the descriptor registered in the selector.
+    """
+
+    def __init__(self, directory: str, selector: selectors.BaseSelector):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+
+        self.fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), _IN_CLOSE_WRITE | _IN_MOVED_TO) < 0:
+            error = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(error, "inotify_add_watch failed for {}".format(directory))
+
+        selector.register(self.fd, selectors.EVENT_READ)
+
+    def read(self) -> typing.List[str]:
+        try:
+            data = os.read(self.fd, _INOTIFY_BUFFER_SIZE)
+        except BlockingIOError:
+            return []
+
+        names = []
+        pos = 0
+        while pos < len(data):
+            _, _, _, length = _INOTIFY_EVENT.unpack_from(data, pos)
+            pos += _INOTIFY_EVENT.size
+            name = data[pos:pos + length].rstrip(b"\0")
+            pos += length
+            if name:
+                names.append(os.fsdecode(name))
+        return names
+
+    def close(self):
+        os.close(self.fd)
+
+
+class DebriefingWatcher:
+    """
+    Watches the directory for the new or changed debriefing logs (compared to the state on construction), parses
+    the first one with parse and puts the result into results, then stops.
+    """
+
+    def __init__(self, directory: str, parse: typing.Callable[[str], typing.Any]):
+        self.directory = directory
+        self.results = queue.Queue()  # type: queue.Queue
+
+        self._parse = parse
+        self._stopped = threading.Event()
+        # guards the wakeup pipe, which is closed by the thread once it's done
+        self._lock = threading.Lock()
+        self._selector = None  # type: selectors.BaseSelector
+        self._inotify = None  # type: _Inotify
+        self._wakeup = None  # type: typing.Tuple[int, int]
+
+        if sys.platform.startswith("linux"):
+            try:
+                self._selector = selectors.DefaultSelector()
+                self._inotify = _Inotify(directory, self._selector)
+                self._wakeup = os.pipe()
+                self._selector.register(self._wakeup[0], selectors.EVENT_READ)
+            except (OSError, AttributeError) as e:
+                logging.warning("debriefing watcher: inotify is not available ({}), polling instead".format(e))
+                self._close_selector()
+
+        self.is_event_driven = self._inotify is not None
+        # taken after the watch is set up, so the files written in between aren't missed
+        self._snapshot = self._stat_files()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        with self._lock:
+            if self._wakeup:
+                os.write(self._wakeup[1], b"\0")
+
+    def _stat_files(self) -> typing.Dict[str, FileStat]:
+        result = {}
+        for entry in os.scandir(self.directory):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+
+            if entry.is_file():
+                result[entry.name] = stat.st_mtime, stat.st_size
+        return result
+
+    def _deliver(self, name: str) -> bool:
+        path = os.path.join(self.directory, name)
+        try:
+            debriefing = self._parse(path)
+        except Exception as e:
+            # most likely the log is still being written, it's parsed again once it changes
+            logging.warning("debriefing watcher: failed to parse {}: {}".format(path, e))
+            return False
+
+        self.results.put(debriefing)
+        return True
+
+    def _run(self):
+        try:
+            if self._inotify:
+                self._watch_events()
+            else:
+                self._watch_polling()
+        finally:
+            self._close_selector()
+
+    def _watch_events(self):
+        # name of the written file -> time it's parsed at, unless it's written again before that
+        pending = {}  # type: typing.Dict[str, float]
+        while not self._stopped.is_set():
+            timeout = max(0.0, min(pending.values()) - time.monotonic()) if pending else None
+            for key, _ in self._selector.select(timeout):
+                if key.fd == self._inotify.fd:
+                    for name in self._inotify.read():
+                        pending[name] = time.monotonic() + DEBOUNCE_INTERVAL
+
+            now = time.monotonic()
+            for name in [name for name, deadline in pending.items() if deadline <= now]:
+                del pending[name]
+                if not self._stopped.is_set() and self._deliver(name):
+                    return
+
+    def _watch_polling(self):
+        interval = POLL_INTERVAL_MIN
+        previous = self._snapshot
+        while not self._stopped.wait(interval):
+            current = self._stat_files()
+            changed = [name for name, stat in current.items() if self._snapshot.get(name) != stat]
+
+            for name in changed:
+                # stayed the same since the last poll, so it's not being written
+                if previous.get(name) == current[name]:
+                    if self._deliver(name):
+                        return
+                    self._snapshot[name] = current[name]
+
+            interval = POLL_INTERVAL_MIN if changed else min(interval * 2, POLL_INTERVAL_MAX)
+            previous = current
+
+    def _close_selector(self):
+        if self._selector:
+            self._selector.close()
+            self._selector = None
+        if self._inotify:
+            self._inotify.close()
+            self._inotify = None
+        with self._lock:
+            if self._wakeup:
+                for fd in self._wakeup:
+                    os.close(fd)
+                self._wakeup = None
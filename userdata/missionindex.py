@@ -0,0 +1,83 @@
+import json
+import typing
+
+from dcs.mission import Mission
+from dcs.unittype import UnitType
+
+from game import db
+
+"""
+Index of the units of the generated mission, written next to the .miz when the mission is saved and loaded back
+by the event once the results are in. Debriefing resolves the mission ids of the dead units through it (country,
+unit type and group of the unit, or identifier of the destroyed static), so the mission itself isn't needed then.
+"""
+
+MISSION_INDEX_FORMAT = 1
+MISSION_INDEX_EXTENSION = "units.json"
+
+UnitEntry = typing.Tuple[str, UnitType, str]
+
+
+def mission_index_path(mission_path: str) -> str:
+    return "{}.{}".format(mission_path, MISSION_INDEX_EXTENSION)
+
+
+class MissionIndex:
+    def __init__(self):
+        # mission id -> country, unit type and group name
+        self.units = {}  # type: typing.Dict[int, UnitEntry]
+        # mission id of the first unit of the static group -> group name (identifier of the ground object)
+        self.statics = {}  # type: typing.Dict[int, str]
+        # units of each country that count towards the alive units
+        self.totals = {}  # type: typing.Dict[str, typing.Dict[UnitType, int]]
+        # debriefing log reports the state of each of them, which tells the regular mission from the quick one
+        self.triggers = 0
+
+    @classmethod
+    def build(cls, mission: Mission, player_name: str, enemy_name: str) -> "MissionIndex":
+        index = cls()
+        for country_name in [player_name, enemy_name]:
+            country = mission.country(country_name)
+            totals = index.totals.setdefault(country.name, {})
+
+            # helicopters are resolved when destroyed, but aren't counted as the alive units
+            for groups, counted in [(country.plane_group + country.vehicle_group + country.ship_group, True),
+                                    (country.helicopter_group, False)]:
+                for group in groups:
+                    for unit in group.units:
+                        unit_type = db.unit_type_of(unit)
+                        index.units[unit.id] = country.name, unit_type, str(group.name)
+                        if counted and unit_type not in db.EXTRA_AA.values():
+                            totals[unit_type] = totals.get(unit_type, 0) + 1
+
+        for group in mission.country(enemy_name).static_group:
+            if group.units[0].type != "big_smoke":
+                index.statics[group.units[0].id] = str(group.name)
+
+        index.triggers = len(mission.triggerrules.triggers)
+        return index
+
+    def save(self, path: str):
+        state = {
+            "format": MISSION_INDEX_FORMAT,
+            "units": {unit_id: [country, db.unit_type_name(unit_type), group] for unit_id, (country, unit_type, group) in self.units.items()},
+            "statics": self.statics,
+            "totals": {country: {db.unit_type_name(k): v for k, v in totals.items()} for country, totals in self.totals.items()},
+            "triggers": self.triggers,
+        }
+
+        with open(path, "w") as f:
+            json.dump(state, f, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path: str) -> "MissionIndex":
+        with open(path, "r") as f:
+            state = json.load(f)
+        assert state["format"] <= MISSION_INDEX_FORMAT, "mission index format {} is newer than supported".format(state["format"])
+
+        index = cls()
+        index.units = {int(unit_id): (country, db.unit_type_from_name(unit_type), group) for unit_id, (country, unit_type, group) in state["units"].items()}
+        index.statics = {int(unit_id): group for unit_id, group in state["statics"].items()}
+        index.totals = {country: {db.unit_type_from_name(k): v for k, v in totals.items()} for country, totals in state["totals"].items()}
+        index.triggers = state["triggers"]
+        return index
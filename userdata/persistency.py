@@ -1,11 +1,19 @@
+import concurrent.futures
 import logging
 import typing
 import pickle
 import os
+import re
 import sys
-import shutil
+
+from .saveheader import SaveHeader, read_header
+
+# saves of the last turns of the campaign kept along with the save
+TURN_SAVES_COUNT = 5
+TURN_SAVE_PATTERN = re.compile(r"^liberation_save_turn(\d+)_(\w+)$")
 
 _user_folder = None  # type: str
+_save_executor = None  # type: concurrent.futures.ThreadPoolExecutor
 
 
 def setup(user_folder: str):
@@ -32,6 +40,10 @@ def _temporary_save_file() -> str:
     return os.path.join(base_path(), "liberation_save_tmp")
 
 
+def _turn_save_file(turn: int, campaign_id: str) -> str:
+    return os.path.join(base_path(), "liberation_save_turn{}_{}".format(turn, campaign_id))
+
+
 def _save_file_exists() -> bool:
     return os.path.exists(_save_file())
 
@@ -40,20 +52,90 @@ def mission_path_for(name: str) -> str:
     return os.path.join(base_path(), "Missions", "{}".format(name))
 
 
+def restore_header() -> typing.Optional[SaveHeader]:
+    """
+    Returns header of the save, None if there's no save or it was made before the header was introduced.
+    """
+    if not _save_file_exists():
+        return None
+
+    with open(_save_file(), "rb") as f:
+        return read_header(f)
+
+
 def restore_game():
     if not _save_file_exists():
         return None
 
+    from userdata import savestate
+
     with open(_save_file(), "rb") as f:
+        header = read_header(f)
+        if header:
+            return savestate.read_state(header, f)
+
+        # pickled Game, saves made before the compact format
+        f.seek(0)
         return pickle.load(f)
 
 
-def save_game(game) -> bool:
+def restore_game_async() -> concurrent.futures.Future:
+    # theater is rebuilt on the worker thread, so UI isn't blocked in the meantime
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    future = executor.submit(restore_game)
+    executor.shutdown(wait=False)
+    return future
+
+
+def _write_atomic(path: str, data: bytes):
+    # file in place is either the previous or the new one, even if the write is interrupted
+    with open(_temporary_save_file(), "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(_temporary_save_file(), path)
+
+
+def _remove_turn_saves(turn: int, campaign_id: str):
+    # turns of the other campaigns are kept, those could still be restored
+    for filename in os.listdir(base_path()):
+        match = TURN_SAVE_PATTERN.match(filename)
+        if match and match.group(2) == campaign_id and not turn - TURN_SAVES_COUNT < int(match.group(1)) <= turn:
+            os.remove(os.path.join(base_path(), filename))
+
+
+def _write_save(state: typing.Dict) -> bool:
+    from userdata import savestate
+
     try:
-        with open(_temporary_save_file(), "wb") as f:
-            pickle.dump(game, f)
-        shutil.copy(_temporary_save_file(), _save_file())
+        data = savestate.serialize(state)
+        _write_atomic(_save_file(), data)
+        _write_atomic(_turn_save_file(state["turn"], state["campaign"]), data)
+        _remove_turn_saves(state["turn"], state["campaign"])
         return True
     except Exception as e:
         logging.error(e)
         return False
+
+
+def save_game(game) -> concurrent.futures.Future:
+    """
+    Saves the game on the worker thread, returned future resolves to the save success.
+    Saves of the last TURN_SAVES_COUNT turns of the campaign are kept along with the save.
+    """
+    global _save_executor
+    from userdata import savestate
+
+    try:
+        # snapshot is taken on the calling thread, so the game could be changed while it's being written
+        state = savestate.encode_game(game)
+    except Exception as e:
+        logging.error(e)
+        future = concurrent.futures.Future()
+        future.set_result(False)
+        return future
+
+    if _save_executor is None:
+        # single worker, so the saves are written in order
+        _save_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    return _save_executor.submit(_write_save, state)
@@ -0,0 +1,57 @@
+import json
+import struct
+import typing
+
+"""
+Header of the save, written in front of the game state (see userdata.savestate). It's read without restoring the
+game, so the save could be checked for compatibility (and shown to the user) before the state is loaded.
+"""
+
+SAVE_MAGIC = b"LIBERATION_SAVE\n"
+SAVE_FORMAT_VERSION = 1
+
+# follows the magic: format version, state crc32, state length and metadata length, then JSON metadata and the state
+_HEADER = struct.Struct("<HIIH")
+
+
+class SaveHeader:
+    def __init__(self, format: int, version: str, theater: str, turn: int, checksum: int, length: int):
+        self.format = format
+        self.version = version
+        self.theater = theater
+        self.turn = turn
+        self.checksum = checksum
+        self.length = length
+
+    @property
+    def is_supported(self) -> bool:
+        return self.format <= SAVE_FORMAT_VERSION
+
+    def __str__(self):
+        return "{} turn {} (version {}, format {})".format(self.theater, self.turn, self.version, self.format)
+
+
+def is_state(data: bytes) -> bool:
+    return data.startswith(SAVE_MAGIC)
+
+
+def read_header(f: typing.BinaryIO) -> typing.Optional[SaveHeader]:
+    """
+    Reads the header, leaving the file at the beginning of the state. Returns None for the files without the header.
+    """
+    if f.read(len(SAVE_MAGIC)) != SAVE_MAGIC:
+        return None
+
+    format, checksum, length, metadata_length = _HEADER.unpack(f.read(_HEADER.size))
+    metadata = json.loads(f.read(metadata_length).decode("utf-8"))
+    return SaveHeader(format, metadata["version"], metadata["theater"], metadata["turn"], checksum, length)
+
+
+def write_header(header: SaveHeader) -> bytes:
+    metadata = json.dumps({
+        "version": header.version,
+        "theater": header.theater,
+        "turn": header.turn,
+    }).encode("utf-8")
+
+    return SAVE_MAGIC + _HEADER.pack(header.format, header.checksum, header.length, len(metadata)) + metadata
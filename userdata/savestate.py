@@ -0,0 +1,225 @@
+import io
+import logging
+import pickle
+import typing
+import zlib
+
+from dcs.mapping import Point
+
+from game import db
+from game.event import Event, UnitsDeliveryEvent
+from game.game import COMMISION_TASKS, Game
+from game.randomcontext import RandomContext
+from game.settings import Settings
+from theater import registry
+from theater.base import Base
+from theater.controlpoint import ControlPoint
+from theater.theatergroundobject import TheaterGroundObject
+from userdata.saveheader import SAVE_FORMAT_VERSION, SaveHeader, read_header, write_header
+
+"""
+Compact save format. Only the mutable state of the campaign is stored: ownership, bases and ground objects
+of the control points, budget, settings and pending events. Theater itself (terrain, airports, CP positions and
+connections) is rebuilt from the theater module on load.
+State consists of the builtin types only (units are referenced by the pydcs id, CPs by the index in the theater),
+it's pickled and compressed after the header (see userdata.saveheader). Pickles of the whole Game made before the format was
+introduced are still loaded by persistency.restore_game and written in this format on the next save.
+"""
+
+UnitsState = typing.Dict[str, int]
+
+
+class _StateUnpickler(pickle.Unpickler):
+    def find_class(self, module, name):
+        # state is builtin types only, anything else means the file is corrupted or wasn't written by dumps
+        raise pickle.UnpicklingError("unexpected {}.{} in the save state".format(module, name))
+
+
+def _encode_units(units: typing.Dict) -> UnitsState:
+    return {db.unit_type_name(unit_type): count for unit_type, count in units.items()}
+
+
+def _decode_units(state: UnitsState) -> typing.Dict:
+    units = {}
+    for unit_id, count in state.items():
+        unit_type = db.unit_type_from_name(unit_id)
+        if unit_type is None:
+            logging.warning("Save state: unknown unit {}, skipping".format(unit_id))
+            continue
+
+        units[unit_type] = count
+    return units
+
+
+def _encode_base(base: Base) -> typing.Dict:
+    return {
+        "aircraft": _encode_units(base.aircraft),
+        "armor": _encode_units(base.armor),
+        "aa": _encode_units(base.aa),
+        "strength": base.strength,
+        "commision_points": {db.task_name(task): points for task, points in base.commision_points.items()},
+    }
+
+
+def _decode_base(state: typing.Dict) -> Base:
+    # only the tasks units are commisioned for have the points
+    tasks = {db.task_name(task): task for task in COMMISION_TASKS}
+
+    base = Base()
+    base.set_units(_decode_units(state["aircraft"]), _decode_units(state["armor"]), _decode_units(state["aa"]))
+    base.strength = state["strength"]
+    base.commision_points = {tasks[name]: points for name, points in state["commision_points"].items()}
+    return base
+
+
+def _encode_ground_object(ground_object: TheaterGroundObject) -> typing.Tuple:
+    return (ground_object.group_id,
+            ground_object.object_id,
+            ground_object.dcs_identifier,
+            ground_object.heading,
+            ground_object.position.x,
+            ground_object.position.y,
+            ground_object.is_dead)
+
+
+def _decode_ground_object(cp: ControlPoint, state: typing.Tuple) -> TheaterGroundObject:
+    group_id, object_id, dcs_identifier, heading, x, y, is_dead = state
+    return TheaterGroundObject(cp_id=cp.id,
+                               group_id=group_id,
+                               object_id=object_id,
+                               dcs_identifier=dcs_identifier,
+                               heading=heading,
+                               position=Point(x, y),
+                               is_dead=is_dead)
+
+
+def _encode_controlpoint(cp: ControlPoint) -> typing.Dict:
+    return {
+        "name": cp.name,
+        "captured": cp.captured,
+        "base": _encode_base(cp.base),
+        "ground_objects": [_encode_ground_object(x) for x in cp.ground_objects],
+    }
+
+
+def _decode_controlpoint(cp: ControlPoint, state: typing.Dict):
+    assert cp.name == state["name"], "control point mismatch: {} saved as {}".format(cp.name, state["name"])
+
+    cp.captured = state["captured"]
+    cp.base = _decode_base(state["base"])
+    cp.ground_objects = [_decode_ground_object(cp, x) for x in state["ground_objects"]]
+
+
+def _event_classes() -> typing.Dict[str, typing.Type[Event]]:
+    result = {}
+    pending = [Event]
+    while pending:
+        event_class = pending.pop()
+        result[event_class.__name__] = event_class
+        pending += event_class.__subclasses__()
+    return result
+
+
+def _encode_event(event: Event, cp_index: typing.Dict[ControlPoint, int]) -> typing.Dict:
+    # operation and environment are set up once the event is started by the player, so they aren't stored
+    state = {
+        "class": type(event).__name__,
+        "from_cp": cp_index[event.from_cp],
+        "to_cp": cp_index[event.to_cp],
+        "departure_cp": event.departure_cp and cp_index[event.departure_cp],
+        "location": (event.location.x, event.location.y),
+        "attacker_name": event.attacker_name,
+        "defender_name": event.defender_name,
+    }
+
+    if isinstance(event, UnitsDeliveryEvent):
+        state["units"] = _encode_units(event.units)
+    return state
+
+
+def _decode_event(game: Game, state: typing.Dict) -> Event:
+    controlpoints = game.theater.controlpoints
+
+    # constructors of some of the events roll their location, saved one is restored instead
+    event_class = _event_classes()[state["class"]]
+    event = event_class.__new__(event_class)
+    event.game = game
+    event.from_cp = controlpoints[state["from_cp"]]
+    event.to_cp = controlpoints[state["to_cp"]]
+    event.departure_cp = controlpoints[state["departure_cp"]] if state["departure_cp"] is not None else None
+    event.location = Point(*state["location"])
+    event.attacker_name = state["attacker_name"]
+    event.defender_name = state["defender_name"]
+
+    if isinstance(event, UnitsDeliveryEvent):
+        event.units = _decode_units(state["units"])
+    return event
+
+
+def encode_game(game: Game) -> typing.Dict:
+    cp_index = {cp: i for i, cp in enumerate(game.theater.controlpoints)}
+    return {
+        "format": SAVE_FORMAT_VERSION,
+        "theater": registry.theater_name(game.theater),
+        "controlpoints": [_encode_controlpoint(cp) for cp in game.theater.controlpoints],
+        "player": game.player,
+        "enemy": game.enemy,
+        "seed": game.random_context.seed,
+        "campaign": game.campaign_id,
+        "turn": game.turn,
+        "budget": game.budget,
+        "settings": dict(game.settings.__dict__),
+        "events": [_encode_event(x, cp_index) for x in game.events],
+        "ignored_cps": [cp_index[x] for x in game.ignored_cps or []],
+    }
+
+
+def decode_game(state: typing.Dict) -> Game:
+    assert state["format"] <= SAVE_FORMAT_VERSION, "save format {} is newer than supported".format(state["format"])
+
+    theater = registry.create_theater(state["theater"])  # type: ConflictTheater
+    assert len(theater.controlpoints) == len(state["controlpoints"]), "control points of the theater don't match the save"
+    for cp, cp_state in zip(theater.controlpoints, state["controlpoints"]):
+        _decode_controlpoint(cp, cp_state)
+
+    game = Game(player_name=state["player"],
+                enemy_name=state["enemy"],
+                theater=theater,
+                random_context=RandomContext(state["seed"]),
+                # compact saves made before the campaign id get a new one
+                campaign_id=state.get("campaign"))
+    game.turn = state["turn"]
+    game.budget = state["budget"]
+    game.settings = Settings()
+    game.settings.__dict__.update(state["settings"])
+    game.events = [_decode_event(game, x) for x in state["events"]]
+    game.ignored_cps = [theater.controlpoints[i] for i in state["ignored_cps"]]
+    return game
+
+
+def read_state(header: SaveHeader, f: typing.BinaryIO) -> Game:
+    assert header.is_supported, "save format {} is newer than supported".format(header.format)
+
+    data = f.read(header.length)
+    assert len(data) == header.length and zlib.crc32(data) == header.checksum, "save state checksum mismatch"
+    return decode_game(_StateUnpickler(io.BytesIO(zlib.decompress(data))).load())
+
+
+def serialize(state: typing.Dict) -> bytes:
+    """
+    Serializes the state made by encode_game. State doesn't reference the game, so it could be done on the other thread.
+    """
+    data = zlib.compress(pickle.dumps(state, pickle.HIGHEST_PROTOCOL))
+    header = SaveHeader(SAVE_FORMAT_VERSION, state["settings"].get("version"), state["theater"], state["turn"], zlib.crc32(data), len(data))
+    return write_header(header) + data
+
+
+def dumps(game: Game) -> bytes:
+    return serialize(encode_game(game))
+
+
+def loads(data: bytes) -> Game:
+    f = io.BytesIO(data)
+    header = read_header(f)
+    assert header, "not a save state"
+    return read_state(header, f)
@@ -0,0 +1,78 @@
+import json
+import sys
+import time
+
+"""
+Import time profiling of the application startup, enabled by the --profile-startup argument.
+Time spent executing each of the modules imported after install() is recorded, both cumulative (including the
+modules it imported) and its own, and dumped as the JSON report sorted by cumulative time.
+"""
+
+_started = None  # type: float
+_records = {}  # type: typing.Dict[str, typing.Tuple[float, float]]
+# time spent in the nested imports for each of the modules currently being executed
+_children_time = []  # type: typing.List[float]
+
+
+class _TimingLoader:
+    def __init__(self, loader):
+        self.loader = loader
+
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module):
+        _children_time.append(0.0)
+        started = time.perf_counter()
+        try:
+            self.loader.exec_module(module)
+        finally:
+            cumulative = time.perf_counter() - started
+            own = cumulative - _children_time.pop()
+            if _children_time:
+                _children_time[-1] += cumulative
+
+            _records[module.__name__] = cumulative, own
+
+    def __getattr__(self, name):
+        return getattr(self.loader, name)
+
+
+class _TimingFinder:
+    @classmethod
+    def find_spec(cls, name, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is cls or not hasattr(finder, "find_spec"):
+                continue
+
+            spec = finder.find_spec(name, path, target)
+            if spec is None:
+                continue
+
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimingLoader(spec.loader)
+            return spec
+
+        return None
+
+
+def install():
+    global _started
+    if _TimingFinder not in sys.meta_path:
+        _started = time.perf_counter()
+        sys.meta_path.insert(0, _TimingFinder)
+
+
+def is_installed() -> bool:
+    return _TimingFinder in sys.meta_path
+
+
+def dump(filename: str):
+    modules = sorted(_records.items(), key=lambda x: x[1][0], reverse=True)
+    report = {
+        "total": time.perf_counter() - _started,
+        "modules": [{"name": name, "cumulative": cumulative, "self": own} for name, (cumulative, own) in modules],
+    }
+
+    with open(filename, "w") as f:
+        json.dump(report, f, indent=2)
@@ -0,0 +1,134 @@
+import asyncio
+import json
+import logging
+import queue
+import threading
+
+from .debriefing import Debriefing
+
+"""
+Live kill telemetry. The optional resources/scripts/liberation_telemetry.lua, loaded into the mission, streams the
+dead and crash events as they happen as the newline delimited JSON over the UDP (TCP is accepted as well)
+to the localhost. TelemetryListener builds the Debriefing from those while the mission runs, and puts it into
+the results queue once the mission end is reported, so the results are committed without waiting for
+the debriefing log.
+
+Messages:
+{"type": "mission start", "is_quick": <whether it's the quick mission, absent if the script is loaded manually>}
+{"type": "dead" | "crash", "initiatorMissionID": "<mission id of the unit>"}
+{"type": "mission end"}
+"""
+
+TELEMETRY_HOST = "127.0.0.1"
+TELEMETRY_PORT = 16420
+
+
+class _DatagramProtocol(asyncio.DatagramProtocol):
+    def __init__(self, listener: "TelemetryListener"):
+        self.listener = listener
+
+    def datagram_received(self, data: bytes, addr):
+        for line in data.splitlines():
+            self.listener.handle_line(line)
+
+
+class TelemetryListener:
+    """
+    Listens for the telemetry on its own thread with the asyncio loop, on the UDP and TCP ports of the localhost.
+    Listening stops once the debriefing is delivered to the results queue or stop() is called.
+    """
+
+    def __init__(self, host: str = TELEMETRY_HOST, port: int = TELEMETRY_PORT):
+        self.host = host
+        self.port = port
+        self.results = queue.Queue()  # type: queue.Queue
+        # built while the mission runs, replaced if the mission is restarted
+        self.debriefing = Debriefing([], {})
+
+        self._loop = asyncio.new_event_loop()
+        self._finished = self._loop.create_future()
+        self._ready = threading.Event()
+        self._error = None  # type: Exception
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        """
+        Starts listening, raising OSError if the ports couldn't be bound.
+        """
+        self._thread.start()
+        self._ready.wait()
+        if self._error:
+            raise self._error
+
+    def stop(self):
+        if not self._loop.is_closed():
+            try:
+                self._loop.call_soon_threadsafe(self._finish)
+            except RuntimeError:
+                # closed in between
+                pass
+
+    def handle_line(self, line: bytes):
+        if not line.strip():
+            return
+
+        try:
+            message = json.loads(line.decode("utf-8"))
+            event_type = message["type"]
+        except (ValueError, KeyError, TypeError) as e:
+            logging.warning("telemetry: malformed message {!r} ({})".format(line, e))
+            return
+
+        if event_type == "mission start":
+            self.debriefing = Debriefing([], {})
+            if isinstance(message.get("is_quick"), bool):
+                self.debriefing.is_quick = message["is_quick"]
+        elif event_type in ["dead", "crash"]:
+            if "initiatorMissionID" in message:
+                self.debriefing.append_dead_unit(message["initiatorMissionID"])
+        elif event_type == "mission end":
+            logging.info("telemetry: mission ended with {} dead units".format(self.debriefing.dead_units_count))
+            self.results.put(self.debriefing)
+            self._finish()
+
+    def _finish(self):
+        if not self._finished.done():
+            self._finished.set_result(None)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while not reader.at_eof():
+                self.handle_line(await reader.readline())
+        except asyncio.CancelledError:
+            # listener is shutting down
+            pass
+        finally:
+            writer.close()
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        transport = server = None
+        try:
+            transport, _ = self._loop.run_until_complete(
+                self._loop.create_datagram_endpoint(lambda: _DatagramProtocol(self), local_addr=(self.host, self.port)))
+            server = self._loop.run_until_complete(asyncio.start_server(self._handle_connection, self.host, self.port))
+        except OSError as e:
+            logging.error("telemetry: failed to listen on {}:{}: {}".format(self.host, self.port, e))
+            self._error = e
+
+        self._ready.set()
+        try:
+            if not self._error:
+                self._loop.run_until_complete(self._finished)
+        finally:
+            if transport:
+                transport.close()
+            if server:
+                server.close()
+
+            # connections still open
+            tasks = asyncio.all_tasks(self._loop)
+            for task in tasks:
+                task.cancel()
+            self._loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            self._loop.close()